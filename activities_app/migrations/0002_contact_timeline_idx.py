@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['contact', '-activity_date', '-id'], name='activities__contact_c4ddeb_idx'),
+        ),
+    ]
@@ -55,5 +55,8 @@ class ActivityLog(models.Model):
 
     class Meta:
         ordering = ['-activity_date']
+        indexes = [
+            models.Index(fields=['contact', '-activity_date', '-id']),
+        ]
         verbose_name = 'Activity Log'
         verbose_name_plural = 'Activity Logs'
@@ -10,6 +10,7 @@ python manage.py collectstatic --noinput
 
 # Run migrations
 python manage.py migrate
+python manage.py createcachetable
 
 # Create superuser if it doesn't exist (optional)
 python manage.py shell -c "
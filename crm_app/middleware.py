@@ -0,0 +1,114 @@
+"""
+Per-request query and latency metrics.
+
+QueryMetricsMiddleware wraps every database connection for the duration of a
+request and logs one structured line per request with the number of SQL
+queries, the time spent in the database, the wall time and the statements
+that ran more than once (usually an N+1 loop). Requests that exceed their
+query budget are logged as warnings.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Short stable id for a statement; parameters are not part of ``sql``."""
+    return hashlib.sha1(_WHITESPACE_RE.sub(' ', sql).strip().encode()).hexdigest()[:12]
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable counting and timing every statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            self.statements.setdefault(key, sql)
+
+    def duplicates(self, limit=5):
+        return [
+            {'fingerprint': key, 'count': count, 'sql': self.statements[key][:200]}
+            for key, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+def query_budget(view_name):
+    budgets = getattr(settings, 'REQUEST_QUERY_BUDGETS', {})
+    return budgets.get(view_name, getattr(settings, 'REQUEST_QUERY_BUDGET', 50))
+
+
+class QueryMetricsMiddleware:
+    """
+    Log SQL query count, DB time, duplicate queries and wall time per request.
+
+    Enabled with ``REQUEST_METRICS_ENABLED``. ``REQUEST_METRICS_SERVER_TIMING``
+    adds a ``Server-Timing`` header for the browser's network panel, and
+    ``REQUEST_QUERY_BUDGET``/``REQUEST_QUERY_BUDGETS`` set the query count above
+    which a view is flagged. Queries run while a streaming response is being
+    consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name if match else None) or request.path
+        budget = query_budget(view_name)
+        metrics = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(db_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'duplicates': recorder.duplicates(),
+            'over_budget': recorder.count > budget,
+        }
+        if metrics['over_budget']:
+            logger.warning(f"Query budget exceeded ({recorder.count} > {budget}): {json.dumps(metrics)}")
+        else:
+            logger.info(json.dumps(metrics))
+
+        if getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', False):
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", app;dur={total_ms:.1f}'
+            )
+        return response
@@ -23,6 +23,9 @@ urlpatterns = [
     path('enquiries/bulk-delete/', lead_views.lead_bulk_delete, name='lead_bulk_delete'),
     # WhatsApp upload endpoint must come before the generic <str:pk> pattern
     path('enquiries/upload-whatsapp-file/', lead_views.upload_whatsapp_file, name='upload_whatsapp_file'),
+    path('enquiries/upload-whatsapp-file/chunked/', lead_views.whatsapp_upload_start, name='whatsapp_upload_start'),
+    path('enquiries/upload-whatsapp-file/chunked/<uuid:upload_id>/', lead_views.whatsapp_upload_chunk, name='whatsapp_upload_chunk'),
+    path('enquiries/upload-whatsapp-file/chunked/<uuid:upload_id>/complete/', lead_views.whatsapp_upload_complete, name='whatsapp_upload_complete'),
     path('enquiries/<str:pk>/', lead_views.lead_detail, name='lead_detail'),
     path('enquiries/<str:pk>/edit/', lead_views.lead_edit, name='lead_edit'),
     path('enquiries/<str:pk>/quick-add/', lead_views.lead_quick_add, name='lead_quick_add'),
@@ -486,13 +486,17 @@ def report_enquiries_pipeline(request):
     return render(request, 'crm_app/report_enquiries_pipeline.html', context)
 
 
-@login_required
-@user_passes_test(_is_super_admin)
-def report_followups_compliance(request):
-    from_date_str = request.GET.get('from_date')
-    to_date_str = request.GET.get('to_date')
-    assigned_to_filter = request.GET.get('assigned_to')
-    status_filter = request.GET.get('status')
+def followups_report_queryset(params):
+    """
+    Build the follow-up compliance report queryset from ``params``.
+
+    Returns (qs, from_date, to_date, assigned_to_filter, status_filter); the
+    date range defaults to the current month.
+    """
+    from_date_str = params.get('from_date')
+    to_date_str = params.get('to_date')
+    assigned_to_filter = params.get('assigned_to')
+    status_filter = params.get('status')
 
     if from_date_str and to_date_str:
         try:
@@ -521,6 +525,14 @@ def report_followups_compliance(request):
     if status_filter and status_filter != 'all':
         qs = qs.filter(status=status_filter)
 
+    return qs, from_date, to_date, assigned_to_filter, status_filter
+
+
+@login_required
+@user_passes_test(_is_super_admin)
+def report_followups_compliance(request):
+    qs, from_date, to_date, assigned_to_filter, status_filter = followups_report_queryset(request.GET)
+
     now = timezone.now()
     today = now.date()
 
@@ -632,7 +644,6 @@ def analytics_overview(request):
 
     # Get employee filter
     employee_id = request.GET.get('employee')
-    print(f"DEBUG analytics_overview: employee_id = {employee_id}, user = {request.user.username}, is_superuser = {request.user.is_superuser}")
 
     # Base queryset for outbound activities (for charts and leaderboard)
     activities = OutboundActivity.objects.filter(
@@ -640,7 +651,6 @@ def analytics_overview(request):
         created_at__date__lte=to_date,
         created_by__isnull=False
     )
-    print(f"DEBUG analytics_overview: Initial activities count = {activities.count()}")
 
     # Normalize employee_id to int if provided
     selected_emp_id = None
@@ -650,20 +660,13 @@ def analytics_overview(request):
         except (TypeError, ValueError):
             selected_emp_id = None
 
-    print(f"DEBUG analytics_overview: selected_emp_id = {selected_emp_id}")
-
     # Apply filtering logic
     if selected_emp_id is not None:
         # When an employee is selected, always filter to that employee
         activities = activities.filter(created_by__id=selected_emp_id)
-        print(f"DEBUG analytics_overview: Filtered by employee {selected_emp_id}, activities count = {activities.count()}")
     elif not request.user.is_superuser:
         # Non-superusers only see their own data
         activities = activities.filter(created_by=request.user)
-        print(f"DEBUG analytics_overview: Filtered by user {request.user.username}, activities count = {activities.count()}")
-
-    print(f"DEBUG analytics_overview: Final activities count = {activities.count()}")
-    print(f"DEBUG analytics_overview: Unique created_by IDs: {list(activities.values_list('created_by__username', flat=True).distinct())}")
 
     # Method breakdown
     method_breakdown = activities.values('method').annotate(
@@ -814,9 +817,6 @@ def analytics_overview(request):
         reverse=True,
     )
 
-    print(f"DEBUG analytics_overview: Leaderboard count = {len(leaderboard_data)}")
-    print(f"DEBUG analytics_overview: Leaderboard usernames = {[row['username'] for row in leaderboard_data]}")
-
     # Get enquiries generated from outbound activities
     enquiries_qs = Lead.objects.filter(
         created_date__date__gte=from_date,
@@ -1043,11 +1043,13 @@ def lead_products_api(request, lead_id):
                 'description': getattr(lp, 'description', '') or '',
                 'quantity': getattr(lp, 'quantity', None),
                 'price': getattr(lp, 'price', None),
-                'image': None
+                'image': None,
+                'thumbnail': None
             }
             try:
                 if getattr(lp, 'image', None):
                     lp_entry['image'] = lp.image.url
+                    lp_entry['thumbnail'] = lp.thumbnail_url
                     data['images'].append(lp.image.url)
             except Exception:
                 pass
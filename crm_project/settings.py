@@ -106,6 +106,7 @@ INSTALLED_APPS = [
     'notifications_app.apps.NotificationsAppConfig',
     'media_app',
     'invoices_app.apps.InvoicesAppConfig',
+    'exports_app.apps.ExportsAppConfig',
 ]
 
 # Enable S3 media storage in production when USE_S3_MEDIA=true
@@ -119,6 +120,7 @@ from .storage_backends import SupabaseS3Storage
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'crm_app.middleware.QueryMetricsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -185,6 +187,28 @@ else:
 
 # (Debug prints removed.)
 
+# Cache shared by every worker process: the analytics overview, compiled
+# message templates and the media dedup index are invalidated by whichever
+# worker handled the write, so a per-process LocMemCache would go stale.
+# Set REDIS_URL wherever Redis is available. Without it the cache falls back
+# to a database table created with `python manage.py createcachetable`, which
+# costs a query per cache read or write and shares the request's transaction.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.getenv('CACHE_TABLE', 'crm_cache'),
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -233,6 +257,53 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 
 # Media files (uploads)
+# Store enquiry/product photo uploads (UPLOAD_FILE_STORAGE, set below) under
+# their content hash so identical files are kept once
+# (crm_project.storage_backends.ContentAddressedMixin). DEFAULT_FILE_STORAGE,
+# used by generated files such as exports, always keeps unique names.
+DEDUP_MEDIA_STORAGE = env_bool('DEDUP_MEDIA_STORAGE', 'True')
+STORAGE_DEDUP_INDEX_TTL = int(os.getenv('STORAGE_DEDUP_INDEX_TTL', str(24 * 3600)))
+
+# Write-behind uploads (S3 only): files are staged on local disk during the
+# request and pushed to the bucket by media_app.upload_queue. Until then they
+# exist only in UPLOAD_STAGING_DIR, so only enable this with that directory
+# on a persistent volume mounted by every web instance, and with
+# `python manage.py push_staged_uploads` scheduled to drain it after restarts.
+UPLOAD_WRITE_BEHIND = env_bool('UPLOAD_WRITE_BEHIND', 'False')
+UPLOAD_STAGING_DIR = os.getenv('UPLOAD_STAGING_DIR', str(BASE_DIR / 'upload_staging'))
+if UPLOAD_WRITE_BEHIND and not os.getenv('UPLOAD_STAGING_DIR'):
+    print("WARNING: UPLOAD_WRITE_BEHIND needs UPLOAD_STAGING_DIR on a persistent volume; "
+          "uploading directly instead")
+    UPLOAD_WRITE_BEHIND = False
+UPLOAD_QUEUE_INLINE_WORKER = env_bool('UPLOAD_QUEUE_INLINE_WORKER', 'True')
+UPLOAD_QUEUE_POLL_SECONDS = int(os.getenv('UPLOAD_QUEUE_POLL_SECONDS', '30'))
+UPLOAD_RETRY_BASE_SECONDS = int(os.getenv('UPLOAD_RETRY_BASE_SECONDS', '5'))
+UPLOAD_RETRY_MAX_SECONDS = int(os.getenv('UPLOAD_RETRY_MAX_SECONDS', '900'))
+
+# Upload recompression per image field (media_app.processing): auto-orient,
+# strip EXIF, cap the longest side and re-encode as 'jpeg' or 'webp'
+IMAGE_PROCESSING = {
+    'leads_app.Lead.images': {'max_dimension': 2048, 'format': 'jpeg', 'quality': 85},
+    'leads_app.LeadProduct.image': {'max_dimension': 2048, 'format': 'jpeg', 'quality': 85},
+}
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', '2'))
+
+# Outbound analytics overview cache, also invalidated whenever an activity changes
+OUTBOUND_ANALYTICS_CACHE_TTL = int(os.getenv('OUTBOUND_ANALYTICS_CACHE_TTL', '300'))
+
+# Per-request SQL/latency metrics (crm_app.middleware.QueryMetricsMiddleware)
+REQUEST_METRICS_ENABLED = env_bool('REQUEST_METRICS_ENABLED', 'True')
+REQUEST_METRICS_SERVER_TIMING = env_bool('REQUEST_METRICS_SERVER_TIMING', DEBUG)
+REQUEST_QUERY_BUDGET = int(os.getenv('REQUEST_QUERY_BUDGET', '50'))
+# Per-view overrides, keyed by URL name, e.g. {'crm_app:dashboard': 80}
+REQUEST_QUERY_BUDGETS = {}
+
+# Resumable chunked uploads (media_app.chunked_upload)
+CHUNKED_UPLOAD_DIR = os.getenv('CHUNKED_UPLOAD_DIR', str(BASE_DIR / 'upload_chunks'))
+CHUNKED_UPLOAD_MAX_BYTES = int(os.getenv('CHUNKED_UPLOAD_MAX_BYTES', str(200 * 1024 * 1024)))
+CHUNKED_UPLOAD_MAX_CHUNK_BYTES = int(os.getenv('CHUNKED_UPLOAD_MAX_CHUNK_BYTES', str(5 * 1024 * 1024)))
+CHUNKED_UPLOAD_TTL_HOURS = int(os.getenv('CHUNKED_UPLOAD_TTL_HOURS', '24'))
+
 if USE_S3:
     # S3 Configuration with fallback defaults
     AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
@@ -258,9 +329,20 @@ if USE_S3:
         MEDIA_URL = '/media/'
         MEDIA_ROOT = BASE_DIR / 'media'
         DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+        UPLOAD_FILE_STORAGE = (
+            'crm_project.storage_backends.ContentAddressedFileSystemStorage' if DEDUP_MEDIA_STORAGE
+            else DEFAULT_FILE_STORAGE
+        )
     else:
         # For Supabase Storage, use custom storage class to handle 403 HeadObject
+        # Write-behind staging needs the content-addressed names, see WriteBehindMixin
         DEFAULT_FILE_STORAGE = 'crm_project.storage_backends.SupabaseS3Storage'
+        if DEDUP_MEDIA_STORAGE and UPLOAD_WRITE_BEHIND:
+            UPLOAD_FILE_STORAGE = 'crm_project.storage_backends.WriteBehindS3Storage'
+        elif DEDUP_MEDIA_STORAGE:
+            UPLOAD_FILE_STORAGE = 'crm_project.storage_backends.ContentAddressedS3Storage'
+        else:
+            UPLOAD_FILE_STORAGE = DEFAULT_FILE_STORAGE
         AWS_QUERYSTRING_AUTH = env_bool('AWS_QUERYSTRING_AUTH', 'False')
         AWS_QUERYSTRING_EXPIRE = int(os.getenv('AWS_QUERYSTRING_EXPIRE', '3600'))
         _public_base = os.getenv(
@@ -319,6 +401,16 @@ if USE_S3:
 else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
+    UPLOAD_FILE_STORAGE = (
+        'crm_project.storage_backends.ContentAddressedFileSystemStorage' if DEDUP_MEDIA_STORAGE
+        else 'django.core.files.storage.FileSystemStorage'
+    )
+
+# Google Drive image proxy (media_app.drive_cache)
+DRIVE_THUMBNAIL_BASE_URL = os.getenv('DRIVE_THUMBNAIL_BASE_URL', 'https://drive.google.com/thumbnail')
+DRIVE_IMAGE_CACHE_DIR = os.getenv('DRIVE_IMAGE_CACHE_DIR', str(BASE_DIR / 'drive_image_cache'))
+DRIVE_IMAGE_CACHE_MAX_BYTES = int(os.getenv('DRIVE_IMAGE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+DRIVE_IMAGE_CACHE_TTL_SECONDS = int(os.getenv('DRIVE_IMAGE_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -383,6 +475,14 @@ ADMINS = [
 # Server email (for automated messages)
 SERVER_EMAIL = os.getenv('SERVER_EMAIL', DEFAULT_FROM_EMAIL)
 
+# Background exports
+# Finished export files are kept in media storage for this many hours
+EXPORT_JOB_TTL_HOURS = int(os.getenv('EXPORT_JOB_TTL_HOURS', '24'))
+# Build exports in a thread of the web process; disable when `run_export_jobs --loop` runs as a worker
+EXPORT_JOBS_INLINE_WORKER = env_bool('EXPORT_JOBS_INLINE_WORKER', 'True')
+# RUNNING jobs older than this are marked failed (their worker died mid-build)
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('EXPORT_JOB_TIMEOUT_MINUTES', '30'))
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -426,5 +526,10 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'exports_app': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -1,4 +1,16 @@
+import hashlib
+import os
+import posixpath
+import tempfile
 import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from django.utils.functional import LazyObject, cached_property
+from django.utils.module_loading import import_string
 from storages.backends.s3boto3 import S3Boto3Storage
 
 class SupabaseS3Storage(S3Boto3Storage):
@@ -17,3 +29,202 @@ class SupabaseS3Storage(S3Boto3Storage):
                     unique_name = f"{name}_{uuid.uuid4().hex[:8]}"
                 return super()._save(unique_name, content)
             raise
+
+
+class ContentAddressedMixin:
+    """
+    Store each upload under the SHA-256 of its bytes.
+
+    ``enquiry_images/IMG_2041.jpg`` is saved as ``enquiry_images/<sha256>.jpg``,
+    so identical photos and screenshots share one object and a repeat upload
+    costs a hash and a lookup instead of a transfer. Objects known to exist
+    are remembered in the shared default cache for ``STORAGE_DEDUP_INDEX_TTL``
+    seconds.
+
+    Names are shared between records, so ``delete()`` keeps the bytes while
+    any file field on this storage still holds the name, and otherwise drops
+    the object together with its index entry. Only use this for uploads (see
+    ``upload_storage``), never for generated files that expire.
+    """
+    # Non-seekable streams are spooled to disk past this size while hashing
+    spool_max_memory = 2 * 1024 * 1024
+
+    def content_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, f'{digest}{extension}')
+
+    def _index_key(self, name):
+        # Scoped to the bucket/directory, so separate media roots never share entries
+        scope = f"{getattr(self, 'bucket_name', '')}:{self.location}:{name}"
+        return f'storage-cas:{hashlib.sha1(scope.encode()).hexdigest()}'
+
+    def _object_exists(self, name):
+        return self.exists(name)
+
+    def is_stored(self, name):
+        if cache.get(self._index_key(name)):
+            return True
+        if self._object_exists(name):
+            self._remember(name)
+            return True
+        return False
+
+    def _remember(self, name):
+        cache.set(self._index_key(name), True, getattr(settings, 'STORAGE_DEDUP_INDEX_TTL', 24 * 3600))
+
+    def _hash(self, content):
+        """Return ``(digest, readable file)``, reading ``content`` exactly once."""
+        digest = hashlib.sha256()
+        seekable = getattr(content, 'seekable', lambda: False)()
+        spool = None if seekable else tempfile.SpooledTemporaryFile(max_size=self.spool_max_memory)
+        for chunk in content.chunks():
+            digest.update(chunk)
+            if spool is not None:
+                spool.write(chunk)
+        if spool is None:
+            content.seek(0)
+            return digest.hexdigest(), content
+        spool.seek(0)
+        return digest.hexdigest(), File(spool)
+
+    def _save(self, name, content):
+        digest, readable = self._hash(content)
+        canonical = self.content_name(name, digest)
+        if self.is_stored(canonical):
+            return canonical
+        saved = super()._save(canonical, readable)
+        self._remember(saved)
+        return saved
+
+    def is_referenced(self, name):
+        """Whether any file field backed by this storage still holds ``name``."""
+        from django.apps import apps
+        from django.db.models import FileField
+
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if not isinstance(field, FileField) or getattr(field.storage, '_wrapped', field.storage) is not self:
+                    continue
+                if model._default_manager.filter(**{field.attname: name}).exists():
+                    return True
+        return False
+
+    def delete(self, name):
+        # Forget the object first, so a concurrent upload of the same bytes
+        # writes it again instead of trusting the index
+        cache.delete(self._index_key(name))
+        if self.is_referenced(name):
+            return
+        self._delete_object(name)
+
+    def _delete_object(self, name):
+        super().delete(name)
+
+
+class WriteBehindMixin(ContentAddressedMixin):
+    """
+    Stage uploads on local disk and push them to the real storage later.
+
+    ``save()`` hashes the upload, writes it under its final content-addressed
+    name in ``UPLOAD_STAGING_DIR`` and returns at disk speed; reads and URLs
+    are served from the staged copy until media_app.upload_queue has pushed it
+    with ``push()``.
+    """
+
+    @cached_property
+    def staging(self):
+        return FileSystemStorage(location=settings.UPLOAD_STAGING_DIR)
+
+    def is_staged(self, name):
+        return self.staging.exists(name)
+
+    def _save(self, name, content):
+        digest, readable = self._hash(content)
+        canonical = self.content_name(name, digest)
+        # Only the cached index is consulted here; a HeadObject would put the
+        # network back on the request path. The uploader does the full check.
+        if cache.get(self._index_key(canonical)) or self.is_staged(canonical):
+            return canonical
+        self._stage(canonical, readable)
+
+        from media_app import upload_queue
+        upload_queue.wake()
+        return canonical
+
+    def _stage(self, name, content):
+        # Write then rename, so the uploader never picks up a partial file
+        path = self.staging.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{uuid.uuid4().hex}.part'
+        with open(tmp_path, 'wb') as f:
+            for chunk in content.chunks():
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    def push(self, name):
+        """Upload staged ``name``; returns the name it was stored under."""
+        with self.staging.open(name) as f:
+            stored = ContentAddressedMixin._save(self, name, f)
+        self.staging.delete(name)
+        return stored
+
+    def _delete_object(self, name):
+        if self.is_staged(name):
+            self.staging.delete(name)
+        super()._delete_object(name)
+
+    def exists(self, name):
+        return self.is_staged(name) or super().exists(name)
+
+    def _open(self, name, mode='rb'):
+        if self.is_staged(name):
+            return self.staging._open(name, mode)
+        return super()._open(name, mode)
+
+    def url(self, name):
+        if self.is_staged(name):
+            return reverse('media_app:staged_upload', args=[name])
+        return super().url(name)
+
+    def size(self, name):
+        if self.is_staged(name):
+            return self.staging.size(name)
+        return super().size(name)
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    pass
+
+
+class ContentAddressedS3Storage(ContentAddressedMixin, SupabaseS3Storage):
+    def _object_exists(self, name):
+        # SupabaseS3Storage.exists() is stubbed out; ask the bucket, and treat
+        # a refused HeadObject as "not there" so the upload still happens
+        try:
+            return S3Boto3Storage.exists(self, name)
+        except Exception:
+            return False
+
+
+class WriteBehindS3Storage(WriteBehindMixin, ContentAddressedS3Storage):
+    pass
+
+
+class UploadStorage(LazyObject):
+    """
+    Storage for user uploads (enquiry and product photos), configured by
+    ``UPLOAD_FILE_STORAGE``. Generated files such as exports stay on the
+    default storage, whose names are unique and whose deletes are real.
+    """
+
+    def _setup(self):
+        self._wrapped = import_string(settings.UPLOAD_FILE_STORAGE)()
+
+
+upload_storage = UploadStorage()
+
+
+def get_upload_storage():
+    """``storage=`` callable for upload fields, so migrations don't embed the backend"""
+    return upload_storage
@@ -67,6 +67,9 @@ urlpatterns = [
     # Media Gallery
     path('media/', include('media_app.urls')),
 
+    # Background exports
+    path('exports/', include('exports_app.urls')),
+
     # Authentication
     path('login/', auth_views.LoginView.as_view(template_name='registration/login.html'), name='login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers_app', '0007_alter_contact_company'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['updated_date', 'id'], name='customers_a_updated_05e661_idx'),
+        ),
+    ]
@@ -31,3 +31,6 @@ class Contact(models.Model):
 
     class Meta:
         ordering = ['full_name']
+        indexes = [
+            models.Index(fields=['updated_date', 'id']),
+        ]
@@ -19,14 +19,12 @@ def contact_list(request):
     """List all contacts"""
     if request.user.is_superuser:
         contacts = Contact.objects.all()
-        print(f"DEBUG: Superuser viewing all {contacts.count()} contacts")
     else:
         # For non-superusers, show contacts they created OR contacts created by import (no created_by set)
         contacts = Contact.objects.filter(
             Q(created_by=request.user) |
             Q(created_by__isnull=True)
         )
-        print(f"DEBUG: Regular user viewing {contacts.count()} contacts (created by them or imported)")
 
     # Search by name, phone, or company name
     search = request.GET.get('search', '').strip()
@@ -38,7 +36,6 @@ def contact_list(request):
             Q(email__icontains=search) |
             Q(company__company_name__icontains=search)
         )
-        print(f"DEBUG: Search '{search}' returned {contacts.count()} results")
 
     contacts = contacts.order_by('full_name')
 
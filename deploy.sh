@@ -24,6 +24,7 @@ docker-compose -f $COMPOSE_FILE up -d --build
 # Run migrations
 echo "🗄️ Running database migrations..."
 docker-compose -f $COMPOSE_FILE exec -T app python manage.py migrate
+docker-compose -f $COMPOSE_FILE exec -T app python manage.py createcachetable
 
 # Collect static files
 echo "📁 Collecting static files..."
@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import DeletedRecord, ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'export_type', 'requested_by', 'status', 'row_count', 'created_at', 'finished_at', 'expires_at']
+    list_filter = ['export_type', 'status']
+    search_fields = ['requested_by__username']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+
+@admin.register(DeletedRecord)
+class DeletedRecordAdmin(admin.ModelAdmin):
+    list_display = ['id', 'entity', 'object_id', 'deleted_at']
+    list_filter = ['entity']
+    search_fields = ['object_id']
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class ExportsAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'exports_app'
+    verbose_name = 'Exports'
+
+    def ready(self):
+        # Import signal handlers
+        try:
+            from . import signals  # noqa: F401
+        except Exception:
+            # Avoid import-time crashes; signals should not break startup
+            pass
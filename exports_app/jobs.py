@@ -0,0 +1,254 @@
+"""
+Building, storing and expiring export artifacts.
+
+Jobs are claimed atomically (PENDING -> RUNNING), so the in-process worker
+thread and the ``run_export_jobs`` management command can run side by side
+without building the same export twice. A job whose worker died mid-build is
+failed by ``fail_stale_jobs`` once ``EXPORT_JOB_TIMEOUT_MINUTES`` have passed.
+"""
+import csv
+import io
+import logging
+import tempfile
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+
+def _build_enquiries(job, fileobj):
+    from leads_app.views import filter_leads_for_list, write_leads_xlsx
+
+    leads, _, _, _ = filter_leads_for_list(job.requested_by, job.filters)
+    write_leads_xlsx(leads, fileobj)
+    return leads.count(), 'enquiries_export.xlsx'
+
+
+def _build_outbound(job, fileobj):
+    from outbound_app.models import OutboundActivity
+    from outbound_app.views import filter_outbound_activities, write_outbound_csv
+
+    qs = filter_outbound_activities(
+        OutboundActivity.objects.all(), job.requested_by, job.filters
+    )
+    out = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    count = write_outbound_csv(qs, out)
+    out.flush()
+    out.detach()
+    return count, 'outbound_activities.csv'
+
+
+def _build_followups_report(job, fileobj):
+    from crm_app.views import followups_report_queryset
+
+    qs, _, _, _, _ = followups_report_queryset(job.filters)
+    out = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    writer = csv.writer(out)
+    writer.writerow(['ID', 'Enquiry', 'Type', 'Scheduled Date', 'Status', 'Assigned To', 'Created By', 'Completed Date', 'Notes'])
+    count = 0
+    for followup in qs.order_by('scheduled_date').iterator(chunk_size=2000):
+        writer.writerow([
+            followup.id,
+            followup.lead.contact_name if followup.lead else '',
+            followup.get_followup_type_display(),
+            followup.scheduled_date.isoformat() if followup.scheduled_date else '',
+            followup.get_status_display(),
+            followup.assigned_to.username if followup.assigned_to else '',
+            followup.created_by.username if followup.created_by else '',
+            followup.completed_date.isoformat() if followup.completed_date else '',
+            (followup.notes or '').replace('\r', ' ').replace('\n', ' '),
+        ])
+        count += 1
+    out.flush()
+    out.detach()
+    return count, 'followups_report.csv'
+
+
+def _build_parquet(job, fileobj):
+    from .parquet import write_parquet_zip
+
+    counts = write_parquet_zip(fileobj, job.filters.get('datasets') or None)
+    return sum(counts.values()), 'crm_parquet_export.zip'
+
+
+BUILDERS = {
+    'enquiries': _build_enquiries,
+    'outbound': _build_outbound,
+    'followups_report': _build_followups_report,
+    'parquet': _build_parquet,
+}
+
+
+def get_ttl():
+    return timedelta(hours=getattr(settings, 'EXPORT_JOB_TTL_HOURS', 24))
+
+
+def enqueue_export(user, export_type, filters):
+    """Create a pending export job and hand it to a worker."""
+    if export_type not in BUILDERS:
+        raise ValueError(f"Unknown export type: {export_type}")
+
+    job = ExportJob.objects.create(
+        export_type=export_type,
+        filters=filters or {},
+        requested_by=user,
+    )
+
+    if getattr(settings, 'EXPORT_JOBS_INLINE_WORKER', True):
+        # Start the build once the job row is committed and visible to other connections
+        transaction.on_commit(lambda: _start_worker_thread(job.pk))
+
+    return job
+
+
+def _start_worker_thread(job_id):
+    thread = threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True, name=f'export-job-{job_id}')
+    thread.start()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_export_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def claim_job(job_id):
+    """Atomically move a job from PENDING to RUNNING; returns the job or None."""
+    claimed = ExportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', started_at=timezone.now()
+    )
+    if not claimed:
+        return None
+    return ExportJob.objects.select_related('requested_by').get(pk=job_id)
+
+
+def run_export_job(job_id):
+    """Build one export, store it in the default storage and notify the requester."""
+    job = claim_job(job_id)
+    if job is None:
+        return None
+
+    builder = BUILDERS[job.export_type]
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            row_count, filename = builder(job, tmp)
+            tmp.seek(0)
+            job.file.save(f'{job.requested_by_id}/{job.pk}_{filename}', File(tmp, name=filename), save=False)
+
+        now = timezone.now()
+        job.row_count = row_count
+        job.status = 'COMPLETED'
+        job.finished_at = now
+        job.expires_at = now + get_ttl()
+        job.save(update_fields=['file', 'row_count', 'status', 'finished_at', 'expires_at'])
+        logger.info(f"Export job {job.pk} ({job.export_type}) completed with {row_count} rows")
+        _notify(job)
+    except Exception as e:
+        logger.error(f"Export job {job.pk} failed: {e}", exc_info=True)
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        _notify(job)
+
+    return job
+
+
+def fail_stale_jobs():
+    """
+    Fail RUNNING jobs started longer than ``EXPORT_JOB_TIMEOUT_MINUTES`` ago
+    and notify their requesters; returns the number failed.
+
+    The inline worker is a thread of the web process, so a restart mid-build
+    leaves the job RUNNING with nobody working on it. Jobs are failed rather
+    than requeued, so an export that kills its worker is not retried forever.
+    """
+    cutoff = timezone.now() - timedelta(minutes=getattr(settings, 'EXPORT_JOB_TIMEOUT_MINUTES', 30))
+    failed = 0
+    for job in ExportJob.objects.filter(status='RUNNING', started_at__lt=cutoff).select_related('requested_by'):
+        # Conditional, so a worker that finishes meanwhile is not overwritten
+        updated = ExportJob.objects.filter(pk=job.pk, status='RUNNING').update(
+            status='FAILED',
+            error='The export worker stopped before the file was built; please try again.',
+            finished_at=timezone.now(),
+        )
+        if updated:
+            job.refresh_from_db()
+            logger.warning(f"Export job {job.pk} timed out while running")
+            _notify(job)
+            failed += 1
+    return failed
+
+
+def run_pending_jobs(limit=None):
+    """Process pending jobs oldest first; returns the number of jobs processed."""
+    job_ids = ExportJob.objects.filter(status='PENDING').order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+
+    processed = 0
+    for job_id in list(job_ids):
+        if run_export_job(job_id) is not None:
+            processed += 1
+    return processed
+
+
+def purge_expired_exports():
+    """Delete stored artifacts whose TTL has passed; returns the number purged."""
+    expired = ExportJob.objects.filter(status='COMPLETED', expires_at__lte=timezone.now())
+    purged = 0
+    for job in expired.iterator():
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except Exception as e:
+                logger.warning(f"Could not delete artifact for export job {job.pk}: {e}")
+                continue
+        job.status = 'EXPIRED'
+        job.save(update_fields=['file', 'status'])
+        purged += 1
+    return purged
+
+
+def _notify(job):
+    from notifications_app.models import Notification
+
+    label = job.get_export_type_display()
+    if job.status == 'COMPLETED':
+        title = f'Export ready: {label}'
+        message = (
+            f'Your {label.lower()} export ({job.row_count} rows) is ready to download. '
+            f'The file will be available until {timezone.localtime(job.expires_at).strftime("%B %d, %Y at %I:%M %p")}.'
+        )
+        notification_type_name = 'EXPORT_READY'
+    else:
+        title = f'Export failed: {label}'
+        message = f'Your {label.lower()} export could not be generated: {job.error}'
+        notification_type_name = 'EXPORT_FAILED'
+
+    try:
+        Notification.create_notification(
+            notification_type_name=notification_type_name,
+            recipient=job.requested_by,
+            title=title,
+            message=message,
+            content_object=job,
+            data={
+                'export_job_id': job.pk,
+                'export_type': job.export_type,
+                'status': job.status,
+                'row_count': job.row_count,
+                'download_url': reverse('exports_app:export_job_download', args=[job.pk]) if job.status == 'COMPLETED' else None,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error creating export notification for job {job.pk}: {e}")
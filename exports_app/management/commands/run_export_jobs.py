@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from exports_app.jobs import fail_stale_jobs, purge_expired_exports, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Build pending export jobs, fail stalled ones and purge expired export files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new jobs instead of exiting when the queue is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Seconds to sleep between polls when --loop is set (default: 10)',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete export files whose TTL has passed',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            stale = fail_stale_jobs()
+            if stale:
+                self.stdout.write(self.style.WARNING(f'Failed {stale} stalled export job(s)'))
+
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} export job(s)'))
+
+            if options['purge']:
+                purged = purge_expired_exports()
+                if purged:
+                    self.stdout.write(self.style.WARNING(f'Purged {purged} expired export file(s)'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
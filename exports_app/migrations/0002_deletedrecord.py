@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['entity', 'id'], name='exports_app_entity_da658d_idx'), models.Index(fields=['entity', 'deleted_at'], name='exports_app_entity_b68f33_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports_app', '0002_deletedrecord'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='export_type',
+            field=models.CharField(choices=[('enquiries', 'Enquiries'), ('outbound', 'Outbound Activities'), ('followups_report', 'Follow-ups Compliance Report'), ('parquet', 'Parquet Datasets')], max_length=30),
+        ),
+    ]
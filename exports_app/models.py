@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class ExportJob(models.Model):
+    """A large export built outside the request/response cycle"""
+    EXPORT_TYPE_CHOICES = [
+        ('enquiries', 'Enquiries'),
+        ('outbound', 'Outbound Activities'),
+        ('followups_report', 'Follow-ups Compliance Report'),
+        ('parquet', 'Parquet Datasets'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+        ('EXPIRED', 'Expired'),
+    ]
+
+    export_type = models.CharField(max_length=30, choices=EXPORT_TYPE_CHOICES)
+    filters = models.JSONField(default=dict, blank=True, help_text="Query parameters the export was requested with")
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    file = models.FileField(upload_to='exports/', blank=True, max_length=255)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_export_type_display()} export #{self.pk} ({self.status})"
+
+    @property
+    def is_downloadable(self):
+        return (
+            self.status == 'COMPLETED'
+            and bool(self.file)
+            and (self.expires_at is None or self.expires_at > timezone.now())
+        )
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['requested_by', 'created_at']),
+            models.Index(fields=['expires_at']),
+        ]
+
+
+class DeletedRecord(models.Model):
+    """Tombstone left behind when a change-feed entity is deleted"""
+    entity = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_id} deleted {self.deleted_at}"
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['entity', 'id']),
+            models.Index(fields=['entity', 'deleted_at']),
+        ]
@@ -0,0 +1,177 @@
+"""
+Typed, month-partitioned Parquet snapshots of the sales tables for offline analysis.
+
+Each dataset is read with a ``values()`` iterator in ``chunk_size`` batches,
+and each batch is appended to a hive-partitioned directory
+(``<root>/<dataset>/month=YYYY-MM/part-N-0.parquet``). Column types come from
+the Django field definitions, so every part file shares one schema even when
+a batch happens to hold only NULLs in a column.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+
+from django.apps import apps
+from django.db import models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+
+PARTITION_COLUMN = 'month'
+DEFAULT_CHUNK_SIZE = 5000
+
+# dataset name -> (model label, lookup whose month partitions the rows, extra value lookups)
+PARQUET_DATASETS = {
+    'leads': ('leads_app.Lead', 'created_date', ()),
+    'lead_products': ('leads_app.LeadProduct', 'created_date', ()),
+    'followups': ('leads_app.FollowUp', 'scheduled_date', ()),
+    'outbound_activities': ('outbound_app.OutboundActivity', 'created_at', ()),
+    'invoices': ('invoices_app.Invoice', 'issue_date', ()),
+    'invoice_items': ('invoices_app.InvoiceItem', 'invoice__issue_date', ('invoice__issue_date',)),
+}
+
+
+class ParquetUnavailable(RuntimeError):
+    pass
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ParquetUnavailable("pyarrow is not installed; install it to use Parquet exports")
+
+
+def _arrow_type(field):
+    """Arrow type for a concrete model field (foreign keys use their target column)."""
+    if field.is_relation:
+        field = field.target_field
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.AutoField, models.IntegerField)):
+        return pa.int64()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    return pa.string()
+
+
+def _resolve_field(model, lookup):
+    parts = lookup.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+def _columns(model, extra_lookups):
+    """Return [(column name, arrow type, is_json)] for a dataset."""
+    columns = [
+        (field.attname, _arrow_type(field), isinstance(field, models.JSONField))
+        for field in model._meta.concrete_fields
+    ]
+    for lookup in extra_lookups:
+        columns.append((lookup, _arrow_type(_resolve_field(model, lookup)), False))
+    return columns
+
+
+def _month_of(value):
+    if value is None:
+        return 'unknown'
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.strftime('%Y-%m')
+
+
+def _to_table(rows, columns, partition_lookup, schema):
+    data = {}
+    for name, _, is_json in columns:
+        values = [row[name] for row in rows]
+        if is_json:
+            values = [json.dumps(v) if v is not None else None for v in values]
+        data[name] = values
+    data[PARTITION_COLUMN] = [_month_of(row[partition_lookup]) for row in rows]
+    return pa.Table.from_pydict(data, schema=schema)
+
+
+def export_dataset(name, root, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write one dataset under ``root/<name>``; returns the number of rows written."""
+    _require_pyarrow()
+    model_label, partition_lookup, extra_lookups = PARQUET_DATASETS[name]
+    model = apps.get_model(model_label)
+    columns = _columns(model, extra_lookups)
+    schema = pa.schema(
+        [pa.field(col_name, arrow_type) for col_name, arrow_type, _ in columns]
+        + [pa.field(PARTITION_COLUMN, pa.string())]
+    )
+
+    lookups = [col_name for col_name, _, _ in columns]
+    if partition_lookup not in lookups:
+        lookups.append(partition_lookup)
+
+    target = os.path.join(root, name)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.makedirs(target)
+
+    qs = model._default_manager.order_by('pk').values(*lookups)
+    total = 0
+    part = 0
+    batch = []
+    for row in qs.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            _write_batch(batch, columns, partition_lookup, schema, target, part)
+            total += len(batch)
+            part += 1
+            batch = []
+    if batch:
+        _write_batch(batch, columns, partition_lookup, schema, target, part)
+        total += len(batch)
+
+    logger.info(f"Parquet export of {name}: {total} rows")
+    return total
+
+
+def _write_batch(batch, columns, partition_lookup, schema, target, part):
+    table = _to_table(batch, columns, partition_lookup, schema)
+    pq.write_to_dataset(
+        table,
+        root_path=target,
+        partition_cols=[PARTITION_COLUMN],
+        basename_template=f'part-{part}-{{i}}.parquet',
+    )
+
+
+def export_datasets(root, names=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the named datasets (all by default); returns {name: row count}."""
+    names = names or list(PARQUET_DATASETS)
+    return {name: export_dataset(name, root, chunk_size=chunk_size) for name in names}
+
+
+def write_parquet_zip(fileobj, names=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Export datasets to a temporary directory and zip the partition tree into ``fileobj``."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        counts = export_datasets(tmpdir, names, chunk_size=chunk_size)
+        with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for dirpath, _, filenames in os.walk(tmpdir):
+                for filename in sorted(filenames):
+                    path = os.path.join(dirpath, filename)
+                    zf.write(path, os.path.relpath(path, tmpdir))
+    return counts
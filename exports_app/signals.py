@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete
+import logging
+
+from .changefeed import CHANGE_FEEDS
+from .models import DeletedRecord
+
+logger = logging.getLogger(__name__)
+
+
+def record_deletion(sender, instance, **kwargs):
+    """Leave a tombstone so change-feed consumers learn about the deletion"""
+    entity = _ENTITY_BY_MODEL.get(sender)
+    if entity is None:
+        return
+    try:
+        DeletedRecord.objects.create(entity=entity, object_id=str(instance.pk))
+    except Exception as e:
+        logger.error(f"Error recording deletion of {entity} #{instance.pk}: {e}")
+
+
+_ENTITY_BY_MODEL = {}
+for _entity, _feed in CHANGE_FEEDS.items():
+    _model = _feed.get_model()
+    _ENTITY_BY_MODEL[_model] = _entity
+    post_delete.connect(record_deletion, sender=_model, dispatch_uid=f'changefeed_tombstone_{_entity}')
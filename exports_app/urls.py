@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+app_name = 'exports_app'
+
+urlpatterns = [
+    path('', views.export_job_list, name='export_job_list'),
+    path('parquet/', views.parquet_export, name='parquet_export'),
+    path('changes/<str:entity>/', views.change_feed, name='change_feed'),
+    path('<str:export_type>/start/', views.export_job_create, name='export_job_create'),
+    path('jobs/<int:job_id>/', views.export_job_status, name='export_job_status'),
+    path('jobs/<int:job_id>/download/', views.export_job_download, name='export_job_download'),
+]
@@ -0,0 +1,140 @@
+import logging
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_http_methods
+
+from crm_app.views import _is_super_admin
+
+from .changefeed import CHANGE_FEEDS, DEFAULT_PAGE_SIZE, InvalidCursor, read_changes
+from .jobs import BUILDERS, enqueue_export
+from .models import ExportJob
+from .parquet import PARQUET_DATASETS, PYARROW_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+SUPER_ADMIN_EXPORTS = ('followups_report', 'parquet')
+
+
+def _job_payload(job):
+    return {
+        'id': job.pk,
+        'export_type': job.export_type,
+        'status': job.status,
+        'row_count': job.row_count,
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'expires_at': job.expires_at.isoformat() if job.expires_at else None,
+        'status_url': reverse('exports_app:export_job_status', args=[job.pk]),
+        'download_url': reverse('exports_app:export_job_download', args=[job.pk]) if job.is_downloadable else None,
+    }
+
+
+@login_required
+@require_http_methods(["POST"])
+def export_job_create(request, export_type):
+    """Queue an export; filters come from the query string plus any posted fields"""
+    if export_type not in BUILDERS:
+        raise Http404("Unknown export type")
+    if export_type in SUPER_ADMIN_EXPORTS and not _is_super_admin(request.user):
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    filters = {k: v for k, v in request.GET.items()}
+    filters.update({k: v for k, v in request.POST.items() if k != 'csrfmiddlewaretoken'})
+
+    job = enqueue_export(request.user, export_type, filters)
+    return _queued_response(request, job)
+
+
+def _queued_response(request, job):
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest' or 'application/json' in request.headers.get('accept', ''):
+        return JsonResponse({'success': True, 'job': _job_payload(job)}, status=202)
+
+    messages.success(request, "Your export has been queued. You'll get a notification when it is ready to download.")
+    return redirect(request.META.get('HTTP_REFERER') or '/')
+
+
+@login_required
+def export_job_status(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id, requested_by=request.user)
+    return JsonResponse({'success': True, 'job': _job_payload(job)})
+
+
+@login_required
+def export_job_list(request):
+    jobs = ExportJob.objects.filter(requested_by=request.user)[:20]
+    return JsonResponse({'success': True, 'jobs': [_job_payload(job) for job in jobs]})
+
+
+@login_required
+def export_job_download(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id, requested_by=request.user)
+    if not job.is_downloadable:
+        raise Http404("Export is not available")
+
+    filename = job.file.name.rsplit('/', 1)[-1].split('_', 1)[-1]
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=filename)
+
+
+@login_required
+@require_http_methods(["POST"])
+def parquet_export(request):
+    """Queue a zip of month-partitioned Parquet datasets for analysts (super admins only)"""
+    if not _is_super_admin(request.user):
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    if not PYARROW_AVAILABLE:
+        return JsonResponse({'success': False, 'error': 'pyarrow is not installed; install it to use Parquet exports'}, status=503)
+
+    names = request.POST.getlist('dataset') or request.GET.getlist('dataset')
+    unknown = [name for name in names if name not in PARQUET_DATASETS]
+    if unknown:
+        return JsonResponse({'success': False, 'error': f"Unknown dataset(s): {', '.join(unknown)}"}, status=400)
+
+    job = enqueue_export(request.user, 'parquet', {'datasets': names})
+    return _queued_response(request, job)
+
+
+@login_required
+@require_http_methods(["GET"])
+def change_feed(request, entity):
+    """
+    One NDJSON page of upserts and tombstones for ``entity`` (super admins only).
+
+    Pass ``updated_since`` (ISO datetime) to start, then follow the
+    ``X-Next-Cursor`` header via ``cursor`` until ``X-Has-More`` is false.
+    """
+    if entity not in CHANGE_FEEDS:
+        raise Http404("Unknown entity")
+    if not _is_super_admin(request.user):
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    updated_since = None
+    if request.GET.get('updated_since'):
+        updated_since = parse_datetime(request.GET['updated_since'])
+        if updated_since is None or updated_since.tzinfo is None:
+            return JsonResponse({'success': False, 'error': 'updated_since must be an ISO datetime with a timezone'}, status=400)
+
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'limit must be an integer'}, status=400)
+
+    try:
+        lines, next_cursor, has_more = read_changes(
+            entity,
+            cursor=request.GET.get('cursor'),
+            updated_since=updated_since,
+            limit=limit,
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    response = HttpResponse(''.join(f'{line}\n' for line in lines), content_type='application/x-ndjson')
+    response['X-Next-Cursor'] = next_cursor
+    response['X-Has-More'] = 'true' if has_more else 'false'
+    return response
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices_app', '0002_invoice_lead'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['updated_at', 'id'], name='invoices_ap_updated_5a5471_idx'),
+        ),
+    ]
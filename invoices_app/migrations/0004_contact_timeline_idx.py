@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices_app', '0003_invoice_invoices_ap_updated_5a5471_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['contact', '-created_at', '-id'], name='invoices_ap_contact_aff331_idx'),
+        ),
+    ]
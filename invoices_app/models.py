@@ -28,6 +28,10 @@ class Invoice(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['contact', '-created_at', '-id']),
+        ]
 
     def __str__(self) -> str:
         return self.invoice_number or f'Invoice {self.pk}'
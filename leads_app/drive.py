@@ -0,0 +1,45 @@
+"""
+Google Drive image links: one normalizer for every format we store.
+
+Sheets imports and manual entry give us ``/file/d/<id>/view`` sharing links,
+``open?id=`` / ``uc?id=`` links and ready-made ``thumbnail?id=`` URLs. All of
+them reduce to a file id, which ``Lead.save()`` stores in ``drive_file_id`` so
+render paths build URLs from the id without parsing.
+"""
+import re
+
+DRIVE_FILE_ID_RE = re.compile(
+    r'drive\.google\.com/(?:file/d/|(?:open|uc|thumbnail)\?(?:[^#]*?&)?id=)([A-Za-z0-9_-]+)'
+)
+
+# Placeholder values the sheets contain instead of a link
+INVALID_IMAGE_ENTRIES = frozenset(['no photo', 'n/a', 'none', ''])
+
+DEFAULT_THUMBNAIL_SIZE = 'w400'
+
+
+def extract_drive_file_id(url):
+    """Return the Drive file id in ``url``, or None if it is not a Drive link."""
+    if not url or not isinstance(url, str):
+        return None
+    match = DRIVE_FILE_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def drive_thumbnail_url(file_id, size=DEFAULT_THUMBNAIL_SIZE):
+    return f"https://drive.google.com/thumbnail?id={file_id}&sz={size}"
+
+
+def google_drive_url(url):
+    """
+    Embeddable image URL for a stored image link.
+
+    Drive links become thumbnail URLs, other links are returned unchanged and
+    placeholder entries like "No Photo" give None.
+    """
+    if not url or not isinstance(url, str):
+        return url
+    if url.strip().lower() in INVALID_IMAGE_ENTRIES:
+        return None
+    file_id = extract_drive_file_id(url)
+    return drive_thumbnail_url(file_id) if file_id else url
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from leads_app.drive import extract_drive_file_id
+from leads_app.models import Lead
+from media_app.models import MediaAsset
+
+
+class Command(BaseCommand):
+    help = 'Fill Lead.drive_file_id for enquiries saved before the column existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Enquiries read and updated per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        scanned = changed = 0
+        last_pk = 0
+
+        # Walk the table in primary key ranges so each batch is one short query
+        while True:
+            rows = list(
+                Lead.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'image_url', 'drive_file_id')[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            scanned += len(rows)
+
+            stale = [
+                Lead(pk=pk, drive_file_id=file_id)
+                for pk, image_url, current in rows
+                for file_id in [extract_drive_file_id(image_url) or '']
+                if file_id != current
+            ]
+            if stale:
+                # Derived from image_url, so updated_date (and the change feed) is left alone
+                Lead.objects.bulk_update(stale, ['drive_file_id'])
+                MediaAsset.objects.filter(
+                    source='google_drive', lead_id__in=[lead.pk for lead in stale],
+                ).update(drive_file_id=Subquery(
+                    Lead.objects.filter(pk=OuterRef('lead_id')).values('drive_file_id')[:1]
+                ))
+                changed += len(stale)
+
+        self.stdout.write(self.style.SUCCESS(f'Scanned {scanned} enquiries, updated {changed} Drive file ids'))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_app', '0020_leadproduct_ankle_leadproduct_brand_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['updated_at', 'id'], name='leads_app_f_updated_e1b5f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['updated_date', 'id'], name='leads_app_l_updated_a701b2_idx'),
+        ),
+    ]
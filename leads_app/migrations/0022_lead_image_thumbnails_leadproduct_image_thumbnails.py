@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_app', '0021_followup_leads_app_f_updated_e1b5f5_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='image_thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Thumbnail renditions of images, see media_app.thumbnails'),
+        ),
+        migrations.AddField(
+            model_name='leadproduct',
+            name='image_thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Thumbnail renditions of image, see media_app.thumbnails'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_app', '0022_lead_image_thumbnails_leadproduct_image_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='drive_file_id',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Drive file id extracted from image_url on save', max_length=128),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_app', '0023_lead_drive_file_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['contact', '-created_date', '-id'], name='leads_app_l_contact_333467_idx'),
+        ),
+    ]
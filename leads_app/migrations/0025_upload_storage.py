@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:14
+
+import crm_project.storage_backends
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_app', '0024_contact_timeline_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lead',
+            name='images',
+            field=models.ImageField(blank=True, null=True, storage=crm_project.storage_backends.get_upload_storage, upload_to='enquiry_images/'),
+        ),
+        migrations.AlterField(
+            model_name='leadproduct',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=crm_project.storage_backends.get_upload_storage, upload_to='lead_product_images/'),
+        ),
+    ]
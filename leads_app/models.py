@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from crm_project.storage_backends import get_upload_storage, upload_storage
+from .drive import extract_drive_file_id
 # Use string-based FKs to avoid circular import issues
 
 
@@ -88,8 +90,10 @@ class Lead(models.Model):
     enquiry_stage = models.CharField(max_length=30, choices=ENQUIRY_STAGE_CHOICES, default='enquiry_received')
     is_locked = models.BooleanField(default=False, help_text="Prevents stage changes after fulfillment")
     reason = models.ForeignKey(Reason, on_delete=models.SET_NULL, null=True, blank=True, related_name='leads')
-    images = models.ImageField(upload_to='enquiry_images/', blank=True, null=True)
+    images = models.ImageField(upload_to='enquiry_images/', storage=get_upload_storage, blank=True, null=True)
+    image_thumbnails = models.JSONField(default=dict, blank=True, editable=False, help_text="Thumbnail renditions of images, see media_app.thumbnails")
     image_url = models.URLField(blank=True, null=True, help_text="Google Drive image URL for the enquiry")
+    drive_file_id = models.CharField(max_length=128, blank=True, default='', db_index=True, editable=False, help_text="Drive file id extracted from image_url on save")
     next_action = models.CharField(max_length=200, blank=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     notes = models.TextField(blank=True)
@@ -154,10 +158,33 @@ class Lead(models.Model):
             self._original_lead_status = None
             self._original_assigned_sales_person_id = None
 
+        # Parse the Drive link once here so render paths can use the id directly
+        self.drive_file_id = extract_drive_file_id(self.image_url) or ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image_url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'drive_file_id'}
+
         super().save(*args, **kwargs)
 
+    @property
+    def thumbnail_url(self):
+        """JPEG thumbnail of the uploaded image, falling back to the original"""
+        name = (self.image_thumbnails or {}).get('jpeg')
+        if name:
+            return upload_storage.url(name)
+        return self.images.url if self.images else None
+
+    @property
+    def thumbnail_webp_url(self):
+        name = (self.image_thumbnails or {}).get('webp')
+        return upload_storage.url(name) if name else None
+
     class Meta:
         ordering = ['-created_date']
+        indexes = [
+            models.Index(fields=['updated_date', 'id']),
+            models.Index(fields=['contact', '-created_date', '-id']),
+        ]
         
 
 
@@ -165,7 +192,8 @@ class LeadProduct(models.Model):
     lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='lead_products')
     category = models.ForeignKey('products.Category', on_delete=models.SET_NULL, null=True, blank=True)
     subcategory = models.ForeignKey('products.Subcategory', on_delete=models.SET_NULL, null=True, blank=True)
-    image = models.ImageField(upload_to='lead_product_images/', blank=True, null=True)
+    image = models.ImageField(upload_to='lead_product_images/', storage=get_upload_storage, blank=True, null=True)
+    image_thumbnails = models.JSONField(default=dict, blank=True, editable=False, help_text="Thumbnail renditions of image, see media_app.thumbnails")
     quantity = models.PositiveIntegerField(default=1, help_text="Quantity of the product")
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Price per unit")
     size = models.CharField(max_length=100, blank=True, null=True)
@@ -184,6 +212,19 @@ class LeadProduct(models.Model):
     def __str__(self):
         return f"{self.lead.contact_name} - {self.category.name if self.category else 'No Category'}"
 
+    @property
+    def thumbnail_url(self):
+        """JPEG thumbnail of the uploaded image, falling back to the original"""
+        name = (self.image_thumbnails or {}).get('jpeg')
+        if name:
+            return upload_storage.url(name)
+        return self.image.url if self.image else None
+
+    @property
+    def thumbnail_webp_url(self):
+        name = (self.image_thumbnails or {}).get('webp')
+        return upload_storage.url(name) if name else None
+
 
 class FollowUp(models.Model):
     """
@@ -225,6 +266,9 @@ class FollowUp(models.Model):
 
     class Meta:
         ordering = ['scheduled_date']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
         verbose_name = 'Follow-up'
         verbose_name_plural = 'Follow-ups'
         
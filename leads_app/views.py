@@ -26,60 +26,10 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.utils import timezone
 from .forms import FollowUpForm, FollowUpStatusForm
-
-def google_drive_url(url):
-    """
-    Convert Google Drive sharing link to thumbnail URL for better embedding reliability.
-    Input: https://drive.google.com/file/d/FILE_ID/view?usp=sharing
-    Output: https://drive.google.com/thumbnail?id=FILE_ID&sz=w400 (thumbnail format)
-    """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    if not url or not isinstance(url, str):
-        logger.warning(f"Invalid URL provided: {url}")
-        return url
-
-    # Skip invalid entries like "No Photo"
-    if url.strip().lower() in ['no photo', 'n/a', 'none', '']:
-        logger.warning(f"Skipping invalid image URL entry: {url}")
-        return None  # Return None to indicate invalid URL
-
-    logger.info(f"Processing Google Drive URL: {url}")
-
-    # Check if it's a Google Drive sharing link
-    if 'drive.google.com/file/d/' in url and '/view?usp=sharing' in url:
-        # Extract file ID from the URL
-        start = url.find('/file/d/') + 8
-        end = url.find('/view?usp=sharing')
-        if start != -1 and end != -1 and start < end:
-            file_id = url[start:end]
-
-            # Use thumbnail URL instead of uc?export=view for better embedding
-            # Thumbnail URLs are more reliable for web embedding
-            thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w400"
-            logger.info(f"✅ Converted Google Drive URL to thumbnail: {url} -> {thumbnail_url}")
-            return thumbnail_url
-
-    # Check if it's already a thumbnail URL
-    if 'drive.google.com/thumbnail?' in url and 'id=' in url:
-        logger.info(f"✅ Already a thumbnail URL: {url}")
-        return url
-
-    # Check if it's already a direct Google Drive URL (convert to thumbnail)
-    if 'drive.google.com/uc?' in url and 'id=' in url:
-        # Extract file ID and convert to thumbnail
-        id_start = url.find('id=') + 3
-        id_end = url.find('&', id_start) if '&' in url[id_start:] else len(url)
-        if id_start != -1:
-            file_id = url[id_start:id_end]
-            thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w400"
-            logger.info(f"✅ Converted uc URL to thumbnail: {url} -> {thumbnail_url}")
-            return thumbnail_url
-
-    # Return original URL if not a Google Drive link
-    logger.warning(f"❌ Not a recognized Google Drive URL format: {url}")
-    return url
+from media_app import chunked_upload
+from media_app.drive_cache import proxy_url_for_id as drive_proxy_url
+from media_app.models import ChunkedUpload
+from .drive import google_drive_url
 
 logger = logging.getLogger(__name__)
 
@@ -273,68 +223,87 @@ def dashboard(request):
     return render(request, 'crm_app/dashboard.html', context)
 
 # Enquiries
-@login_required
-def lead_list(request):
+def filter_leads_for_list(user, params):
+    """
+    Apply the enquiry list filters (owner, status, stage, country, search,
+    date range and tab) in ``params`` for ``user``.
+
+    Returns (leads, current_tab, from_date, to_date) so that the list view and
+    the exports share exactly the same filter set.
+    """
+    if user.is_superuser:
+        leads = Lead.objects.select_related('assigned_sales_person', 'created_by').all()
+    else:
+        leads = Lead.objects.select_related('assigned_sales_person', 'created_by').filter(assigned_sales_person=user)
+
+    owner_filter = params.get('owner')
+    if owner_filter:
+        leads = leads.filter(created_by_id=owner_filter)
+
+    enquiry_status_filter = params.get('enquiry_status')
+    if enquiry_status_filter:
+        leads = leads.filter(lead_status=enquiry_status_filter)
+
+    enquiry_stage_filter = params.get('enquiry_stage')
+    if enquiry_stage_filter:
+        leads = leads.filter(enquiry_stage=enquiry_stage_filter)
+
+    country_filter = params.get('country')
+    if country_filter:
+        leads = leads.filter(country__icontains=country_filter)
+
+    search_query = params.get('search')
+    if search_query:
+        leads = leads.filter(
+            Q(contact_name__icontains=search_query) |
+            Q(phone_number__icontains=search_query) |
+            Q(company_name__icontains=search_query)
+        )
+
+    # Date filtering
+    from_date = params.get('from_date')
+    to_date = params.get('to_date')
+    # A malformed date is ignored rather than failing the list or the export
     try:
-        if request.user.is_superuser:
-            leads = Lead.objects.select_related('assigned_sales_person', 'created_by').all()
-        else:
-            leads = Lead.objects.select_related('assigned_sales_person', 'created_by').filter(assigned_sales_person=request.user)
-
-        owner_filter = request.GET.get('owner')
-        if owner_filter:
-            leads = leads.filter(created_by_id=owner_filter)
-
-        enquiry_status_filter = request.GET.get('enquiry_status')
-        if enquiry_status_filter:
-            leads = leads.filter(lead_status=enquiry_status_filter)
-
-        enquiry_stage_filter = request.GET.get('enquiry_stage')
-        if enquiry_stage_filter:
-            leads = leads.filter(enquiry_stage=enquiry_stage_filter)
-
-        country_filter = request.GET.get('country')
-        if country_filter:
-            leads = leads.filter(country__icontains=country_filter)
-
-        search_query = request.GET.get('search')
-        if search_query:
-            leads = leads.filter(
-                Q(contact_name__icontains=search_query) |
-                Q(phone_number__icontains=search_query) |
-                Q(company_name__icontains=search_query)
-            )
+        from_date = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else None
+    except ValueError:
+        from_date = None
+    try:
+        to_date = datetime.strptime(to_date, '%Y-%m-%d').date() if to_date else None
+    except ValueError:
+        to_date = None
+    if from_date:
+        leads = leads.filter(created_date__date__gte=from_date)
+    if to_date:
+        leads = leads.filter(created_date__date__lte=to_date)
+
+    # Tab filter: main vs fulfilled vs pending_requests (salesperson) vs assigned (admin)
+    current_tab = params.get('tab') or 'main'
+    if current_tab == 'fulfilled':
+        leads = leads.filter(lead_status='fulfilled')
+    elif current_tab == 'pending_requests' and not user.is_superuser:
+        leads = leads.filter(assignment_status='pending', assigned_sales_person=user)
+    elif current_tab == 'assigned' and user.is_superuser:
+        # Show all enquiries that have ever been assigned a status
+        leads = Lead.objects.select_related('assigned_sales_person', 'created_by').filter(
+            assignment_status__isnull=False
+        )
+    else:
+        # Main tab: exclude fulfilled enquiries
+        # For sales users, also hide those awaiting their acceptance
+        q = ~Q(lead_status='fulfilled')
+        if not user.is_superuser:
+            q &= ~Q(assignment_status='pending', assigned_sales_person=user)
+        leads = leads.filter(q)
 
-        # Date filtering
-        from_date = request.GET.get('from_date')
-        to_date = request.GET.get('to_date')
-        if from_date:
-            from_date = datetime.strptime(from_date, '%Y-%m-%d').date()
-            leads = leads.filter(created_date__date__gte=from_date)
-        if to_date:
-            to_date = datetime.strptime(to_date, '%Y-%m-%d').date()
-            leads = leads.filter(created_date__date__lte=to_date)
-
-        # Tab filter: main vs fulfilled vs pending_requests (salesperson) vs assigned (admin)
-        current_tab = request.GET.get('tab') or 'main'
-        if current_tab == 'fulfilled':
-            leads = leads.filter(lead_status='fulfilled')
-        elif current_tab == 'pending_requests' and not request.user.is_superuser:
-            leads = leads.filter(assignment_status='pending', assigned_sales_person=request.user)
-        elif current_tab == 'assigned' and request.user.is_superuser:
-            # Show all enquiries that have ever been assigned a status
-            leads = Lead.objects.select_related('assigned_sales_person', 'created_by').filter(
-                assignment_status__isnull=False
-            )
-        else:
-            # Main tab: exclude fulfilled enquiries
-            # For sales users, also hide those awaiting their acceptance
-            q = ~Q(lead_status='fulfilled')
-            if not request.user.is_superuser:
-                q &= ~Q(assignment_status='pending', assigned_sales_person=request.user)
-            leads = leads.filter(q)
+    leads = leads.order_by('-created_date')
+    return leads, current_tab, from_date, to_date
 
-        leads = leads.order_by('-created_date')
+
+@login_required
+def lead_list(request):
+    try:
+        leads, current_tab, from_date, to_date = filter_leads_for_list(request.user, request.GET)
 
         paginator = Paginator(leads, 10)
         page_number = request.GET.get('page')
@@ -374,9 +343,15 @@ def lead_list(request):
         today_followups = [f for f in followups if f.is_due_today]
         upcoming_followups = [f for f in followups if f.is_upcoming]
 
+        # The export link names the tab explicitly, so it exports what is on screen
+        export_query = request.GET.copy()
+        export_query['tab'] = current_tab
+        export_query.pop('page', None)
+
         context = {
             'leads': page_obj,
             'page_obj': page_obj,
+            'export_query': export_query.urlencode(),
             'status_choices': Lead.STATUS_CHOICES,
             'stage_choices': Lead.ENQUIRY_STAGE_CHOICES,
             'owners': owners,
@@ -510,6 +485,8 @@ def lead_detail(request, pk):
             'quantity': lp.quantity,
             'price': lp.price,
             'image': lp.image,
+            'thumbnail_url': lp.thumbnail_url,
+            'thumbnail_webp_url': lp.thumbnail_webp_url,
             'size': lp.size,
             'color': lp.color,
             'model': lp.model,
@@ -536,7 +513,8 @@ def lead_detail(request, pk):
             })
 
     # Process Google Drive URL if present
-    processed_image_url = google_drive_url(lead.image_url) if lead.image_url else None
+    # drive_file_id is extracted on save, so no link parsing here
+    processed_image_url = drive_proxy_url(lead.drive_file_id) if lead.drive_file_id else google_drive_url(lead.image_url)
 
     context = {
         'lead': lead,
@@ -2397,33 +2375,6 @@ def lead_bulk_import(request):
             print(f"DataFrame shape: {df.shape}")
             print(f"Raw DataFrame columns: {list(df.columns)}")
 
-            # Helper: normalize Google Drive links to embeddable form for <img src>
-            def _normalize_drive_url(url: str) -> str:
-                try:
-                    if not url:
-                        return url
-                    url = url.strip()
-                    # Patterns we handle:
-                    # - https://drive.google.com/file/d/<FILE_ID>/view?usp=sharing
-                    # - https://drive.google.com/open?id=<FILE_ID>
-                    # - https://drive.google.com/uc?id=<FILE_ID>
-                    # Return: https://drive.google.com/uc?export=view&id=<FILE_ID>
-                    import re
-                    m = re.search(r"/file/d/([A-Za-z0-9_-]+)", url)
-                    if m:
-                        file_id = m.group(1)
-                        return f"https://drive.google.com/uc?export=view&id={file_id}"
-                    m = re.search(r"[?&#]id=([A-Za-z0-9_-]+)", url)
-                    if m:
-                        file_id = m.group(1)
-                        return f"https://drive.google.com/uc?export=view&id={file_id}"
-                    # If already uc link, ensure export=view
-                    if "drive.google.com/uc" in url and "id=" in url and "export=view" not in url:
-                        return url + ("&" if "?" in url else "?") + "export=view"
-                    return url
-                except Exception:
-                    return url
-
             # Normalize and map headers to expected names
             print("Normalizing headers...")
             original_cols = list(df.columns)
@@ -2534,7 +2485,7 @@ def lead_bulk_import(request):
                     # Ensure non-null company_name to avoid DB NOT NULL error
                     company_name = company_raw or (contact_name if contact_name else 'Unknown')
                     image_url_raw = (str(row.get('Image URL', '')).strip() or None)
-                    image_url = _normalize_drive_url(image_url_raw) if image_url_raw else None
+                    image_url = google_drive_url(image_url_raw) if image_url_raw else None
                     category_name = str(row.get('Category', '')).strip()
                     product_name = str(row.get('Item', '')).strip()
                     fulfilled = str(row.get('Fulfilled', '')).strip().lower() in ['yes', 'true', '1', 'y']
@@ -2650,59 +2601,87 @@ def lead_bulk_import(request):
     return redirect('crm_app:lead_list')
 
 
-@login_required
-def lead_bulk_export(request):
-    """Export all leads to Excel"""
-    from openpyxl import Workbook
-    from django.http import HttpResponse
+# Headers matching import format
+LEAD_EXPORT_HEADERS = [
+    'Date', 'Salesman', 'Customer Phone #', 'Customer Name', 'New/Old', 'Item', 'Category',
+    'Local / Import', 'Qty', 'Price', 'Image URL', 'Fulfilled', 'Reason', 'Follow ups',
+    'Comments', 'Sales Invoice No.', 'Company Name'
+]
 
-    # Get all leads (superuser sees all, others see assigned)
-    if request.user.is_superuser:
-        leads = Lead.objects.select_related('assigned_sales_person', 'created_by', 'category', 'reason').all()
-    else:
-        leads = Lead.objects.select_related('assigned_sales_person', 'created_by', 'category', 'reason').filter(assigned_sales_person=request.user)
-
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Enquiries"
-
-    # Headers matching import format
-    headers = [
-        'Date', 'Salesman', 'Customer Phone #', 'Customer Name', 'New/Old', 'Item', 'Category',
-        'Local / Import', 'Qty', 'Price', 'Image URL', 'Fulfilled', 'Reason', 'Follow ups',
-        'Comments', 'Sales Invoice No.', 'Company Name'
+# Rows fetched per database round-trip while exporting
+LEAD_EXPORT_CHUNK_SIZE = 2000
+
+
+def lead_export_queryset(leads):
+    """Add the joins/prefetches needed to export leads without per-row queries."""
+    from django.db.models import Prefetch
+
+    return leads.select_related('assigned_sales_person', 'category', 'reason').prefetch_related(
+        Prefetch('products_enquired', queryset=Product.objects.only('id', 'name'))
+    )
+
+
+def lead_export_row(lead):
+    """Build one export row; expects a lead from lead_export_queryset()."""
+    return [
+        lead.created_date.strftime('%Y-%m-%d') if lead.created_date else '',
+        lead.assigned_sales_person.get_full_name() if lead.assigned_sales_person else '',
+        lead.phone_number,
+        lead.contact_name,
+        '',  # New/Old - from notes if available
+        ', '.join([p.name for p in lead.products_enquired.all()]),
+        lead.category.name if lead.category else '',
+        '',  # Local / Import
+        '',  # Qty
+        '',  # Price
+        lead.image_url or '',
+        'Yes' if lead.lead_status == 'fulfilled' else 'No',
+        lead.reason.name if lead.reason else '',
+        '',  # Follow ups
+        lead.notes or '',
+        lead.invoice_number or '',
+        lead.company_name or '',
     ]
-    ws.append(headers)
-
-    # Add data
-    for lead in leads:
-        row = [
-            lead.created_date.strftime('%Y-%m-%d') if lead.created_date else '',
-            lead.assigned_sales_person.get_full_name() if lead.assigned_sales_person else '',
-            lead.phone_number,
-            lead.contact_name,
-            '',  # New/Old - from notes if available
-            ', '.join([p.name for p in lead.products_enquired.all()]),
-            lead.category.name if lead.category else '',
-            '',  # Local / Import
-            '',  # Qty
-            '',  # Price
-            lead.image_url or '',
-            'Yes' if lead.lead_status == 'fulfilled' else 'No',
-            lead.reason.name if lead.reason else '',
-            '',  # Follow ups
-            lead.notes or '',
-            lead.invoice_number or '',
-            lead.company_name or '',
-        ]
-        ws.append(row)
-
-    # Create response
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename=enquiries_export.xlsx'
-    wb.save(response)
-    return response
+
+
+def write_leads_xlsx(leads, fileobj):
+    """
+    Stream leads into an .xlsx file object.
+
+    Uses openpyxl's write-only mode (rows are flushed to disk instead of kept
+    in memory) and iterates the queryset in chunks, so memory stays bounded
+    regardless of the number of enquiries.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Enquiries")
+    ws.append(LEAD_EXPORT_HEADERS)
+    for lead in lead_export_queryset(leads).iterator(chunk_size=LEAD_EXPORT_CHUNK_SIZE):
+        ws.append(lead_export_row(lead))
+    wb.save(fileobj)
+
+
+@login_required
+def lead_bulk_export(request):
+    """Export the enquiries matching the current list filters to Excel"""
+    import tempfile
+    from django.http import FileResponse
+
+    # Same visibility and filters as the enquiry list (superuser sees all, others see assigned)
+    leads, _, _, _ = filter_leads_for_list(request.user, request.GET)
+
+    # Spool to a temporary file rather than building the workbook in memory
+    export_file = tempfile.TemporaryFile(suffix='.xlsx')
+    write_leads_xlsx(leads, export_file)
+    export_file.seek(0)
+
+    return FileResponse(
+        export_file,
+        as_attachment=True,
+        filename='enquiries_export.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
 
 
 @login_required
@@ -2756,23 +2735,60 @@ def lead_bulk_delete(request):
     return redirect('crm_app:lead_list')
 
 
-@login_required
-@require_POST
-def upload_whatsapp_file(request):
-    """Handle file upload for WhatsApp sending - uses local storage"""
+def _whatsapp_storage():
+    """Local storage for files shared over WhatsApp (not S3, the link must work immediately)"""
     import os
     from django.core.files.storage import FileSystemStorage
     # Import Django settings under a different name to avoid collision with
     # the local settings() view defined in this module
     from django.conf import settings as django_settings
-    
+
+    # Guard against MEDIA_ROOT being empty when S3 is enabled
+    media_root = getattr(django_settings, 'MEDIA_ROOT', None)
+    if not media_root:
+        # Fallback to BASE_DIR / 'media' if MEDIA_ROOT is not configured
+        media_root = os.path.join(str(django_settings.BASE_DIR), 'media')
+    whatsapp_dir = os.path.join(media_root, 'whatsapp_files')
+
+    # Create directory if it doesn't exist
+    os.makedirs(whatsapp_dir, exist_ok=True)
+    return FileSystemStorage(location=whatsapp_dir, base_url='/media/whatsapp_files/')
+
+
+def _whatsapp_filename(original_filename):
+    # Unique filename with timestamp
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    return f"{timestamp}_{original_filename}"
+
+
+def _log_whatsapp_file(request, lead_id, whatsapp_number, message, original_filename):
+    if not lead_id:
+        return
+    try:
+        lead = Lead.objects.get(pk=lead_id)
+        ActivityLog.objects.create(
+            lead=lead,
+            activity_type='email',  # Using 'email' as closest type
+            subject=f'File sent via WhatsApp to {whatsapp_number}',
+            description=f'File "{original_filename}" uploaded and shared via WhatsApp{" with message: " + message if message else ""}',
+            user=request.user,
+            activity_date=timezone.now()
+        )
+    except (Lead.DoesNotExist, ValueError):
+        pass
+
+
+@login_required
+@require_POST
+def upload_whatsapp_file(request):
+    """Handle file upload for WhatsApp sending - uses local storage"""
     try:
         # Get uploaded file
         uploaded_file = request.FILES.get('file')
         if not uploaded_file:
             return JsonResponse({'success': False, 'error': 'No file uploaded'})
         
-        # Validate file size (10MB limit)
+        # Validate file size (10MB limit, larger files use the chunked upload)
         if uploaded_file.size > 10 * 1024 * 1024:
             return JsonResponse({'success': False, 'error': 'File size exceeds 10MB limit'})
         
@@ -2781,43 +2797,16 @@ def upload_whatsapp_file(request):
         message = request.POST.get('message', '')
         lead_id = request.POST.get('lead_id', '')
         
-        # Use local file system storage for WhatsApp files (not S3)
-        # Guard against MEDIA_ROOT being empty when S3 is enabled
-        media_root = getattr(django_settings, 'MEDIA_ROOT', None)
-        if not media_root:
-            # Fallback to BASE_DIR / 'media' if MEDIA_ROOT is not configured
-            media_root = os.path.join(str(django_settings.BASE_DIR), 'media')
-        whatsapp_dir = os.path.join(media_root, 'whatsapp_files')
-        
-        # Create directory if it doesn't exist
-        os.makedirs(whatsapp_dir, exist_ok=True)
-        
-        # Generate unique filename with timestamp
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        original_filename = uploaded_file.name
-        safe_filename = f"{timestamp}_{original_filename}"
-        
         # Save file locally
-        fs = FileSystemStorage(location=whatsapp_dir, base_url='/media/whatsapp_files/')
-        filename = fs.save(safe_filename, uploaded_file)
+        fs = _whatsapp_storage()
+        original_filename = uploaded_file.name
+        filename = fs.save(_whatsapp_filename(original_filename), uploaded_file)
         
         # Generate full URL for the file
         file_url = request.build_absolute_uri(fs.url(filename))
         
         # Log the activity
-        if lead_id:
-            try:
-                lead = Lead.objects.get(pk=lead_id)
-                ActivityLog.objects.create(
-                    lead=lead,
-                    activity_type='email',  # Using 'email' as closest type
-                    subject=f'File sent via WhatsApp to {whatsapp_number}',
-                    description=f'File "{original_filename}" uploaded and shared via WhatsApp{" with message: " + message if message else ""}',
-                    user=request.user,
-                    activity_date=timezone.now()
-                )
-            except Lead.DoesNotExist:
-                pass
+        _log_whatsapp_file(request, lead_id, whatsapp_number, message, original_filename)
         
         return JsonResponse({
             'success': True,
@@ -2834,3 +2823,77 @@ def upload_whatsapp_file(request):
             'success': False,
             'error': f'Upload failed: {str(e)}'
         })
+
+
+@login_required
+@require_POST
+def whatsapp_upload_start(request):
+    """Begin a resumable upload for a WhatsApp file of any size up to CHUNKED_UPLOAD_MAX_BYTES"""
+    from django.conf import settings as django_settings
+
+    try:
+        total_size = int(request.POST.get('size', ''))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'File size is required'}, status=400)
+    try:
+        upload = chunked_upload.start_upload(request.user, request.POST.get('filename', ''), total_size)
+    except chunked_upload.ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    return JsonResponse({
+        'success': True,
+        'upload_id': str(upload.upload_id),
+        'offset': 0,
+        'chunk_size': django_settings.CHUNKED_UPLOAD_MAX_CHUNK_BYTES,
+    })
+
+
+@login_required
+@require_http_methods(["GET", "PUT"])
+def whatsapp_upload_chunk(request, upload_id):
+    """
+    GET reports the bytes received so far; PUT appends a chunk sent with an
+    Upload-Offset header and its hex SHA-256 in Upload-Checksum
+    """
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id, user=request.user)
+    if request.method == 'GET':
+        return JsonResponse({'success': True, 'offset': upload.received_bytes, 'size': upload.total_size})
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.headers.get('Content-Length') or 0)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Upload-Offset header is required'}, status=400)
+    try:
+        received = chunked_upload.write_chunk(
+            upload, offset, request, length, request.headers.get('Upload-Checksum', '').strip(),
+        )
+    except chunked_upload.ChunkedUploadError as e:
+        upload.refresh_from_db(fields=['received_bytes'])
+        return JsonResponse({'success': False, 'error': str(e), 'offset': upload.received_bytes}, status=e.status)
+    return JsonResponse({'success': True, 'offset': received})
+
+
+@login_required
+@require_POST
+def whatsapp_upload_complete(request, upload_id):
+    """Verify the chunk checksum chain, store the file and log it like upload_whatsapp_file"""
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id, user=request.user)
+    fs = _whatsapp_storage()
+    try:
+        filename = chunked_upload.finish_upload(
+            upload, fs, _whatsapp_filename(upload.filename), request.POST.get('checksum', ''),
+        )
+    except chunked_upload.ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+
+    _log_whatsapp_file(
+        request, request.POST.get('lead_id', ''), request.POST.get('whatsapp_number', ''),
+        request.POST.get('message', ''), upload.filename,
+    )
+    return JsonResponse({
+        'success': True,
+        'file_url': request.build_absolute_uri(fs.url(filename)),
+        'file_name': upload.filename,
+        'file_path': filename,
+        'sha256': upload.sha256,
+    })
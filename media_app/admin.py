@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DriveImageStatus, MediaAsset
+
+
+@admin.register(MediaAsset)
+class MediaAssetAdmin(admin.ModelAdmin):
+    list_display = ['id', 'source', 'client_name', 'category_name', 'salesperson_name', 'created_date']
+    list_filter = ['source']
+    search_fields = ['client_name', 'company_name', 'url']
+    raw_id_fields = ['lead', 'lead_product', 'salesperson']
+
+
+@admin.register(DriveImageStatus)
+class DriveImageStatusAdmin(admin.ModelAdmin):
+    list_display = ['url', 'is_accessible', 'status_code', 'reason', 'last_checked_at']
+    list_filter = ['is_accessible']
+    search_fields = ['url']
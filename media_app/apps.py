@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class MediaAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'media_app'
+
+    def ready(self):
+        # Import signal handlers
+        try:
+            from . import signals  # noqa: F401
+        except Exception:
+            # Avoid import-time crashes; signals should not break startup
+            pass
@@ -0,0 +1,180 @@
+"""
+Resumable chunked uploads for files too large for one request.
+
+The client announces the file (``start_upload``), sends it as a series of
+``PUT`` bodies each tagged with the byte offset it starts at
+(``write_chunk``), and finally asks for it to be verified and stored
+(``finish_upload``). Chunks are streamed straight into a ``.part`` file in
+``CHUNKED_UPLOAD_DIR``, so a worker never holds more than one read buffer of
+the upload in memory. After a dropped connection the client asks for
+``received_bytes`` and continues from there.
+
+Every chunk carries the SHA-256 of its bytes, checked while it is written, so
+a corrupted chunk is refused on its own. The chunk digests are folded into a
+chain (``chain_digest``) that the client also keeps and must send to finish;
+``finish_upload`` re-reads the assembled file chunk by chunk and rebuilds the
+chain before storing it. Neither side ever hashes the whole file in memory.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import ChunkedUpload
+
+READ_SIZE = 64 * 1024
+
+
+class ChunkedUploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def part_path(upload):
+    directory = str(settings.CHUNKED_UPLOAD_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{upload.upload_id}.part')
+
+
+def chain_digest(chain, chunk_sha256):
+    """Fold one chunk digest into the running chain: sha256 of the two hex strings."""
+    return hashlib.sha256(f'{chain}{chunk_sha256}'.encode()).hexdigest()
+
+
+def start_upload(user, filename, total_size):
+    if total_size <= 0:
+        raise ChunkedUploadError('File size must be positive')
+    if total_size > settings.CHUNKED_UPLOAD_MAX_BYTES:
+        raise ChunkedUploadError(
+            f'File size exceeds the {settings.CHUNKED_UPLOAD_MAX_BYTES // (1024 * 1024)}MB limit', status=413
+        )
+    filename = get_valid_filename(os.path.basename(filename or '')) or 'upload'
+    upload = ChunkedUpload.objects.create(user=user, filename=filename[:255], total_size=total_size)
+    open(part_path(upload), 'wb').close()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length, sha256):
+    """
+    Append ``length`` bytes read from ``stream`` at ``offset``, verifying them
+    against ``sha256``.
+
+    The offset must equal the bytes received so far; a client that is out of
+    step gets a 409 and resumes from ``received_bytes``. A chunk that arrives
+    short or does not match its checksum is dropped and gets a 422. Returns the
+    new total.
+    """
+    if upload.status != 'uploading':
+        raise ChunkedUploadError('Upload is already complete', status=409)
+    if offset != upload.received_bytes:
+        raise ChunkedUploadError(f'Expected offset {upload.received_bytes}', status=409)
+    if not sha256:
+        raise ChunkedUploadError('Chunk checksum is required')
+    if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_BYTES:
+        raise ChunkedUploadError('Chunk too large', status=413)
+    if offset + length > upload.total_size:
+        raise ChunkedUploadError('Chunk runs past the announced file size')
+
+    digest = hashlib.sha256()
+    written = 0
+    with open(part_path(upload), 'r+b') as f:
+        f.seek(offset)
+        f.truncate()  # drop bytes from an earlier attempt that were never acknowledged
+        while written < length:
+            data = stream.read(min(READ_SIZE, length - written))
+            if not data:
+                break  # client went away
+            f.write(data)
+            digest.update(data)
+            written += len(data)
+        if written != length or digest.hexdigest() != sha256.lower():
+            f.truncate(offset)
+            raise ChunkedUploadError('Chunk checksum mismatch, send the chunk again', status=422)
+
+    # Conditional update: a concurrent retry of the same chunk cannot double count
+    chain = chain_digest(upload.chain_sha256, digest.hexdigest())
+    chunk_sizes = [*upload.chunk_sizes, written]
+    updated = ChunkedUpload.objects.filter(pk=upload.pk, received_bytes=offset).update(
+        received_bytes=offset + written, chunk_sizes=chunk_sizes, chain_sha256=chain, updated_at=timezone.now(),
+    )
+    if not updated:
+        raise ChunkedUploadError('Upload changed concurrently', status=409)
+    upload.received_bytes = offset + written
+    upload.chunk_sizes = chunk_sizes
+    upload.chain_sha256 = chain
+    return upload.received_bytes
+
+
+def _verify_part(path, chunk_sizes):
+    """Re-read the assembled file; returns ``(chain digest, file sha256)``."""
+    chain = ''
+    file_digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for size in chunk_sizes:
+            chunk_digest = hashlib.sha256()
+            remaining = size
+            while remaining:
+                block = f.read(min(READ_SIZE, remaining))
+                if not block:
+                    break
+                chunk_digest.update(block)
+                file_digest.update(block)
+                remaining -= len(block)
+            chain = chain_digest(chain, chunk_digest.hexdigest())
+        if f.read(1):
+            chain = ''  # trailing bytes no chunk accounts for
+    return chain, file_digest.hexdigest()
+
+
+def finish_upload(upload, storage, name, checksum):
+    """
+    Verify the assembled file against the chunk chain and save it to
+    ``storage``; returns the stored name.
+
+    ``checksum`` is the client's chain over the chunks it sent.
+    """
+    if upload.status != 'uploading':
+        raise ChunkedUploadError('Upload is already complete', status=409)
+    if not checksum:
+        raise ChunkedUploadError('Checksum is required')
+    if upload.received_bytes != upload.total_size:
+        raise ChunkedUploadError(f'Upload incomplete: {upload.received_bytes} of {upload.total_size} bytes', status=409)
+
+    path = part_path(upload)
+    chain, file_sha256 = _verify_part(path, upload.chunk_sizes)
+    if not (checksum.lower() == upload.chain_sha256 == chain):
+        # The bytes on disk are bad; make the client start over
+        open(path, 'wb').close()
+        ChunkedUpload.objects.filter(pk=upload.pk).update(
+            received_bytes=0, chunk_sizes=[], chain_sha256='', updated_at=timezone.now(),
+        )
+        raise ChunkedUploadError('Checksum mismatch, upload the file again', status=422)
+
+    with open(path, 'rb') as f:
+        stored_name = storage.save(name, File(f, name=upload.filename))
+    os.remove(path)
+
+    upload.status = 'complete'
+    upload.sha256 = file_sha256
+    upload.stored_name = stored_name
+    upload.save(update_fields=['status', 'sha256', 'stored_name', 'updated_at'])
+    return stored_name
+
+
+def purge_stale_uploads(max_age_hours=None):
+    """Delete unfinished uploads untouched for ``max_age_hours``; returns how many."""
+    max_age_hours = max_age_hours if max_age_hours is not None else settings.CHUNKED_UPLOAD_TTL_HOURS
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    stale = list(ChunkedUpload.objects.filter(status='uploading', updated_at__lt=cutoff))
+    for upload in stale:
+        try:
+            os.remove(part_path(upload))
+        except FileNotFoundError:
+            pass
+    ChunkedUpload.objects.filter(pk__in=[upload.pk for upload in stale]).delete()
+    return len(stale)
@@ -0,0 +1,187 @@
+"""
+Size-bounded on-disk cache for Google Drive thumbnails.
+
+Each entry is ``<sha1>.img`` plus a ``<sha1>.json`` sidecar holding the
+content type, ETag and fetch time. Hits bump the image's mtime, so eviction
+drops the least recently used entries once the directory grows past
+``DRIVE_IMAGE_CACHE_MAX_BYTES``. Entries older than the TTL are refetched, and
+a stale entry is still served if Drive is unreachable.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+from django.conf import settings
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+FILE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,128}$')
+SIZE_RE = re.compile(r'^[wh]\d{2,4}$')
+DEFAULT_SIZE = 'w400'
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+# Striped locks: concurrent requests for the same image wait for one fetch
+_fetch_locks = [threading.Lock() for _ in range(32)]
+_evict_lock = threading.Lock()
+
+
+class DriveFetchError(Exception):
+    pass
+
+
+class CachedImage:
+    def __init__(self, path, content_type, etag, fetched_at):
+        self.path = path
+        self.content_type = content_type
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+def _cache_dir():
+    path = str(settings.DRIVE_IMAGE_CACHE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _paths(file_id, size):
+    digest = hashlib.sha1(f'{file_id}:{size}'.encode()).hexdigest()
+    base = os.path.join(_cache_dir(), digest)
+    return f'{base}.img', f'{base}.json'
+
+
+def _lock_for(key):
+    return _fetch_locks[hash(key) % len(_fetch_locks)]
+
+
+def proxy_url_for_id(file_id, size=DEFAULT_SIZE):
+    """Proxy URL for a Drive file id, as stored in ``Lead.drive_file_id``."""
+    return f"{reverse('media_app:drive_thumbnail')}?{urlencode({'id': file_id, 'sz': size})}"
+
+
+def proxy_url(drive_url):
+    """Proxy URL for a Drive thumbnail URL, or ``drive_url`` unchanged if it is not one."""
+    if not drive_url or 'drive.google.com/thumbnail' not in drive_url:
+        return drive_url
+    query = parse_qs(urlparse(drive_url).query)
+    file_id = (query.get('id') or [''])[0]
+    size = (query.get('sz') or [DEFAULT_SIZE])[0]
+    if not FILE_ID_RE.match(file_id):
+        return drive_url
+    return proxy_url_for_id(file_id, size)
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _load(file_id, size):
+    image_path, meta_path = _paths(file_id, size)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.exists(image_path):
+        return None
+    return CachedImage(image_path, meta['content_type'], meta['etag'], meta['fetched_at'])
+
+
+def _fetch(file_id, size):
+    base_url = settings.DRIVE_THUMBNAIL_BASE_URL
+    try:
+        response = requests.get(base_url, params={'id': file_id, 'sz': size}, timeout=10, stream=True)
+    except requests.exceptions.RequestException as e:
+        raise DriveFetchError(str(e))
+
+    with response:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        if response.status_code != 200 or not content_type.startswith('image/'):
+            raise DriveFetchError(f'Drive returned {response.status_code} ({content_type or "no content type"})')
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(64 * 1024):
+            total += len(chunk)
+            if total > MAX_IMAGE_BYTES:
+                raise DriveFetchError('Image exceeds the proxy size limit')
+            chunks.append(chunk)
+    return b''.join(chunks), content_type
+
+
+def _store(file_id, size, content, content_type):
+    image_path, meta_path = _paths(file_id, size)
+    meta = {
+        'content_type': content_type,
+        'etag': f'"{hashlib.sha1(content).hexdigest()}"',
+        'fetched_at': time.time(),
+    }
+    # Write then rename so readers never see a partial file
+    for path, data, mode in ((image_path, content, 'wb'), (meta_path, json.dumps(meta), 'w')):
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return CachedImage(image_path, meta['content_type'], meta['etag'], meta['fetched_at'])
+
+
+def evict(max_bytes=None):
+    """Drop least recently used entries until the cache fits ``max_bytes``; returns bytes freed."""
+    max_bytes = max_bytes if max_bytes is not None else settings.DRIVE_IMAGE_CACHE_MAX_BYTES
+    with _evict_lock:
+        entries = []
+        total = 0
+        with os.scandir(_cache_dir()) as it:
+            for entry in it:
+                if entry.name.endswith('.img'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            for victim in (path, path[:-4] + '.json'):
+                try:
+                    os.remove(victim)
+                except FileNotFoundError:
+                    pass
+            freed += size
+        return freed
+
+
+def get_image(file_id, size=DEFAULT_SIZE):
+    """Return a CachedImage for the Drive thumbnail, fetching it at most once per TTL."""
+    if not FILE_ID_RE.match(file_id or '') or not SIZE_RE.match(size or ''):
+        raise ValueError('Invalid Drive file id or size')
+
+    ttl = settings.DRIVE_IMAGE_CACHE_TTL_SECONDS
+    cached = _load(file_id, size)
+    if cached and time.time() - cached.fetched_at < ttl:
+        try:
+            os.utime(cached.path)  # mark as recently used
+            return cached
+        except FileNotFoundError:
+            pass  # evicted meanwhile; fetch again
+
+    with _lock_for(f'{file_id}:{size}'):
+        # Another thread may have refreshed the entry while we waited
+        cached = _load(file_id, size)
+        if cached and time.time() - cached.fetched_at < ttl:
+            return cached
+        try:
+            content, content_type = _fetch(file_id, size)
+        except DriveFetchError as e:
+            if cached:
+                logger.warning(f"Serving stale Drive image {file_id}: {e}")
+                return cached
+            raise
+        cached = _store(file_id, size, content, content_type)
+
+    evict()
+    return cached
@@ -0,0 +1,83 @@
+"""
+Concurrent Google Drive accessibility checks with per-host rate limiting.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.utils import timezone
+
+from .models import DriveImageStatus
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """Spaces out requests to each host to at most ``rate`` per second across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def check_urls(urls, workers=8, rate_per_host=5.0):
+    """Check ``urls`` concurrently; returns {url: status dict} as produced by check_google_drive_accessibility."""
+    from .views import check_google_drive_accessibility
+
+    limiter = HostRateLimiter(rate_per_host)
+
+    def check(url):
+        limiter.wait(url)
+        try:
+            return url, check_google_drive_accessibility(url)
+        except Exception as e:
+            return url, {'accessible': False, 'error': str(e), 'reason': 'Check failed'}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(check, urls))
+
+
+def recently_checked(urls, max_age):
+    """The subset of ``urls`` whose status is newer than ``max_age`` (a timedelta)."""
+    cutoff = timezone.now() - max_age
+    return set(
+        DriveImageStatus.objects.filter(url__in=list(urls), last_checked_at__gte=cutoff)
+        .values_list('url', flat=True)
+    )
+
+
+def record_results(results):
+    """Upsert DriveImageStatus rows for a {url: status} mapping."""
+    now = timezone.now()
+    rows = [
+        DriveImageStatus(
+            url=url,
+            is_accessible=bool(status.get('accessible')),
+            status_code=status.get('status'),
+            reason=(status.get('reason') or status.get('error') or '')[:255],
+            last_checked_at=now,
+        )
+        for url, status in results.items()
+    ]
+    DriveImageStatus.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['url'],
+        update_fields=['is_accessible', 'status_code', 'reason', 'last_checked_at'],
+    )
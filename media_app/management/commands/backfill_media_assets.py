@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch, Q
+from leads_app.models import Lead, LeadProduct, Product
+from media_app.models import MediaAsset
+from media_app.sync import sync_lead_assets, sync_lead_product_asset
+
+
+class Command(BaseCommand):
+    help = 'Populate the MediaAsset table from existing enquiry and product images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Delete all media assets before backfilling',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Rows fetched per database round trip (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        if options['rebuild']:
+            deleted, _ = MediaAsset.objects.all().delete()
+            self.stdout.write(self.style.WARNING(f'Deleted {deleted} existing media assets'))
+
+        leads = (
+            Lead.objects.filter(
+                (Q(images__isnull=False) & ~Q(images='')) | (Q(image_url__isnull=False) & ~Q(image_url=''))
+            )
+            .select_related('category', 'assigned_sales_person')
+            .prefetch_related(Prefetch('products_enquired', queryset=Product.objects.only('id', 'name')))
+            .order_by('pk')
+        )
+        lead_count = 0
+        for lead in leads.iterator(chunk_size=chunk_size):
+            sync_lead_assets(lead)
+            lead_count += 1
+        self.stdout.write(f'Synced images for {lead_count} enquiries')
+
+        lead_products = (
+            LeadProduct.objects.exclude(image__isnull=True).exclude(image='')
+            .select_related('lead__assigned_sales_person', 'category', 'subcategory')
+            .order_by('pk')
+        )
+        product_count = 0
+        for lead_product in lead_products.iterator(chunk_size=chunk_size):
+            sync_lead_product_asset(lead_product)
+            product_count += 1
+        self.stdout.write(f'Synced images for {product_count} enquiry products')
+
+        self.stdout.write(self.style.SUCCESS(f'Media assets: {MediaAsset.objects.count()}'))
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
 from django.db.models import Q
+from leads_app.drive import drive_thumbnail_url, extract_drive_file_id, google_drive_url
 from leads_app.models import Lead
-from media_app.views import check_google_drive_accessibility, google_drive_url
+from media_app.drive_checker import check_urls, recently_checked, record_results
+from media_app.models import DriveImageStatus
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +30,29 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be changed without making changes',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of concurrent checks (default: 8)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=5.0,
+            help='Maximum requests per second to each host (default: 5)',
+        )
+        parser.add_argument(
+            '--recheck-after',
+            type=int,
+            default=24,
+            help='Skip URLs verified within this many hours (default: 24)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Check every URL, ignoring recent results',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('Checking Google Drive image accessibility...\n')
@@ -41,8 +68,11 @@ class Command(BaseCommand):
         invalid = 0
         fixed = 0
         cleaned = 0
+        skipped = 0
 
-        for lead in google_drive_leads:
+        # First pass: clean invalid entries and work out which URL each lead needs checked
+        lead_urls = []
+        for lead in google_drive_leads.only('id', 'contact_name', 'image_url').iterator(chunk_size=1000):
             original_url = lead.image_url
 
             # Check for invalid entries first
@@ -69,50 +99,69 @@ class Command(BaseCommand):
             # Process valid-looking URLs
             converted_url = google_drive_url(original_url)
             if converted_url is None:
-                # This shouldn't happen now with our improved validation, but just in case
                 invalid += 1
                 continue
+            lead_urls.append((lead, converted_url))
+
+        # Check each distinct URL once, skipping recently verified ones
+        urls = {url for _, url in lead_urls}
+        fresh = set() if options['force'] else recently_checked(urls, timedelta(hours=options['recheck_after']))
+        to_check = sorted(urls - fresh)
+        skipped = len(fresh)
+        self.stdout.write(f'Checking {len(to_check)} URLs ({skipped} verified within {options["recheck_after"]}h)\n')
+
+        results = check_urls(to_check, workers=options['workers'], rate_per_host=options['rate'])
+        if not options['dry_run']:
+            record_results(results)
+
+        known = {
+            status.url: status
+            for status in DriveImageStatus.objects.filter(url__in=list(fresh))
+        }
+
+        to_fix = []
+        for lead, converted_url in lead_urls:
+            if converted_url in results:
+                status = results[converted_url]
+                is_accessible = status['accessible']
+                reason = status.get('reason', status.get('error', 'Unknown'))
+            else:
+                is_accessible = known[converted_url].is_accessible
+                reason = known[converted_url].reason or 'Unknown'
 
-            # Check accessibility
-            status = check_google_drive_accessibility(converted_url)
-
-            if status['accessible']:
+            if is_accessible:
                 accessible += 1
                 self.stdout.write(
                     self.style.SUCCESS(f'✓ Accessible: {lead.contact_name} - {converted_url}')
                 )
             else:
                 inaccessible += 1
-                reason = status.get('reason', status.get('error', 'Unknown'))
                 self.stdout.write(
                     self.style.ERROR(f'✗ Inaccessible: {lead.contact_name} - {converted_url} ({reason})')
                 )
-
                 if options['fix'] and not options['dry_run']:
-                    # Try alternative URL formats
-                    file_id = None
-                    if 'drive.google.com/file/d/' in original_url:
-                        start = original_url.find('/file/d/') + 8
-                        end = original_url.find('/view?usp=sharing')
-                        if start != -1 and end != -1:
-                            file_id = original_url[start:end]
-
-                    if file_id:
-                        # Try thumbnail URL as alternative (now this is the primary format)
-                        thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w400"
-                        thumb_status = check_google_drive_accessibility(thumbnail_url)
-
-                        if thumb_status['accessible']:
-                            lead.image_url = thumbnail_url
-                            lead.save()
-                            fixed += 1
-                            self.stdout.write(
-                                self.style.SUCCESS(f'  → Fixed with thumbnail URL: {thumbnail_url}')
-                            )
-                        else:
-                            self.stdout.write(
-                                self.style.WARNING(f'  → Could not fix: thumbnail also inaccessible')
-                            )
+                    to_fix.append(lead)
+
+        # Try alternative URL formats for the broken ones
+        candidates = {}
+        for lead in to_fix:
+            file_id = extract_drive_file_id(lead.image_url)
+            if file_id:
+                candidates[lead] = drive_thumbnail_url(file_id)
+
+        fix_results = check_urls(sorted(set(candidates.values())), workers=options['workers'], rate_per_host=options['rate'])
+        for lead, thumbnail_url in candidates.items():
+            if fix_results[thumbnail_url]['accessible']:
+                lead.image_url = thumbnail_url
+                lead.save()
+                fixed += 1
+                self.stdout.write(
+                    self.style.SUCCESS(f'  → Fixed {lead.contact_name} with thumbnail URL: {thumbnail_url}')
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING(f'  → Could not fix {lead.contact_name}: thumbnail also inaccessible')
+                )
 
         # Summary
         self.stdout.write(f'\nSummary:')
@@ -120,6 +169,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Accessible: {accessible}'))
         self.stdout.write(self.style.ERROR(f'Inaccessible: {inaccessible}'))
         self.stdout.write(self.style.WARNING(f'Invalid entries: {invalid}'))
+        self.stdout.write(f'Skipped (recently verified URLs): {skipped}')
 
         if options['fix']:
             self.stdout.write(self.style.SUCCESS(f'Fixed: {fixed}'))
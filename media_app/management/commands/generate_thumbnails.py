@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from leads_app.models import Lead, LeadProduct
+from media_app.models import MediaAsset
+from media_app.thumbnails import generate_renditions, renditions_are_current
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _render(source_name):
+    """Worker: storage and Pillow work only; the storage's dedup index may still use the cache."""
+    try:
+        return source_name, generate_renditions(source_name), None
+    except Exception as e:
+        return source_name, None, str(e)
+    finally:
+        # A database cache opens a connection per worker thread
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or stale thumbnail renditions for enquiry and product images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of threads rendering images in parallel (default: 4)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Images handed to the pool at a time (default: 100)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate renditions even when they are up to date',
+        )
+
+    def handle(self, *args, **options):
+        targets = [
+            (Lead, 'images', 'lead_image', 'lead_id'),
+            (LeadProduct, 'image', 'product_image', 'lead_product_id'),
+        ]
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for model, image_field, asset_source, asset_fk in targets:
+                done, failed = self._process(executor, model, image_field, asset_source, asset_fk, options)
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model._meta.verbose_name_plural}: {done} rendered, {failed} failed'
+                ))
+
+    def _process(self, executor, model, image_field, asset_source, asset_fk, options):
+        rows = (
+            model.objects.exclude(**{f'{image_field}__isnull': True}).exclude(**{image_field: ''})
+            .order_by('pk')
+            .values_list('pk', image_field, 'image_thumbnails')
+        )
+        pending = [
+            (pk, name) for pk, name, renditions in rows.iterator(chunk_size=options['batch_size'])
+            if options['force'] or not renditions_are_current(renditions, name)
+        ]
+
+        done = failed = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            results = executor.map(_render, [name for _, name in batch])
+            for (pk, _), (name, renditions, error) in zip(batch, results):
+                if error:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'{model.__name__} {pk} ({name}): {error}'))
+                    continue
+                # Database writes stay on the main thread
+                model.objects.filter(pk=pk, **{image_field: name}).update(image_thumbnails=renditions)
+                MediaAsset.objects.filter(source=asset_source, **{asset_fk: pk}).update(thumbnails=renditions)
+                done += 1
+        return done, failed
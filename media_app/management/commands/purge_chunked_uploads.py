@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from media_app.chunked_upload import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete unfinished chunked uploads and their partial files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age-hours',
+            type=int,
+            default=None,
+            help='Purge uploads untouched for this many hours (default: CHUNKED_UPLOAD_TTL_HOURS)',
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads(options['max_age_hours'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} stale chunked uploads'))
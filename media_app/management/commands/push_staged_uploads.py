@@ -0,0 +1,20 @@
+from crm_project.storage_backends import upload_storage
+from django.core.management.base import BaseCommand
+from media_app.upload_queue import push_pending, staged_names
+
+
+class Command(BaseCommand):
+    help = 'Push files staged by the write-behind storage to object storage'
+
+    def handle(self, *args, **options):
+        if not hasattr(upload_storage, 'push'):
+            self.stdout.write(self.style.WARNING('The upload storage does not stage uploads; nothing to do'))
+            return
+
+        pushed, failed = push_pending(force=True)
+        self.stdout.write(self.style.SUCCESS(f'Pushed {pushed} staged files'))
+        if failed:
+            self.stdout.write(self.style.ERROR(f'{failed} uploads failed and stay staged for the next run'))
+        remaining = len(staged_names())
+        if remaining:
+            self.stdout.write(f'{remaining} files still staged')
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from media_app.processing import configured_fields, process_image, swap_processed_image
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _process(source_name, options):
+    """Worker: storage and Pillow work only, no database access."""
+    try:
+        return process_image(source_name, options), None
+    except Exception as e:
+        return None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Recompress and strip metadata from existing images of the fields in IMAGE_PROCESSING'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of threads processing images in parallel (default: 4)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Images read from the database and handed to the pool at a time (default: 50)',
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for model, field_name, field_options in configured_fields():
+                processed, unchanged, failed = self._process(executor, model, field_name, field_options, options['batch_size'])
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model.__name__}.{field_name}: {processed} recompressed, {unchanged} already optimized, {failed} failed'
+                ))
+
+    def _process(self, executor, model, field_name, field_options, batch_size):
+        processed = unchanged = failed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                model._default_manager.filter(pk__gt=last_pk)
+                .exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .order_by('pk')
+                .values_list('pk', field_name)[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            results = executor.map(_process, [name for _, name in batch], [field_options] * len(batch))
+            for (pk, name), (new_name, error) in zip(batch, results):
+                if error:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'{model.__name__} {pk} ({name}): {error}'))
+                elif not new_name or new_name == name:
+                    unchanged += 1
+                else:
+                    # Database writes stay on the main thread
+                    swap_processed_image(model, pk, field_name, name, new_name)
+                    processed += 1
+        return processed, unchanged, failed
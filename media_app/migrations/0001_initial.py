@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leads_app', '0021_followup_leads_app_f_updated_e1b5f5_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('lead_image', 'Enquiry Image'), ('product_image', 'Product Image'), ('google_drive', 'Google Drive')], max_length=20)),
+                ('url', models.CharField(help_text='Storage path for uploads, thumbnail URL for Google Drive images', max_length=1000)),
+                ('client_name', models.CharField(blank=True, max_length=100)),
+                ('company_name', models.CharField(blank=True, max_length=200)),
+                ('category_name', models.CharField(blank=True, max_length=100)),
+                ('product_name', models.CharField(blank=True, max_length=500)),
+                ('salesperson_name', models.CharField(blank=True, max_length=150)),
+                ('created_date', models.DateTimeField()),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_assets', to='leads_app.lead')),
+                ('lead_product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='media_assets', to='leads_app.leadproduct')),
+                ('salesperson', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='media_assets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_date', '-id'],
+                'indexes': [models.Index(fields=['-created_date', '-id'], name='media_app_m_created_50f080_idx'), models.Index(fields=['salesperson', '-created_date'], name='media_app_m_salespe_8f1ea6_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='mediaasset',
+            constraint=models.UniqueConstraint(condition=models.Q(('lead_product__isnull', True)), fields=('lead', 'source'), name='unique_media_asset_per_lead_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='mediaasset',
+            constraint=models.UniqueConstraint(condition=models.Q(('lead_product__isnull', False)), fields=('lead_product',), name='unique_media_asset_per_lead_product'),
+        ),
+    ]
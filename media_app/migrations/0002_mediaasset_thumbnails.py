@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaasset',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, help_text='Renditions copied from the source image, see media_app.thumbnails'),
+        ),
+    ]
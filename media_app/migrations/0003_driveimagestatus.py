@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_app', '0002_mediaasset_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriveImageStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=1000, unique=True)),
+                ('is_accessible', models.BooleanField(default=True)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('reason', models.CharField(blank=True, max_length=255)),
+                ('last_checked_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Drive image statuses',
+                'indexes': [models.Index(fields=['is_accessible', 'url'], name='media_app_d_is_acce_188237_idx'), models.Index(fields=['last_checked_at'], name='media_app_d_last_ch_f9ff7d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_app', '0003_driveimagestatus'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaasset',
+            name='drive_file_id',
+            field=models.CharField(blank=True, default='', help_text='Copied from Lead.drive_file_id for Google Drive images', max_length=128),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_app', '0005_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='chain_sha256',
+            field=models.CharField(blank=True, help_text='Chain of the chunk checksums, see media_app.chunked_upload', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='chunk_sizes',
+            field=models.JSONField(blank=True, default=list, help_text='Sizes of the verified chunks, in order'),
+        ),
+        migrations.AlterField(
+            model_name='chunkedupload',
+            name='sha256',
+            field=models.CharField(blank=True, help_text='Checksum of the stored file, computed on completion', max_length=64),
+        ),
+    ]
@@ -1,3 +1,113 @@
+import uuid
+
+from django.contrib.auth.models import User
+from crm_project.storage_backends import upload_storage
 from django.db import models
 
-# Create your models here.
+
+class MediaAsset(models.Model):
+    """
+    One gallery image, denormalized from Lead/LeadProduct so the gallery can
+    filter, sort and paginate in SQL. Kept in sync by media_app.signals and
+    rebuilt with ``backfill_media_assets``.
+    """
+    SOURCE_CHOICES = [
+        ('lead_image', 'Enquiry Image'),
+        ('product_image', 'Product Image'),
+        ('google_drive', 'Google Drive'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    url = models.CharField(max_length=1000, help_text="Storage path for uploads, thumbnail URL for Google Drive images")
+    drive_file_id = models.CharField(max_length=128, blank=True, default='', help_text="Copied from Lead.drive_file_id for Google Drive images")
+    thumbnails = models.JSONField(default=dict, blank=True, help_text="Renditions copied from the source image, see media_app.thumbnails")
+    lead = models.ForeignKey('leads_app.Lead', on_delete=models.CASCADE, related_name='media_assets')
+    lead_product = models.ForeignKey('leads_app.LeadProduct', on_delete=models.CASCADE, null=True, blank=True, related_name='media_assets')
+    client_name = models.CharField(max_length=100, blank=True)
+    company_name = models.CharField(max_length=200, blank=True)
+    category_name = models.CharField(max_length=100, blank=True)
+    product_name = models.CharField(max_length=500, blank=True)
+    salesperson = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='media_assets')
+    salesperson_name = models.CharField(max_length=150, blank=True)
+    created_date = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.get_source_display()} for {self.client_name} ({self.pk})"
+
+    @property
+    def image_url(self):
+        if self.source == 'google_drive':
+            if not self.drive_file_id:
+                return self.url  # a non-Drive link, used as is
+            from .drive_cache import proxy_url_for_id
+            return proxy_url_for_id(self.drive_file_id)
+        return upload_storage.url(self.url)
+
+    @property
+    def thumbnail_url(self):
+        name = (self.thumbnails or {}).get('jpeg')
+        return upload_storage.url(name) if name else self.image_url
+
+    @property
+    def thumbnail_webp_url(self):
+        name = (self.thumbnails or {}).get('webp')
+        return upload_storage.url(name) if name else None
+
+    class Meta:
+        ordering = ['-created_date', '-id']
+        indexes = [
+            models.Index(fields=['-created_date', '-id']),
+            models.Index(fields=['salesperson', '-created_date']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['lead', 'source'], condition=models.Q(lead_product__isnull=True), name='unique_media_asset_per_lead_source'),
+            models.UniqueConstraint(fields=['lead_product'], condition=models.Q(lead_product__isnull=False), name='unique_media_asset_per_lead_product'),
+        ]
+
+
+class DriveImageStatus(models.Model):
+    """Last known accessibility of a Google Drive image URL, written by check_drive_images"""
+    url = models.CharField(max_length=1000, unique=True)
+    is_accessible = models.BooleanField(default=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    reason = models.CharField(max_length=255, blank=True)
+    last_checked_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.url} ({'ok' if self.is_accessible else 'broken'})"
+
+    class Meta:
+        verbose_name_plural = 'Drive image statuses'
+        indexes = [
+            models.Index(fields=['is_accessible', 'url']),
+            models.Index(fields=['last_checked_at']),
+        ]
+
+
+class ChunkedUpload(models.Model):
+    """A resumable upload in progress, written chunk by chunk by media_app.chunked_upload"""
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    chunk_sizes = models.JSONField(default=list, blank=True, help_text="Sizes of the verified chunks, in order")
+    chain_sha256 = models.CharField(max_length=64, blank=True, help_text="Chain of the chunk checksums, see media_app.chunked_upload")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Checksum of the stored file, computed on completion")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    stored_name = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
@@ -0,0 +1,181 @@
+"""
+Recompress uploaded photos: auto-orient, strip metadata, cap the dimensions
+and re-encode.
+
+Fields are opted in through ``settings.IMAGE_PROCESSING``, keyed
+``'app_label.Model.field'``. A newly uploaded file is processed after the
+transaction commits, on a small thread pool, and the field is switched to the
+recompressed file with a conditional update. The same pool generates the
+thumbnails of every saved image, so no Pillow work runs in the request. ``reprocess_images`` applies the
+same steps to files uploaded earlier.
+"""
+import io
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from crm_project.storage_backends import upload_storage
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from .thumbnails import flatten
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {'max_dimension': 2048, 'format': 'jpeg', 'quality': 85}
+
+ENCODERS = {
+    'jpeg': ('JPEG', 'jpg', {'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', 'webp', {'method': 4}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def field_options(model, field_name):
+    """Processing options for ``model.field_name``, or None if it is not configured."""
+    key = f'{model._meta.app_label}.{model.__name__}.{field_name}'
+    options = getattr(settings, 'IMAGE_PROCESSING', {}).get(key)
+    return {**DEFAULT_OPTIONS, **options} if options is not None else None
+
+
+def configured_fields():
+    """``(model, field_name, options)`` for every configured field."""
+    for key in getattr(settings, 'IMAGE_PROCESSING', {}):
+        app_label, model_name, field_name = key.split('.')
+        model = apps.get_model(app_label, model_name)
+        yield model, field_name, field_options(model, field_name)
+
+
+def _is_compliant(image, options):
+    pil_format = ENCODERS[options['format']][0]
+    return (
+        image.format == pil_format
+        and max(image.size) <= options['max_dimension']
+        and not image.getexif()
+        and 'xmp' not in image.info
+    )
+
+
+def process_image(source_name, options, storage=upload_storage):
+    """
+    Store a recompressed copy of ``source_name`` and return its name.
+
+    Returns None when the file already has the target format, fits the size
+    cap and carries no metadata. Storage and Pillow work only, safe to run in
+    worker threads.
+    """
+    pil_format, extension, encoder_options = ENCODERS[options['format']]
+    with storage.open(source_name, 'rb') as f:
+        image = Image.open(f)
+        if _is_compliant(image, options):
+            return None
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        cap = options['max_dimension']
+        image.thumbnail((cap, cap), Image.LANCZOS)
+        if pil_format == 'JPEG':
+            image = flatten(image)
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    buffer = io.BytesIO()
+    # Saved without exif/xmp; only the colour profile is carried over
+    save_options = {**encoder_options, 'quality': options['quality']}
+    if icc_profile:
+        save_options['icc_profile'] = icc_profile
+    image.save(buffer, pil_format, **save_options)
+
+    name = f'{posixpath.splitext(source_name)[0]}.{extension}'
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def _is_referenced(name):
+    for model, field_name, _ in configured_fields():
+        if model._default_manager.filter(**{field_name: name}).exists():
+            return True
+    return False
+
+
+def swap_processed_image(model, pk, field_name, old_name, new_name, storage=upload_storage):
+    """
+    Point the record at ``new_name`` unless its image changed meanwhile, then
+    refresh thumbnails and the gallery. Returns True if the swap happened.
+    """
+    from .thumbnails import with_auto_now
+
+    updated = model._default_manager.filter(pk=pk, **{field_name: old_name}).update(
+        **with_auto_now(model, **{field_name: new_name})
+    )
+    if not updated:
+        # Replaced by a newer upload; that one gets its own processing run
+        if not _is_referenced(new_name):
+            storage.delete(new_name)
+        return False
+
+    # Content-addressed names can be shared, so only drop the original if unused
+    if not _is_referenced(old_name):
+        storage.delete(old_name)
+
+    refresh_media(model, pk, field_name)
+    return True
+
+
+def refresh_media(model, pk, field_name):
+    """Regenerate stale thumbnails of one record and resync its gallery asset."""
+    from .sync import sync_lead_assets, sync_lead_product_asset
+    from .thumbnails import ensure_thumbnails
+
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return False
+    changed = ensure_thumbnails(instance, field_name)
+    if changed:
+        if model._meta.label == 'leads_app.Lead':
+            sync_lead_assets(instance)
+        elif model._meta.label == 'leads_app.LeadProduct':
+            sync_lead_product_asset(instance)
+    return changed
+
+
+def process_field(model, pk, field_name):
+    """Process the current file of one record; used for new uploads."""
+    options = field_options(model, field_name)
+    name = model._default_manager.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not options or not name:
+        return False
+    new_name = process_image(name, options)
+    if not new_name or new_name == name:
+        return False
+    return swap_processed_image(model, pk, field_name, name, new_name)
+
+
+def _run(model, pk, field_name, process=True):
+    try:
+        # A processed upload gets its thumbnails and asset refreshed by the swap
+        if not (process and process_field(model, pk, field_name)):
+            refresh_media(model, pk, field_name)
+    except Exception as e:
+        logger.error(f"Could not process {model.__name__} {pk} {field_name}: {e}")
+    finally:
+        close_old_connections()
+
+
+def submit(model, pk, field_name, process=True):
+    """
+    Queue the media work for one saved record on the shared thread pool:
+    recompress a new upload when ``process`` is set, then bring thumbnails and
+    the gallery asset up to date.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_PROCESSING_WORKERS', 2), thread_name_prefix='image-processing',
+            )
+    return _executor.submit(_run, model, pk, field_name, process)
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.dispatch import receiver
+from leads_app.models import Lead, LeadProduct
+from . import processing
+from .sync import refresh_product_names, sync_lead_assets, sync_lead_product_asset
+from .thumbnails import thumbnails_outdated
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_FIELDS = {Lead: 'images', LeadProduct: 'image'}
+
+
+@receiver(pre_save, sender=Lead)
+@receiver(pre_save, sender=LeadProduct)
+def note_new_upload(sender, instance, raw=False, **kwargs):
+    """Remember whether this save stores a new file, before the field commits it"""
+    field_file = getattr(instance, IMAGE_FIELDS[sender])
+    instance._new_image_upload = bool(field_file) and not field_file._committed
+
+
+def _schedule_media_work(sender, instance):
+    """Hand recompression and thumbnails to the media pool once the save commits."""
+    field_name = IMAGE_FIELDS[sender]
+    process = getattr(instance, '_new_image_upload', False) and processing.field_options(sender, field_name) is not None
+    instance._new_image_upload = False
+    if process or thumbnails_outdated(instance, field_name):
+        pk = instance.pk
+        transaction.on_commit(lambda: processing.submit(sender, pk, field_name, process=process))
+
+
+@receiver(post_save, sender=Lead)
+def sync_media_on_lead_save(sender, instance: Lead, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        sync_lead_assets(instance)
+        _schedule_media_work(sender, instance)
+    except Exception as e:
+        logger.error(f"Error syncing media assets for lead {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=LeadProduct)
+def sync_media_on_lead_product_save(sender, instance: LeadProduct, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        sync_lead_product_asset(instance)
+        _schedule_media_work(sender, instance)
+    except Exception as e:
+        logger.error(f"Error syncing media asset for lead product {instance.pk}: {e}")
+
+
+@receiver(m2m_changed, sender=Lead.products_enquired.through)
+def sync_media_on_products_changed(sender, instance, action, reverse=False, **kwargs):
+    if reverse or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    try:
+        refresh_product_names(instance)
+    except Exception as e:
+        logger.error(f"Error refreshing media product names for lead {instance.pk}: {e}")
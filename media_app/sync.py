@@ -0,0 +1,85 @@
+"""
+Keep MediaAsset rows in step with the Lead/LeadProduct images they describe.
+"""
+import logging
+
+from leads_app.drive import drive_thumbnail_url, google_drive_url
+from .models import MediaAsset
+
+logger = logging.getLogger(__name__)
+
+
+def _owner_fields(lead):
+    user = lead.assigned_sales_person
+    return {
+        'client_name': lead.contact_name or '',
+        'company_name': lead.company_name or '',
+        'salesperson': user,
+        'salesperson_name': (user.get_full_name() or user.username) if user else '',
+    }
+
+
+def _product_names(lead):
+    names = [p.name for p in lead.products_enquired.all()]
+    return ', '.join(names)[:500] if names else 'N/A'
+
+
+def sync_lead_assets(lead):
+    """Create, refresh or remove the enquiry-level assets of ``lead``."""
+    owner = _owner_fields(lead)
+    lead_defaults = {
+        **owner,
+        'category_name': lead.category.name if lead.category else 'N/A',
+        'product_name': _product_names(lead),
+        'created_date': lead.created_date,
+    }
+
+    if lead.images:
+        MediaAsset.objects.update_or_create(
+            lead=lead, source='lead_image', lead_product=None,
+            defaults={**lead_defaults, 'url': lead.images.name, 'thumbnails': lead.image_thumbnails or {}},
+        )
+    else:
+        MediaAsset.objects.filter(lead=lead, source='lead_image').delete()
+
+    if lead.drive_file_id:
+        drive_url = drive_thumbnail_url(lead.drive_file_id)
+    else:
+        drive_url = google_drive_url(lead.image_url) if lead.image_url else None
+    if drive_url:
+        MediaAsset.objects.update_or_create(
+            lead=lead, source='google_drive', lead_product=None,
+            defaults={**lead_defaults, 'url': drive_url, 'drive_file_id': lead.drive_file_id, 'thumbnails': {}},
+        )
+    else:
+        MediaAsset.objects.filter(lead=lead, source='google_drive').delete()
+
+    # Product images carry the enquiry's client and salesperson too
+    MediaAsset.objects.filter(lead=lead, source='product_image').update(**owner)
+
+
+def sync_lead_product_asset(lead_product):
+    """Create, refresh or remove the asset for one product image."""
+    if not lead_product.image:
+        MediaAsset.objects.filter(lead_product=lead_product).delete()
+        return
+
+    lead = lead_product.lead
+    MediaAsset.objects.update_or_create(
+        lead_product=lead_product,
+        defaults={
+            **_owner_fields(lead),
+            'source': 'product_image',
+            'lead': lead,
+            'url': lead_product.image.name,
+            'thumbnails': lead_product.image_thumbnails or {},
+            'category_name': lead_product.category.name if lead_product.category else 'N/A',
+            'product_name': lead_product.subcategory.name if lead_product.subcategory else 'N/A',
+            'created_date': lead_product.created_date,
+        },
+    )
+
+
+def refresh_product_names(lead):
+    """Re-denormalize the enquired products after the M2M set changes."""
+    MediaAsset.objects.filter(lead=lead, lead_product__isnull=True).update(product_name=_product_names(lead))
@@ -0,0 +1,118 @@
+"""
+Fixed-size WebP/JPEG renditions of uploaded enquiry and product images.
+
+Renditions live next to the original in the upload storage
+(``enquiry_images/thumbs/photo_400.webp``). The model records them in a JSON
+field as ``{"source": <original name>, "size": 400, "webp": ..., "jpeg": ...}``,
+so a replaced upload is detected by comparing ``source`` with the current name.
+"""
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from crm_project.storage_backends import upload_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 400
+
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def with_auto_now(model, **values):
+    """
+    ``values`` plus the model's ``auto_now`` fields set to now, for queryset
+    updates: ``.update()`` skips ``auto_now`` and the change feed keys on it.
+    """
+    now = timezone.now()
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            values.setdefault(field.name, now)
+    return values
+
+
+def rendition_name(source_name, fmt):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    extension = RENDITION_FORMATS[fmt][1]
+    return posixpath.join(directory, 'thumbs', f'{stem}_{THUMBNAIL_SIZE}.{extension}')
+
+
+def flatten(image):
+    """RGB copy of ``image`` with any transparency composited onto white."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_renditions(source_name, storage=upload_storage):
+    """Render and store every format for ``source_name``; returns the renditions dict."""
+    with storage.open(source_name, 'rb') as f:
+        image = Image.open(f)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+        image = flatten(image)
+
+    renditions = {'source': source_name, 'size': THUMBNAIL_SIZE}
+    for fmt, (pil_format, _, options) in RENDITION_FORMATS.items():
+        buffer = io.BytesIO()
+        image.save(buffer, pil_format, **options)
+        name = rendition_name(source_name, fmt)
+        if storage.exists(name):
+            storage.delete(name)
+        renditions[fmt] = storage.save(name, ContentFile(buffer.getvalue()))
+    return renditions
+
+
+def renditions_are_current(renditions, source_name):
+    return bool(renditions) and renditions.get('source') == source_name
+
+
+def rendition_url(renditions, fmt):
+    name = (renditions or {}).get(fmt)
+    return upload_storage.url(name) if name else None
+
+
+def thumbnails_outdated(instance, image_field, renditions_field='image_thumbnails'):
+    """Whether ``instance``'s recorded renditions no longer match its image."""
+    field_file = getattr(instance, image_field)
+    current = getattr(instance, renditions_field) or {}
+    if not field_file:
+        return bool(current)
+    return not renditions_are_current(current, field_file.name)
+
+
+def ensure_thumbnails(instance, image_field, renditions_field='image_thumbnails'):
+    """
+    Bring ``instance``'s recorded renditions in line with its image.
+
+    Runs on the media worker pool after save; writes the renditions with a
+    queryset update so no further save signals fire. Returns True if anything
+    changed.
+    """
+    if not thumbnails_outdated(instance, image_field, renditions_field):
+        return False
+
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        renditions = {}
+    else:
+        try:
+            renditions = generate_renditions(field_file.name, field_file.storage)
+        except Exception as e:
+            logger.error(f"Could not generate thumbnails for {field_file.name}: {e}")
+            return False
+
+    model = type(instance)
+    model._default_manager.filter(pk=instance.pk).update(**with_auto_now(model, **{renditions_field: renditions}))
+    setattr(instance, renditions_field, renditions)
+    return True
@@ -0,0 +1,144 @@
+"""
+Background uploader for files staged by WriteBehindMixin.
+
+The staging directory is the queue: every file in it still has to reach
+object storage. A daemon thread per process drains it whenever a new file is
+staged and every ``UPLOAD_QUEUE_POLL_SECONDS`` otherwise, retrying failed
+uploads with exponential backoff. ``push_staged_uploads`` drains it from the
+command line, e.g. after a restart.
+
+Staged files only exist on the disk of the instance that received them, so
+write-behind needs a persistent ``UPLOAD_STAGING_DIR`` shared by every web
+instance and a scheduled ``push_staged_uploads`` run (see settings).
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from crm_project.storage_backends import upload_storage
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+_wake_event = threading.Event()
+_worker_lock = threading.Lock()
+_worker = None
+_push_lock = threading.Lock()
+
+# name -> (failed attempts, monotonic time of the next attempt)
+_failures = {}
+
+
+def _backoff(attempts):
+    base = getattr(settings, 'UPLOAD_RETRY_BASE_SECONDS', 5)
+    return min(base * 2 ** (attempts - 1), getattr(settings, 'UPLOAD_RETRY_MAX_SECONDS', 900))
+
+
+def staged_names():
+    """Names of the files waiting in the staging directory, oldest first."""
+    root = str(settings.UPLOAD_STAGING_DIR)
+    entries = []
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if filename.endswith('.part'):
+                continue  # still being written
+            path = os.path.join(directory, filename)
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                continue  # pushed by another worker meanwhile
+            entries.append((mtime, os.path.relpath(path, root).replace(os.sep, '/')))
+    return [name for _, name in sorted(entries)]
+
+
+def _swap_rendition_names(model, renditions_field, old_name, new_name):
+    """Rewrite ``old_name`` in the renditions JSON (source or any format) of ``model`` rows."""
+    from .thumbnails import RENDITION_FORMATS, with_auto_now
+
+    keys = ['source', *RENDITION_FORMATS]
+    matches = Q()
+    for key in keys:
+        matches |= Q(**{f'{renditions_field}__{key}': old_name})
+    rows = model._default_manager.select_for_update().filter(matches).values_list('pk', renditions_field)
+    for pk, renditions in rows:
+        renditions = {key: new_name if value == old_name else value for key, value in renditions.items()}
+        model._default_manager.filter(pk=pk).update(**with_auto_now(model, **{renditions_field: renditions}))
+
+
+def swap_references(old_name, new_name):
+    """
+    Point every record using ``old_name`` at ``new_name`` in one transaction,
+    as the image itself or as one of its recorded thumbnails.
+    """
+    from leads_app.models import Lead, LeadProduct
+    from .models import MediaAsset
+    from .thumbnails import with_auto_now
+
+    with transaction.atomic():
+        Lead.objects.filter(images=old_name).update(**with_auto_now(Lead, images=new_name))
+        LeadProduct.objects.filter(image=old_name).update(**with_auto_now(LeadProduct, image=new_name))
+        MediaAsset.objects.filter(url=old_name).exclude(source='google_drive').update(
+            **with_auto_now(MediaAsset, url=new_name)
+        )
+        _swap_rendition_names(Lead, 'image_thumbnails', old_name, new_name)
+        _swap_rendition_names(LeadProduct, 'image_thumbnails', old_name, new_name)
+        _swap_rendition_names(MediaAsset, 'thumbnails', old_name, new_name)
+
+
+def push_pending(storage=None, force=False):
+    """Push every staged file that is due; returns ``(pushed, failed)``."""
+    storage = storage or upload_storage
+    if not hasattr(storage, 'push'):
+        return 0, 0
+
+    pushed = failed = 0
+    with _push_lock:
+        for name in staged_names():
+            attempts, due_at = _failures.get(name, (0, 0))
+            if not force and time.monotonic() < due_at:
+                continue
+            try:
+                stored = storage.push(name)
+            except FileNotFoundError:
+                _failures.pop(name, None)
+                continue
+            except Exception as e:
+                attempts += 1
+                _failures[name] = (attempts, time.monotonic() + _backoff(attempts))
+                failed += 1
+                logger.error(f"Upload of staged file {name} failed (attempt {attempts}): {e}")
+                continue
+
+            _failures.pop(name, None)
+            if stored != name:
+                swap_references(name, stored)
+            pushed += 1
+    return pushed, failed
+
+
+def _run():
+    poll = getattr(settings, 'UPLOAD_QUEUE_POLL_SECONDS', 30)
+    while True:
+        _wake_event.wait(poll)
+        _wake_event.clear()
+        try:
+            push_pending()
+        except Exception as e:
+            logger.error(f"Upload queue worker error: {e}")
+        finally:
+            close_old_connections()
+
+
+def wake():
+    """Signal that a file was staged, starting this process's worker if needed."""
+    global _worker
+    if not getattr(settings, 'UPLOAD_QUEUE_INLINE_WORKER', True):
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, daemon=True, name='upload-queue')
+            _worker.start()
+    _wake_event.set()
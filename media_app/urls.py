@@ -5,4 +5,6 @@ app_name = 'media_app'
 
 urlpatterns = [
     path('', views.media_gallery, name='media_gallery'),
+    path('drive/thumbnail/', views.drive_thumbnail, name='drive_thumbnail'),
+    path('staged/<path:name>', views.staged_upload, name='staged_upload'),
 ]
@@ -1,65 +1,17 @@
-from django.shortcuts import render
+from django.shortcuts import redirect, render
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import SuspiciousFileOperation
+from crm_project.storage_backends import upload_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 from django.core.paginator import Paginator
-from leads_app.models import Lead, LeadProduct
-from products.models import Category, Subcategory
+from django.utils import timezone
 from django.contrib.auth.models import User
-
-
-def google_drive_url(url):
-    """
-    Convert Google Drive sharing link to thumbnail URL for better embedding reliability.
-    Input: https://drive.google.com/file/d/FILE_ID/view?usp=sharing
-    Output: https://drive.google.com/thumbnail?id=FILE_ID&sz=w400 (thumbnail format)
-    """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    if not url or not isinstance(url, str):
-        logger.warning(f"Invalid URL provided: {url}")
-        return url
-
-    # Skip invalid entries like "No Photo"
-    if url.strip().lower() in ['no photo', 'n/a', 'none', '']:
-        logger.warning(f"Skipping invalid image URL entry: {url}")
-        return None  # Return None to indicate invalid URL
-
-    logger.info(f"Processing Google Drive URL: {url}")
-
-    # Check if it's a Google Drive sharing link
-    if 'drive.google.com/file/d/' in url and '/view?usp=sharing' in url:
-        # Extract file ID from the URL
-        start = url.find('/file/d/') + 8
-        end = url.find('/view?usp=sharing')
-        if start != -1 and end != -1 and start < end:
-            file_id = url[start:end]
-
-            # Use thumbnail URL instead of uc?export=view for better embedding
-            # Thumbnail URLs are more reliable for web embedding
-            thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w400"
-            logger.info(f"✅ Converted Google Drive URL to thumbnail: {url} -> {thumbnail_url}")
-            return thumbnail_url
-
-    # Check if it's already a thumbnail URL
-    if 'drive.google.com/thumbnail?' in url and 'id=' in url:
-        logger.info(f"✅ Already a thumbnail URL: {url}")
-        return url
-
-    # Check if it's already a direct Google Drive URL (convert to thumbnail)
-    if 'drive.google.com/uc?' in url and 'id=' in url:
-        # Extract file ID and convert to thumbnail
-        id_start = url.find('id=') + 3
-        id_end = url.find('&', id_start) if '&' in url[id_start:] else len(url)
-        if id_start != -1:
-            file_id = url[id_start:id_end]
-            thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w400"
-            logger.info(f"✅ Converted uc URL to thumbnail: {url} -> {thumbnail_url}")
-            return thumbnail_url
-
-    # Return original URL if not a Google Drive link
-    logger.warning(f"❌ Not a recognized Google Drive URL format: {url}")
-    return url
+from leads_app.drive import google_drive_url  # noqa: F401 - scripts import it from here
+from .models import DriveImageStatus, MediaAsset
+from . import drive_cache
 
 
 def check_google_drive_accessibility(url):
@@ -89,96 +41,41 @@ def check_google_drive_accessibility(url):
 @login_required
 def media_gallery(request):
     """Display all images in a paginated grid with filters"""
+    from datetime import timedelta
+
+    assets = MediaAsset.objects.only(
+        'id', 'source', 'url', 'drive_file_id', 'thumbnails', 'lead_id', 'client_name', 'company_name', 'category_name',
+        'product_name', 'salesperson_id', 'salesperson_name', 'created_date',
+    )
 
-    # Base queryset - get all images from leads and lead products
-    lead_images = Lead.objects.exclude(images__isnull=True).exclude(images='')
-    lead_product_images = LeadProduct.objects.exclude(image__isnull=True).exclude(image='')
-    google_drive_images = Lead.objects.exclude(image_url__isnull=True).exclude(image_url='')
-
-    # Combine all images with their metadata
-    all_images = []
-
-    # Process lead images
-    for lead in lead_images:
-        if lead.images:
-            all_images.append({
-                'image_url': lead.images.url,
-                'client_name': lead.contact_name,
-                'company_name': lead.company_name,
-                'category_name': lead.category.name if lead.category else 'N/A',
-                'product_name': ', '.join([p.name for p in lead.products_enquired.all()]) if lead.products_enquired.exists() else 'N/A',
-                'salesperson': lead.assigned_sales_person.get_full_name() if lead.assigned_sales_person else lead.assigned_sales_person.username if lead.assigned_sales_person else 'Unassigned',
-                'created_date': lead.created_date,
-                'image_type': 'lead_image',
-                'lead_id': lead.id,
-            })
-
-    # Process lead product images
-    for lead_product in lead_product_images:
-        if lead_product.image:
-            all_images.append({
-                'image_url': lead_product.image.url,
-                'client_name': lead_product.lead.contact_name,
-                'company_name': lead_product.lead.company_name,
-                'category_name': lead_product.category.name if lead_product.category else 'N/A',
-                'product_name': lead_product.subcategory.name if lead_product.subcategory else 'N/A',
-                'salesperson': lead_product.lead.assigned_sales_person.get_full_name() if lead_product.lead.assigned_sales_person else lead_product.lead.assigned_sales_person.username if lead_product.lead.assigned_sales_person else 'Unassigned',
-                'created_date': lead_product.created_date,
-                'image_type': 'product_image',
-                'lead_id': lead_product.lead.id,
-            })
-
-    # Process Google Drive images
-    for lead in google_drive_images:
-        if lead.image_url:
-            converted_url = google_drive_url(lead.image_url)
-            # Skip if URL conversion returned None (invalid URL)
-            if converted_url is None:
-                continue
-
-            all_images.append({
-                'image_url': converted_url,
-                'client_name': lead.contact_name,
-                'company_name': lead.company_name,
-                'category_name': lead.category.name if lead.category else 'N/A',
-                'product_name': ', '.join([p.name for p in lead.products_enquired.all()]) if lead.products_enquired.exists() else 'N/A',
-                'salesperson': lead.assigned_sales_person.get_full_name() if lead.assigned_sales_person else lead.assigned_sales_person.username if lead.assigned_sales_person else 'Unassigned',
-                'created_date': lead.created_date,
-                'image_type': 'google_drive',
-                'lead_id': lead.id,
-            })
+    # Hide Drive images that the last check_drive_images run found broken
+    assets = assets.exclude(
+        source='google_drive',
+        url__in=DriveImageStatus.objects.filter(is_accessible=False).values('url'),
+    )
 
     # Apply filters
     date_filter = request.GET.get('date_filter', '')
     salesperson_filter = request.GET.get('salesperson_filter', '')
 
-    if date_filter:
-        from datetime import datetime, timedelta
-        today = datetime.now().date()
-        if date_filter == 'today':
-            filtered_images = [img for img in all_images if img['created_date'].date() == today]
-        elif date_filter == 'week':
-            week_ago = today - timedelta(days=7)
-            filtered_images = [img for img in all_images if img['created_date'].date() >= week_ago]
-        elif date_filter == 'month':
-            month_ago = today - timedelta(days=30)
-            filtered_images = [img for img in all_images if img['created_date'].date() >= month_ago]
-        else:
-            filtered_images = all_images
-    else:
-        filtered_images = all_images
+    today = timezone.localdate()
+    if date_filter == 'today':
+        assets = assets.filter(created_date__date=today)
+    elif date_filter == 'week':
+        assets = assets.filter(created_date__date__gte=today - timedelta(days=7))
+    elif date_filter == 'month':
+        assets = assets.filter(created_date__date__gte=today - timedelta(days=30))
 
-    if salesperson_filter:
-        if salesperson_filter == 'unassigned':
-            filtered_images = [img for img in filtered_images if img['salesperson'] == 'Unassigned']
-        else:
-            filtered_images = [img for img in filtered_images if str(img.get('salesperson_id', img['salesperson'])) == salesperson_filter]
+    if salesperson_filter == 'unassigned':
+        assets = assets.filter(salesperson__isnull=True)
+    elif salesperson_filter.isdigit():
+        assets = assets.filter(salesperson_id=int(salesperson_filter))
 
-    # Sort by creation date (newest first)
-    filtered_images.sort(key=lambda x: x['created_date'], reverse=True)
+    # Newest first; id breaks ties so pages are stable
+    assets = assets.order_by('-created_date', '-id')
 
     # Pagination - 20 images per page (5x4 grid)
-    paginator = Paginator(filtered_images, 20)
+    paginator = Paginator(assets, 20)
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
 
@@ -191,10 +88,53 @@ def media_gallery(request):
     context = {
         'page_obj': page_obj,
         'images': page_obj.object_list,
-        'total_images': len(filtered_images),
+        'total_images': paginator.count,
         'date_filter': date_filter,
         'salesperson_filter': salesperson_filter,
         'salespeople': salespeople,
     }
 
     return render(request, 'media_app/media_gallery.html', context)
+
+
+@login_required
+@require_http_methods(["GET", "HEAD"])
+def drive_thumbnail(request):
+    """Serve a Google Drive thumbnail through the local disk cache"""
+    file_id = request.GET.get('id', '')
+    size = request.GET.get('sz', drive_cache.DEFAULT_SIZE)
+    try:
+        image = drive_cache.get_image(file_id, size)
+        with open(image.path, 'rb') as f:
+            content = f.read()
+    except ValueError:
+        return HttpResponseBadRequest('Invalid Drive file id or size')
+    except drive_cache.DriveFetchError as e:
+        return HttpResponse(f'Could not fetch image from Google Drive: {e}', status=502, content_type='text/plain')
+    except FileNotFoundError:
+        # Evicted between lookup and read; the next request refetches it
+        return HttpResponse('Image temporarily unavailable', status=503, content_type='text/plain')
+
+    if request.headers.get('If-None-Match') == image.etag:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(content, content_type=image.content_type)
+    response['ETag'] = image.etag
+    patch_cache_control(response, private=True, max_age=86400)
+    return response
+
+
+@login_required
+@require_http_methods(["GET", "HEAD"])
+def staged_upload(request, name):
+    """Serve an upload that is still waiting for the background push to object storage"""
+    staging = getattr(upload_storage, 'staging', None)
+    try:
+        if staging is not None and staging.exists(name):
+            return FileResponse(staging.open(name))
+    except SuspiciousFileOperation:
+        raise Http404
+    except FileNotFoundError:
+        pass  # pushed between the check and the open
+    # Already uploaded: the storage now resolves the name to its final URL
+    return redirect(upload_storage.url(name))
@@ -119,6 +119,20 @@ class Command(BaseCommand):
                 'description': 'System alerts and errors',
                 'email_template': 'system_alert.html',
             },
+            {
+                'name': 'EXPORT_READY',
+                'category': 'SYSTEM',
+                'priority': 'MEDIUM',
+                'description': 'Notification when a requested export is ready to download',
+                'email_template': 'export_ready.html',
+            },
+            {
+                'name': 'EXPORT_FAILED',
+                'category': 'SYSTEM',
+                'priority': 'HIGH',
+                'description': 'Notification when a requested export could not be generated',
+                'email_template': 'export_failed.html',
+            },
             
             # Workflow notifications
             {
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_followup_reminder_type(apps, schema_editor):
+    # outbound_app.reminders queues every due reminder under this type, so it
+    # must exist without running setup_notifications first
+    NotificationType = apps.get_model('notifications_app', 'NotificationType')
+    NotificationType.objects.get_or_create(
+        name='FOLLOWUP_REMINDER',
+        defaults={
+            'category': 'FOLLOW_UP',
+            'priority': 'HIGH',
+            'description': 'Reminder for upcoming follow-ups',
+            'email_template': 'followup_reminder.html',
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_followup_reminder_type, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,237 @@
+"""
+Outbound analytics overview, computed in a handful of grouped queries and
+cached per (scope, date range).
+
+Cache entries carry a version number that is bumped whenever an outbound
+activity is saved or deleted (see outbound_app.signals), so a newly logged
+call shows up on the next dashboard refresh; everything else expires after
+``OUTBOUND_ANALYTICS_CACHE_TTL`` seconds.
+
+``activity_trend`` buckets activities by day, week or month for the charts.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField, Q
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from customers_app.models import Contact
+from leads_app.models import Lead
+from .models import OutboundActivity
+
+VERSION_KEY = 'outbound-overview:version'
+
+LEADERBOARD_METHODS = {'PHONE': 'calls', 'WHATSAPP': 'whatsapp', 'EMAIL': 'emails'}
+
+TREND_PERIODS = {
+    'day': TruncDate,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# split_by value -> field grouped on
+TREND_SPLITS = {
+    'method': 'method',
+    'salesperson': 'created_by__username',
+}
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_overview():
+    """Drop every cached overview; called when activities change."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+def overview_scope(user, employee_id):
+    """Which activities an overview covers, as used in the cache key."""
+    if employee_id is not None:
+        return f'employee:{employee_id}'
+    if user.is_superuser:
+        return 'all'
+    return f'user:{user.pk}'
+
+
+def scoped_activities(user, employee_id):
+    activities = OutboundActivity.objects.all()
+    if employee_id is not None:
+        # When an employee is selected, always filter to that employee
+        return activities.filter(created_by__id=employee_id)
+    if not user.is_superuser:
+        # Non-superusers only see their own data
+        return activities.filter(created_by=user)
+    return activities
+
+
+def compute_overview(user, employee_id, from_date, to_date, now=None):
+    now = now or timezone.now()
+    activities = scoped_activities(user, employee_id)
+    today = Q(created_at__date=to_date)
+
+    # 1. Headline activity figures in one pass
+    totals = activities.aggregate(
+        activities_today=Count('id', filter=today),
+        contacted_today=Count('contact_id', filter=today, distinct=True),
+        follow_ups_due=Count('id', filter=Q(follow_up_reminder__lte=now)),
+        contacts_with_activity=Count('contact_id', distinct=True),
+    )
+
+    # 2. Contact figures in one pass
+    contacts = Contact.objects.aggregate(
+        total=Count('id'),
+        not_contacted=Count('id', filter=Q(last_contacted__isnull=True) | Q(outbound_status='NOT_CONTACTED')),
+    )
+
+    # 3. Conversion: contacts with leads vs contacts with activities
+    contacts_with_leads = Lead.objects.filter(contact__isnull=False).aggregate(
+        n=Count('contact_id', distinct=True),
+    )['n']
+    contacts_with_activity = totals['contacts_with_activity']
+    conversion_rate = round((contacts_with_leads / contacts_with_activity) * 100, 1) if contacts_with_activity else 0.0
+
+    # 4. Method, outcome and per-salesperson counts for the period from one GROUP BY
+    period = activities.filter(created_at__date__gte=from_date, created_at__date__lte=to_date)
+    method_counts = defaultdict(int)
+    outcome_counts = defaultdict(int)
+    people = {}
+    grouped = (
+        period.order_by()
+        .values('method', 'outcome', 'created_by_id', 'created_by__username', 'created_by__first_name', 'created_by__last_name')
+        .annotate(count=Count('id'))
+    )
+    for row in grouped:
+        count = row['count']
+        method_counts[row['method']] += count
+        if row['outcome']:
+            outcome_counts[row['outcome']] += count
+        person = people.get(row['created_by_id'])
+        if person is None:
+            username = row['created_by__username']
+            full_name = f"{row['created_by__first_name'] or ''} {row['created_by__last_name'] or ''}".strip()
+            person = people[row['created_by_id']] = {
+                'username': username or 'Unknown',
+                'full_name': full_name or username or 'Unknown',
+                'total_activities': 0,
+                'unique_contacts': 0,
+                'calls': 0,
+                'whatsapp': 0,
+                'emails': 0,
+            }
+        person['total_activities'] += count
+        if row['method'] in LEADERBOARD_METHODS:
+            person[LEADERBOARD_METHODS[row['method']]] += count
+
+    # 5. Distinct contacts per salesperson cannot be summed from the groups above
+    for row in period.order_by().values('created_by_id').annotate(n=Count('contact_id', distinct=True)):
+        if row['created_by_id'] in people:
+            people[row['created_by_id']]['unique_contacts'] = row['n']
+
+    leaderboard = sorted(people.values(), key=lambda p: -p['total_activities'])[:10]
+
+    return {
+        'contact_stats': {
+            'total_contacts': contacts['total'],
+            'contacted_today': totals['contacted_today'],
+            'not_contacted': contacts['not_contacted'],
+            'follow_ups_due': totals['follow_ups_due'],
+            'activities_today': totals['activities_today'],
+        },
+        'method_breakdown': [
+            {'method': method, 'count': count}
+            for method, count in sorted(method_counts.items(), key=lambda item: -item[1])
+        ],
+        'outcome_breakdown': [
+            {'outcome': outcome, 'count': count}
+            for outcome, count in sorted(outcome_counts.items(), key=lambda item: -item[1])
+        ],
+        'leaderboard': leaderboard,
+        'conversion_rate': conversion_rate,
+    }
+
+
+def cached_overview(user, employee_id, from_date, to_date):
+    key = (
+        f'outbound-overview:v{_version()}:{overview_scope(user, employee_id)}'
+        f':{from_date.isoformat()}:{to_date.isoformat()}'
+    )
+    data = cache.get(key)
+    if data is None:
+        data = compute_overview(user, employee_id, from_date, to_date)
+        cache.set(key, data, getattr(settings, 'OUTBOUND_ANALYTICS_CACHE_TTL', 300))
+    return data
+
+
+def bucket_start(day, period):
+    """First day of the ``period`` bucket containing ``day`` (weeks start on Monday)."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def trend_buckets(from_date, to_date, period):
+    """Start dates of every bucket between the two dates, inclusive."""
+    buckets = []
+    current = bucket_start(from_date, period)
+    while current <= to_date:
+        buckets.append(current)
+        if period == 'week':
+            current += timedelta(days=7)
+        elif period == 'month':
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=1)
+    return buckets
+
+
+def activity_trend(activities, from_date, to_date, period='day', split_by=None):
+    """
+    Count ``activities`` per ``period`` between two dates in one GROUP BY.
+
+    Buckets without activity are filled in with zero. With ``split_by`` set to
+    ``'method'`` or ``'salesperson'`` every bucket also carries a count per
+    series, e.g. ``{'date': date(2024, 5, 6), 'count': 4, 'series': {'PHONE': 3, 'EMAIL': 1}}``.
+    """
+    if period not in TREND_PERIODS:
+        raise ValueError(f"Unknown trend period: {period}")
+    if split_by is not None and split_by not in TREND_SPLITS:
+        raise ValueError(f"Unknown trend split: {split_by}")
+
+    # Bucket in the local timezone, so late-evening activities land on the right day
+    bucket = TREND_PERIODS[period]('created_at', output_field=DateField())
+    columns = ['bucket'] + ([TREND_SPLITS[split_by]] if split_by else [])
+    grouped = (
+        activities.filter(created_at__date__gte=from_date, created_at__date__lte=to_date)
+        .annotate(bucket=bucket)
+        .order_by()
+        .values(*columns)
+        .annotate(count=Count('id'))
+    )
+
+    counts = defaultdict(int)
+    series = defaultdict(lambda: defaultdict(int))
+    for row in grouped:
+        counts[row['bucket']] += row['count']
+        if split_by:
+            series[row['bucket']][row[TREND_SPLITS[split_by]] or 'Unknown'] += row['count']
+
+    points = []
+    for start in trend_buckets(from_date, to_date, period):
+        point = {'date': start, 'count': counts.get(start, 0)}
+        if split_by:
+            point['series'] = dict(series.get(start, {}))
+        points.append(point)
+    return points
@@ -3,7 +3,7 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 
 from customers_app.models import Contact
-from outbound_app.models import OutboundActivity, MessageTemplate, Campaign
+from outbound_app.models import OutboundActivity, MessageTemplate, Campaign, ContactStats
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -61,24 +61,40 @@ class ContactSerializer(serializers.ModelSerializer):
         except Exception:
             return None
     
-    def get_last_activity(self, obj):
+    @staticmethod
+    def _stats(obj):
+        # ContactViewSet joins the ContactStats row; every contact has one (see
+        # outbound_app.signals), so a missing row only means nothing to count yet
         try:
-            last = obj.outbound_activities.first()
-            if last:
-                return {
-                    'id': last.id,
-                    'method': last.method,
-                    'outcome': last.outcome,
-                    'summary': last.summary[:100] + '...' if len(last.summary) > 100 else last.summary,
-                    'created_at': last.created_at,
-                    'created_by': last.created_by.username if last.created_by else None
-                }
-        except Exception:
-            pass
+            return obj.engagement_stats
+        except ContactStats.DoesNotExist:
+            return None
+
+    def get_last_activity(self, obj):
+        stats = self._stats(obj)
+        last = stats.last_activity if stats else None
+        if last:
+            return self._last_activity_dict(
+                last.id, last.method, last.outcome, last.summary, last.created_at,
+                last.created_by.username if last.created_by else None,
+            )
         return None
+
+    @staticmethod
+    def _last_activity_dict(activity_id, method, outcome, summary, created_at, created_by):
+        summary = summary or ''
+        return {
+            'id': activity_id,
+            'method': method,
+            'outcome': outcome,
+            'summary': summary[:100] + '...' if len(summary) > 100 else summary,
+            'created_at': created_at,
+            'created_by': created_by
+        }
     
     def get_total_activities(self, obj):
-        return obj.outbound_activities.count()
+        stats = self._stats(obj)
+        return stats.total_activities if stats else 0
     
     def get_days_since_last_contact(self, obj):
         if obj.last_contacted:
@@ -86,10 +102,8 @@ class ContactSerializer(serializers.ModelSerializer):
         return None
     
     def get_enquiries_count(self, obj):
-        try:
-            return obj.leads.count()
-        except Exception:
-            return 0
+        stats = self._stats(obj)
+        return stats.enquiries if stats else 0
 
 
 class OutboundActivitySerializer(serializers.ModelSerializer):
@@ -198,6 +212,28 @@ class QuickActivitySerializer(serializers.Serializer):
         return value
 
 
+class BulkOutreachSerializer(serializers.Serializer):
+    """One outreach logged against many contacts of a campaign"""
+    MAX_CONTACTS = 1000
+
+    contact_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_CONTACTS,
+    )
+    method = serializers.ChoiceField(choices=OutboundActivity.METHOD_CHOICES)
+    outcome = serializers.ChoiceField(choices=OutboundActivity.OUTCOME_CHOICES, required=False, allow_blank=True)
+    summary = serializers.CharField(max_length=500, required=False, allow_blank=True)
+    next_step = serializers.ChoiceField(choices=OutboundActivity.NEXT_STEP_CHOICES, required=False)
+    template_id = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_template_id(self, value):
+        if value:
+            try:
+                return MessageTemplate.objects.get(id=value, is_active=True).pk
+            except MessageTemplate.DoesNotExist:
+                raise serializers.ValidationError("Template not found or inactive.")
+        return value
+
+
 class EnquiryCreateSerializer(serializers.Serializer):
     contact = serializers.PrimaryKeyRelatedField(queryset=Contact.objects.all(), required=True)
     contact_name = serializers.CharField(required=False, allow_blank=True)
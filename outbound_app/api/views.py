@@ -1,7 +1,10 @@
+import csv
 from datetime import datetime, timedelta
-from django.db.models import Count, Q, Avg, F, Case, When, IntegerField
+from django.db.models import Count, Q, Avg, F
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
@@ -9,20 +12,31 @@ from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 
-from urllib.parse import quote
 from customers_app.models import Contact
 from outbound_app.models import OutboundActivity, MessageTemplate, Campaign
-from leads_app.models import Lead, FollowUp
+from leads_app.models import FollowUp
+from outbound_app.analytics import cached_overview, invalidate_overview
+from outbound_app.contact_stats import refresh_contact_stats
+from outbound_app.contact_status import record_contacts
+from outbound_app.message_templates import (
+    cached_template,
+    communication_links,
+    compile_message,
+    contact_context,
+    personalize_contacts,
+)
+from outbound_app.reminders import DUE_QUEUE_PAGE_SIZE, due_queue
+from outbound_app.views import InvalidListCursor, _Echo
 
 from .serializers import (
     ContactSerializer,
     OutboundActivitySerializer,
     QuickActivitySerializer,
+    BulkOutreachSerializer,
     EnquiryCreateSerializer,
     MessageTemplateSerializer,
     CampaignSerializer,
     UserSerializer,
-    ContactStatsSerializer,
     SalespersonStatsSerializer,
 )
 
@@ -34,6 +48,9 @@ class IsAuthenticatedOrReadOnly(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
 
+PERSONALIZE_BATCH_MAX_CONTACTS = 1000
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
@@ -41,7 +58,7 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 class ContactViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Contact.objects.all().select_related('company').prefetch_related('outbound_activities', 'leads').order_by('full_name')
+    queryset = Contact.objects.all().select_related('company').order_by('full_name')
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = StandardResultsSetPagination
@@ -71,7 +88,8 @@ class ContactViewSet(viewsets.ReadOnlyModelViewSet):
                 outbound_activities__follow_up_reminder__isnull=False
             ).distinct()
         
-        return qs
+        # Per-contact figures come from the ContactStats row, joined in
+        return qs.select_related('engagement_stats__last_activity__created_by')
 
     @action(detail=True, methods=['get'])
     def activities(self, request, pk=None, format=None):
@@ -214,7 +232,7 @@ class OutboundActivityViewSet(viewsets.ModelViewSet):
         activities = self.get_queryset().filter(
             follow_up_reminder__lte=now,
             follow_up_reminder__isnull=False
-        )
+        ).order_by('follow_up_reminder', 'id')
         
         paginator = StandardResultsSetPagination()
         page = paginator.paginate_queryset(activities, request)
@@ -225,6 +243,30 @@ class OutboundActivityViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(activities, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='due-queue', permission_classes=[permissions.IsAuthenticated])
+    def due_queue(self, request, format=None):
+        """
+        One salesperson's due follow-up reminders, oldest first, paged with an
+        opaque cursor. ``salesperson`` is a user id and defaults to the caller.
+        """
+        salesperson = request.query_params.get('salesperson') or request.user.pk
+        try:
+            user = User.objects.get(pk=int(salesperson))
+            limit = int(request.query_params.get('limit', DUE_QUEUE_PAGE_SIZE))
+            items, next_cursor = due_queue(user, request.query_params.get('cursor'), limit)
+        except User.DoesNotExist:
+            return Response({'error': 'Unknown salesperson'}, status=status.HTTP_404_NOT_FOUND)
+        except InvalidListCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'error': 'salesperson and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'salesperson': user.username,
+            'results': items,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        })
+
 
     @action(detail=True, methods=['post'], url_path='create-enquiry')
     def create_enquiry_linked(self, request, pk=None, format=None):
@@ -255,14 +297,11 @@ class OutboundActivityViewSet(viewsets.ModelViewSet):
 
         personalized_message = None
         subject = None
-        if template_id:
-            try:
-                template = MessageTemplate.objects.get(id=template_id)
-                temp_activity = OutboundActivity(contact=contact, template_used=template)
-                personalized_message = temp_activity.get_personalized_message(template)
+        if template_id and template_id.isdigit():
+            template = cached_template(int(template_id))
+            if template is not None:
+                personalized_message = template.render(contact)
                 subject = template.subject
-            except MessageTemplate.DoesNotExist:
-                pass
 
         if not personalized_message:
             name = getattr(contact, 'full_name', '') or ''
@@ -270,15 +309,8 @@ class OutboundActivityViewSet(viewsets.ModelViewSet):
         if not subject:
             subject = f"Follow up - {getattr(contact, 'full_name', '')}".strip() or "Follow up"
 
-        links = {}
-        if getattr(contact, 'phone_number', None):
-            links['phone'] = f"tel:{contact.phone_number}"
-        if getattr(contact, 'whatsapp_number', None):
-            wa_number = contact.whatsapp_number.replace('+', '').replace(' ', '')
-            links['whatsapp'] = f"https://wa.me/{wa_number}?text={quote(personalized_message)}"
+        links = communication_links(contact, personalized_message, subject)
         email = getattr(contact, 'email', None)
-        if email:
-            links['email'] = f"mailto:{email}?subject={quote(subject)}&body={quote(personalized_message)}"
 
         return Response({
             'contact': {
@@ -314,11 +346,8 @@ class MessageTemplateViewSet(viewsets.ModelViewSet):
             return Response({'error': 'contact_id is required'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            contact = Contact.objects.get(id=contact_id)
-            
-            # Create a temporary activity to use the personalization method
-            temp_activity = OutboundActivity(contact=contact, template_used=template)
-            personalized_message = temp_activity.get_personalized_message(template)
+            contact = Contact.objects.select_related('company').get(id=contact_id)
+            personalized_message = compile_message(template.message).render(contact_context(contact))
             
             return Response({
                 'personalized_message': personalized_message,
@@ -328,6 +357,60 @@ class MessageTemplateViewSet(viewsets.ModelViewSet):
         except Contact.DoesNotExist:
             return Response({'error': 'Contact not found'}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=True, methods=['post'], url_path='personalize-batch')
+    def personalize_batch(self, request, pk=None):
+        """
+        Personalize this template for many contacts in one call.
+
+        Takes ``contact_ids`` (up to 1000) and returns the message, subject and
+        tel/wa.me/mailto links per contact, in the order given. With
+        ``?output=csv`` the same rows are streamed as CSV for bulk sending.
+        """
+        template = cached_template(pk)
+        if template is None:
+            return Response({'error': 'Template not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        contact_ids = request.data.get('contact_ids')
+        if not isinstance(contact_ids, list) or not contact_ids:
+            return Response({'error': 'contact_ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(contact_ids) > PERSONALIZE_BATCH_MAX_CONTACTS:
+            return Response({'error': f'At most {PERSONALIZE_BATCH_MAX_CONTACTS} contacts per call'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            contact_ids = [int(contact_id) for contact_id in contact_ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'contact_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        contacts = Contact.objects.select_related('company').in_bulk(contact_ids)
+        ordered = [contacts[contact_id] for contact_id in dict.fromkeys(contact_ids) if contact_id in contacts]
+        rows = personalize_contacts(template, ordered)
+
+        if request.query_params.get('output') == 'csv':
+            writer = csv.writer(_Echo())
+            lines = (writer.writerow(line) for line in _personalized_csv_rows(rows))
+            response = StreamingHttpResponse(lines, content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="template_{template.pk}_links.csv"'
+            return response
+
+        return Response({
+            'template': template.pk,
+            'results': list(rows),
+            'not_found': [contact_id for contact_id in contact_ids if contact_id not in contacts],
+        })
+
+
+def _personalized_csv_rows(rows):
+    yield ['Contact ID', 'Name', 'Phone', 'WhatsApp Link', 'Email Link', 'Subject', 'Message']
+    for row in rows:
+        yield [
+            row['contact_id'],
+            row['name'],
+            row['phone'],
+            row['links'].get('whatsapp', ''),
+            row['links'].get('email', ''),
+            row['subject'],
+            row['message'],
+        ]
+
 
 class CampaignViewSet(viewsets.ModelViewSet):
     queryset = Campaign.objects.all().order_by('-created_at')
@@ -354,6 +437,68 @@ class CampaignViewSet(viewsets.ModelViewSet):
         serializer = OutboundActivitySerializer(activities, many=True)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['post'], url_path='bulk-outreach')
+    def bulk_outreach(self, request, pk=None, format=None):
+        """
+        Log one outreach for many contacts in a single request.
+
+        Takes ``contact_ids`` plus the activity fields of ``quick_activity``
+        and returns a result per contact id: ``created`` with the activity id,
+        ``not_found`` or ``duplicate`` for an id repeated in the list.
+        """
+        campaign = self.get_object()
+        serializer = BulkOutreachSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        # Every contact is resolved in one query
+        phones = dict(Contact.objects.filter(id__in=data['contact_ids']).values_list('id', 'phone_number'))
+        created_by = request.user if request.user.is_authenticated else None
+
+        results = []
+        activities = []
+        seen = set()
+        for contact_id in data['contact_ids']:
+            if contact_id in seen:
+                results.append({'contact_id': contact_id, 'status': 'duplicate'})
+                continue
+            seen.add(contact_id)
+            if contact_id not in phones:
+                results.append({'contact_id': contact_id, 'status': 'not_found'})
+                continue
+            result = {'contact_id': contact_id, 'status': 'created'}
+            results.append(result)
+            activities.append((result, OutboundActivity(
+                campaign=campaign,
+                contact_id=phones[contact_id],
+                method=data['method'],
+                outcome=data.get('outcome', ''),
+                summary=data.get('summary', ''),
+                next_step=data.get('next_step', 'NONE'),
+                template_used_id=data.get('template_id'),
+                created_by=created_by,
+            )))
+
+        if activities:
+            with transaction.atomic():
+                # bulk_create skips post_save, so the signal handlers' work is done here
+                created = OutboundActivity.objects.bulk_create([activity for _, activity in activities])
+                record_contacts(
+                    [activity.contact_id for activity in created],
+                    max(activity.created_at for activity in created),
+                )
+                refresh_contact_stats(Contact.objects.filter(phone_number__in=[a.contact_id for a in created]))
+                transaction.on_commit(invalidate_overview)
+            for (result, _), activity in zip(activities, created):
+                result['activity_id'] = activity.pk
+
+        return Response({
+            'campaign': campaign.pk,
+            'created': len(activities),
+            'results': results,
+        }, status=status.HTTP_201_CREATED if activities else status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None, format=None):
         """Get campaign statistics"""
@@ -397,16 +542,9 @@ class OutboundAnalyticsOverview(APIView):
             to_date = now.date()
             from_date = to_date - timedelta(days=30)
 
-        # Calculate periods based on the date range (not hardcoded)
-        start_of_week = to_date - timedelta(days=7)  # Last 7 days from end date
-        start_of_month = from_date  # Use the from_date as start of month period
-
         # Get employee filter
         employee_id = request.GET.get('employee')
 
-        # Base queryset
-        base_activities = OutboundActivity.objects.all()
-
         # Normalize employee_id to int if provided
         selected_emp_id = None
         if employee_id:
@@ -415,114 +553,8 @@ class OutboundAnalyticsOverview(APIView):
             except (TypeError, ValueError):
                 selected_emp_id = None
 
-        # Apply filtering logic
-        if selected_emp_id is not None:
-            # When an employee is selected, always filter to that employee
-            base_activities = base_activities.filter(created_by__id=selected_emp_id)
-        elif not request.user.is_superuser:
-            # Non-superusers only see their own data
-            base_activities = base_activities.filter(created_by=request.user)
-
-        # Basic stats
-        total_contacts = Contact.objects.count()
-        contacted_today = (
-            base_activities
-            .filter(created_at__date__gte=to_date, created_at__date__lte=to_date)  # Today only
-            .values('contact_id')
-            .distinct()
-            .count()
-        )
-        
-        not_contacted = Contact.objects.filter(
-            Q(last_contacted__isnull=True) | Q(outbound_status='NOT_CONTACTED')
-        ).count()
-        
-        # Follow-ups due
-        follow_ups_due = base_activities.filter(
-            follow_up_reminder__lte=now,
-            follow_up_reminder__isnull=False
-        ).count()
-        
-        activities_today = base_activities.filter(created_at__date__gte=to_date, created_at__date__lte=to_date).count()
-
-        # Activity breakdown by method for the selected date range
-        method_stats = (
-            base_activities
-            .filter(created_at__date__gte=from_date, created_at__date__lte=to_date)
-            .values('method')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        )
-        
-        # Outcome breakdown (for the selected period)
-        outcome_stats = (
-            base_activities
-            .filter(created_at__date__gte=from_date, created_at__date__lte=to_date)
-            .exclude(outcome='')
-            .values('outcome')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        )
-
-        # Conversion rate: contacts with leads vs contacts with activities
-        contacts_with_activity = (
-            base_activities.values('contact_id').distinct().count()
-        )
-        
-        try:
-            contacts_with_leads = (
-                Lead.objects.filter(contact__isnull=False)
-                .values('contact_id')
-                .distinct()
-                .count()
-            )
-            conversion_rate = round((contacts_with_leads / contacts_with_activity) * 100, 1) if contacts_with_activity else 0.0
-        except:
-            conversion_rate = 0.0
-
-        # Salesperson leaderboard (for the selected period)
-        leaderboard = (
-            base_activities
-            .filter(created_at__date__gte=from_date, created_at__date__lte=to_date)
-            .values('created_by__username', 'created_by__first_name', 'created_by__last_name')
-            .annotate(
-                total_activities=Count('id'),
-                unique_contacts=Count('contact_id', distinct=True),
-                calls=Count(Case(When(method='PHONE', then=1), output_field=IntegerField())),
-                whatsapp=Count(Case(When(method='WHATSAPP', then=1), output_field=IntegerField())),
-                emails=Count(Case(When(method='EMAIL', then=1), output_field=IntegerField()))
-            )
-            .order_by('-total_activities')[:10]
-        )
-        
-        leaderboard_data = []
-        for row in leaderboard:
-            full_name = f"{row['created_by__first_name'] or ''} {row['created_by__last_name'] or ''}".strip()
-            leaderboard_data.append({
-                'username': row['created_by__username'] or 'Unknown',
-                'full_name': full_name or row['created_by__username'] or 'Unknown',
-                'total_activities': row['total_activities'],
-                'unique_contacts': row['unique_contacts'],
-                'calls': row['calls'],
-                'whatsapp': row['whatsapp'],
-                'emails': row['emails']
-            })
-
-        data = {
-            'contact_stats': ContactStatsSerializer({
-                'total_contacts': total_contacts,
-                'contacted_today': contacted_today,
-                'not_contacted': not_contacted,
-                'follow_ups_due': follow_ups_due,
-                'activities_today': activities_today
-            }).data,
-            'method_breakdown': list(method_stats),
-            'outcome_breakdown': list(outcome_stats),
-            'leaderboard': leaderboard_data,
-            'conversion_rate': conversion_rate
-        }
-
-        return Response(data)
+        # Grouped queries, cached per scope and date range (outbound_app.analytics)
+        return Response(cached_overview(request.user, selected_emp_id, from_date, to_date))
 
 
 # Additional API endpoints
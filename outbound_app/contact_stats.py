@@ -0,0 +1,91 @@
+"""
+Maintenance of ContactStats, the per-contact engagement row.
+
+A contact's row is recomputed from its history with correlated subqueries
+and written with one upsert whenever one of its activities, enquiries or
+follow-ups changes, so a missed signal is repaired by the next change rather
+than carried forward. ``rebuild_contact_stats`` recomputes every contact in
+primary key chunks.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from customers_app.models import Contact
+from leads_app.models import FollowUp, Lead
+from .models import ContactStats, OutboundActivity
+
+STATS_FIELDS = [
+    'total_activities',
+    'last_activity',
+    'last_activity_at',
+    'earliest_reminder_at',
+    'enquiries',
+    'open_follow_ups',
+    'next_follow_up_at',
+]
+
+
+def _count(queryset, group_by):
+    counts = queryset.order_by().values(group_by).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def _stats_expressions():
+    # OutboundActivity.contact references Contact.phone_number, Lead.contact the pk
+    activities = OutboundActivity.objects.filter(contact_id=OuterRef('phone_number'))
+    latest = activities.order_by('-created_at', '-id')
+    open_follow_ups = FollowUp.objects.filter(lead__contact=OuterRef('pk')).exclude(status='completed')
+    return {
+        'total_activities': _count(activities, 'contact_id'),
+        'last_activity': Subquery(latest.values('id')[:1]),
+        'last_activity_at': Subquery(latest.values('created_at')[:1]),
+        'earliest_reminder_at': Subquery(
+            activities.filter(follow_up_reminder__isnull=False).order_by('follow_up_reminder').values('follow_up_reminder')[:1]
+        ),
+        'enquiries': _count(Lead.objects.filter(contact=OuterRef('pk')), 'contact'),
+        'open_follow_ups': _count(open_follow_ups, 'lead__contact'),
+        'next_follow_up_at': Subquery(open_follow_ups.order_by('scheduled_date').values('scheduled_date')[:1]),
+    }
+
+
+def refresh_contact_stats(contacts):
+    """Recompute the rows of ``contacts`` (a Contact queryset) in two queries."""
+    expressions = {f'stats_{name}': expression for name, expression in _stats_expressions().items()}
+    rows = contacts.order_by().annotate(**expressions).values('pk', *expressions)
+    stats = [
+        ContactStats(
+            contact_id=row['pk'],
+            last_activity_id=row['stats_last_activity'],
+            **{name: row[f'stats_{name}'] for name in STATS_FIELDS if name != 'last_activity'},
+        )
+        for row in rows
+    ]
+    if stats:
+        ContactStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=['contact'],
+            update_fields=STATS_FIELDS + ['updated_at'],
+        )
+    return len(stats)
+
+
+def rebuild_contact_stats(chunk_size=1000):
+    """Recompute every contact's row; returns the number of contacts written."""
+    written = 0
+    last_pk = 0
+    while True:
+        pks = list(Contact.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return written
+        last_pk = pks[-1]
+        written += refresh_contact_stats(Contact.objects.filter(pk__in=pks))
+
+
+def stats_for(contact):
+    """The contact's row, computed on the spot if it has never been written."""
+    try:
+        return ContactStats.objects.get(contact=contact)
+    except ContactStats.DoesNotExist:
+        refresh_contact_stats(Contact.objects.filter(pk=contact.pk))
+        return ContactStats.objects.get(contact=contact)
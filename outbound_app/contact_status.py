@@ -0,0 +1,104 @@
+"""
+Contact.last_contacted and Contact.outbound_status derived from outbound activity.
+
+A contact's ``last_contacted`` is the time of its latest activity, and its
+status is CONVERTED once any activity produced an enquiry, CONTACTED once any
+activity exists and NOT_CONTACTED otherwise. Contacts with
+``manual_status_override`` keep the status set by hand.
+
+``record_activity`` and ``record_contacts`` apply new activity with a single
+conditional UPDATE; ``recompute_contacts`` rebuilds both fields with
+set-based UPDATEs in primary key chunks, touching only the rows that have
+drifted.
+"""
+from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+
+from customers_app.models import Contact
+from .models import OutboundActivity
+
+
+def _activities():
+    # OutboundActivity.contact points at Contact.phone_number
+    return OutboundActivity.objects.filter(contact_id=OuterRef('phone_number'))
+
+
+def expected_last_contacted():
+    return Subquery(_activities().order_by('-created_at').values('created_at')[:1])
+
+
+def expected_status():
+    return Case(
+        When(manual_status_override=True, then=F('outbound_status')),
+        When(Exists(_activities().filter(lead__isnull=False)), then=Value('CONVERTED')),
+        When(Exists(_activities()), then=Value('CONTACTED')),
+        default=Value('NOT_CONTACTED'),
+    )
+
+
+def drifted(contacts):
+    """The subset of ``contacts`` whose stored values differ from the derived ones."""
+    return contacts.alias(latest=expected_last_contacted(), status=expected_status()).filter(
+        Q(last_contacted__isnull=True, latest__isnull=False)
+        | Q(last_contacted__isnull=False, latest__isnull=True)
+        | Q(last_contacted__lt=F('latest'))
+        | Q(last_contacted__gt=F('latest'))
+        | ~Q(outbound_status=F('status'))
+    )
+
+
+def recompute_contacts(contacts=None, chunk_size=1000):
+    """
+    Rewrite drifted ``last_contacted``/``outbound_status`` values; returns the
+    number of contacts updated.
+
+    Each chunk is one UPDATE with correlated subqueries, so no contact or
+    activity is loaded into Python. ``updated_date`` is set explicitly because
+    ``.update()`` skips ``auto_now``, and the change feed keys on it.
+    """
+    contacts = Contact.objects.all() if contacts is None else contacts
+    updated = 0
+    last_pk = 0
+    while True:
+        pks = list(contacts.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+        updated += drifted(Contact.objects.filter(pk__in=pks)).update(
+            last_contacted=expected_last_contacted(),
+            outbound_status=expected_status(),
+            updated_date=timezone.now(),
+        )
+    return updated
+
+
+def record_contacts(phone_numbers, contacted_at, converted=False):
+    """
+    Mark the contacts with ``phone_numbers`` as contacted at ``contacted_at``
+    in one conditional UPDATE; returns the number of rows written.
+
+    ``last_contacted`` only moves forward, CONVERTED is never downgraded, and
+    contacts that are already up to date are not written.
+    """
+    target = 'CONVERTED' if converted else 'CONTACTED'
+    status_changes = Q(manual_status_override=False) & ~Q(outbound_status__in=['CONVERTED', target])
+    return Contact.objects.filter(phone_number__in=phone_numbers).filter(
+        Q(last_contacted__isnull=True) | Q(last_contacted__lt=contacted_at) | status_changes
+    ).update(
+        last_contacted=Case(
+            When(last_contacted__gte=contacted_at, then=F('last_contacted')),
+            default=Value(contacted_at),
+        ),
+        outbound_status=Case(
+            When(status_changes, then=Value(target)),
+            default=F('outbound_status'),
+        ),
+        updated_date=timezone.now(),
+    )
+
+
+def record_activity(activity):
+    """Apply one saved ``activity`` to its contact."""
+    if not activity.contact_id:
+        return 0
+    return record_contacts([activity.contact_id], activity.created_at, converted=bool(activity.lead_id))
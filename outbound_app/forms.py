@@ -159,9 +159,6 @@ class SimpleOutboundActivityForm(forms.Form):
             # Surface a clean error explaining likely cause
             raise IntegrityError(f"Failed to save activity due to data integrity issue (FK to contact). Ensure phone '{phone}' is valid.") from e
 
-        # Update contact status after successful activity
-        if contact.outbound_status != 'CONTACTED':
-            contact.outbound_status = 'CONTACTED'
-            contact.save(update_fields=['outbound_status'])
+        # Contact status and last_contacted are updated by outbound_app.signals
 
         return activity
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from notifications_app.models import NotificationType
+from outbound_app.reminders import pending_reminders, queue_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Turn due outbound follow-up reminders into notifications (run from the scheduler)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Reminders queued per transaction (default: 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many reminders are due',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            due = pending_reminders().count()
+            self.stdout.write(self.style.WARNING(f'DRY RUN: {due} reminders would be queued'))
+            return
+        try:
+            created = queue_due_reminders(batch_size=options['batch_size'])
+        except NotificationType.DoesNotExist as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Queued {created} reminder notifications'))
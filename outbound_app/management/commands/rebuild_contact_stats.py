@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from outbound_app.contact_stats import rebuild_contact_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the ContactStats row of every contact from its activities, enquiries and follow-ups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Contacts recomputed per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_contact_stats(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {written} contacts'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from outbound_app.contact_status import drifted, recompute_contacts
+from customers_app.models import Contact
+
+
+class Command(BaseCommand):
+    help = 'Recompute Contact.last_contacted and outbound_status from outbound activities'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Contacts updated per statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the contacts that have drifted',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = drifted(Contact.objects.all()).count()
+            self.stdout.write(self.style.WARNING(f'{count} contacts would be updated'))
+            return
+
+        updated = recompute_contacts(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} contacts'))
@@ -0,0 +1,133 @@
+"""
+Compiled message templates and batch personalization.
+
+A template's ``{customer_name}``/``{company_name}`` placeholders are parsed
+once into literal/field parts. ``compile_message`` memoizes by text, and
+``cached_template`` keeps the compiled form of a MessageTemplate row in the
+default cache until the template is saved or deleted (see
+outbound_app.signals). That cache is shared by all worker processes
+(``CACHES`` in settings), so an edit is seen everywhere at once; with a
+per-process cache the other workers would keep the old text until the TTL.
+Personalizing a campaign list costs one template lookup and one contact
+query.
+"""
+import string
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.core.cache import cache
+
+from .models import MessageTemplate
+
+TEMPLATE_CACHE_TTL = 24 * 3600
+DEFAULT_COMPANY_NAME = 'your company'
+
+CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+
+
+class CompiledMessage:
+    """A parsed template; renders to the raw text if it cannot be filled in."""
+
+    def __init__(self, text):
+        self.text = text
+        try:
+            self.parts = list(string.Formatter().parse(text))
+        except ValueError:
+            self.parts = None  # unbalanced braces
+
+    def render(self, context):
+        if self.parts is None:
+            return self.text
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            out.append(literal)
+            if field is None:
+                continue
+            if field not in context:
+                return self.text
+            value = CONVERSIONS.get(conversion, str)(context[field]) if conversion else context[field]
+            try:
+                out.append(format(value, spec or ''))
+            except ValueError:
+                return self.text
+        return ''.join(out)
+
+
+@lru_cache(maxsize=512)
+def compile_message(text):
+    return CompiledMessage(text or '')
+
+
+class CompiledTemplate:
+    def __init__(self, template):
+        self.pk = template.pk
+        self.name = template.name
+        self.template_type = template.template_type
+        self.is_active = template.is_active
+        self.subject = template.subject
+        self.message = compile_message(template.message)
+        self.subject_message = compile_message(template.subject)
+
+    def render(self, contact):
+        return self.message.render(contact_context(contact))
+
+
+def _cache_key(pk):
+    return f'message-template:{pk}'
+
+
+def cached_template(pk):
+    """The compiled template ``pk``, or None if it does not exist."""
+    compiled = cache.get(_cache_key(pk))
+    if compiled is None:
+        template = MessageTemplate.objects.filter(pk=pk).first()
+        if template is None:
+            return None
+        compiled = CompiledTemplate(template)
+        cache.set(_cache_key(pk), compiled, TEMPLATE_CACHE_TTL)
+    return compiled
+
+
+def invalidate_template(pk):
+    cache.delete(_cache_key(pk))
+
+
+def contact_context(contact):
+    """Placeholder values for ``contact``; select_related('company') avoids a query."""
+    return {
+        'customer_name': contact.full_name,
+        'company_name': getattr(getattr(contact, 'company', None), 'company_name', DEFAULT_COMPANY_NAME),
+    }
+
+
+def communication_links(contact, message, subject):
+    links = {}
+    if contact.phone_number:
+        links['phone'] = f"tel:{contact.phone_number}"
+    if contact.whatsapp_number:
+        wa_number = contact.whatsapp_number.replace('+', '').replace(' ', '')
+        links['whatsapp'] = f"https://wa.me/{wa_number}?text={quote(message)}"
+    if contact.email:
+        links['email'] = f"mailto:{contact.email}?subject={quote(subject)}&body={quote(message)}"
+    return links
+
+
+def personalize_contacts(template, contacts):
+    """
+    Yield one dict per contact with the rendered message, subject and links.
+
+    ``template`` is a CompiledTemplate; ``contacts`` should come with their
+    company preloaded.
+    """
+    for contact in contacts:
+        context = contact_context(contact)
+        message = template.message.render(context)
+        subject = template.subject_message.render(context) or f"Follow up - {contact.full_name}"
+        yield {
+            'contact_id': contact.id,
+            'name': contact.full_name,
+            'phone': contact.phone_number,
+            'message': message,
+            'subject': subject,
+            'links': communication_links(contact, message, subject),
+        }
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbound_app', '0003_alter_outboundactivity_contact'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outboundactivity',
+            index=models.Index(fields=['updated_at', 'id'], name='outbound_ap_updated_54edba_idx'),
+        ),
+    ]
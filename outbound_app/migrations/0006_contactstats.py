@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers_app', '0008_contact_customers_a_updated_05e661_idx'),
+        ('outbound_app', '0005_outboundactivity_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactStats',
+            fields=[
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='engagement_stats', serialize=False, to='customers_app.contact')),
+                ('total_activities', models.PositiveIntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('earliest_reminder_at', models.DateTimeField(blank=True, help_text="Earliest follow_up_reminder on the contact's activities", null=True)),
+                ('enquiries', models.PositiveIntegerField(default=0)),
+                ('open_follow_ups', models.PositiveIntegerField(default=0, help_text='Enquiry follow-ups not yet completed')),
+                ('next_follow_up_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_activity', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='outbound_app.outboundactivity')),
+            ],
+            options={
+                'verbose_name': 'Contact Stats',
+                'verbose_name_plural': 'Contact Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbound_app', '0006_contactstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundactivity',
+            name='reminder_notified_at',
+            field=models.DateTimeField(blank=True, help_text='When the follow-up reminder was queued as a notification', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='outboundactivity',
+            index=models.Index(condition=models.Q(('follow_up_reminder__isnull', False)), fields=['created_by', 'follow_up_reminder', 'id'], name='outbound_reminder_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboundactivity',
+            index=models.Index(condition=models.Q(('follow_up_reminder__isnull', False), ('reminder_notified_at__isnull', True)), fields=['follow_up_reminder', 'id'], name='outbound_reminder_unsent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboundactivity',
+            index=models.Index(condition=models.Q(('next_step_date__isnull', False)), fields=['next_step_date'], name='outbound_next_step_idx'),
+        ),
+    ]
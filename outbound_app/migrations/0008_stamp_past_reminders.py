@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def stamp_past_reminders(apps, schema_editor):
+    # Reminders that came due before the scheduler existed were already shown
+    # in the app; mark them notified so the first run doesn't send them all
+    OutboundActivity = apps.get_model('outbound_app', 'OutboundActivity')
+    now = timezone.now()
+    OutboundActivity.objects.filter(
+        follow_up_reminder__isnull=False,
+        follow_up_reminder__lte=now,
+        reminder_notified_at__isnull=True,
+    ).update(reminder_notified_at=now, updated_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbound_app', '0007_reminder_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(stamp_past_reminders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    counts = queryset.order_by().values(group_by).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill_contact_stats(apps, schema_editor):
+    # Same figures as outbound_app.contact_stats, on the historical models, so
+    # every existing contact has a row and readers need no live fallback
+    Contact = apps.get_model('customers_app', 'Contact')
+    ContactStats = apps.get_model('outbound_app', 'ContactStats')
+    OutboundActivity = apps.get_model('outbound_app', 'OutboundActivity')
+    FollowUp = apps.get_model('leads_app', 'FollowUp')
+    Lead = apps.get_model('leads_app', 'Lead')
+
+    activities = OutboundActivity.objects.filter(contact_id=OuterRef('phone_number'))
+    latest = activities.order_by('-created_at', '-id')
+    open_follow_ups = FollowUp.objects.filter(lead__contact=OuterRef('pk')).exclude(status='completed')
+    expressions = {
+        'total_activities': _count(activities, 'contact_id'),
+        'last_activity_id': Subquery(latest.values('id')[:1]),
+        'last_activity_at': Subquery(latest.values('created_at')[:1]),
+        'earliest_reminder_at': Subquery(
+            activities.filter(follow_up_reminder__isnull=False).order_by('follow_up_reminder').values('follow_up_reminder')[:1]
+        ),
+        'enquiries': _count(Lead.objects.filter(contact=OuterRef('pk')), 'contact'),
+        'open_follow_ups': _count(open_follow_ups, 'lead__contact'),
+        'next_follow_up_at': Subquery(open_follow_ups.order_by('scheduled_date').values('scheduled_date')[:1]),
+    }
+    aliases = {f'stats_{name}': expression for name, expression in expressions.items()}
+
+    last_pk = 0
+    while True:
+        pks = list(Contact.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:1000])
+        if not pks:
+            return
+        last_pk = pks[-1]
+        rows = Contact.objects.filter(pk__in=pks).order_by().annotate(**aliases).values('pk', *aliases)
+        ContactStats.objects.bulk_create(
+            [
+                ContactStats(contact_id=row['pk'], **{name: row[f'stats_{name}'] for name in expressions})
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=['contact'],
+            update_fields=list(expressions),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbound_app', '0008_stamp_past_reminders'),
+        ('customers_app', '0008_contact_customers_a_updated_05e661_idx'),
+        ('leads_app', '0025_upload_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_contact_stats, migrations.RunPython.noop),
+    ]
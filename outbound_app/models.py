@@ -116,6 +116,7 @@ class OutboundActivity(models.Model):
     next_step = models.CharField(max_length=30, choices=NEXT_STEP_CHOICES, default='NONE')
     next_step_date = models.DateTimeField(null=True, blank=True)
     follow_up_reminder = models.DateTimeField(null=True, blank=True)
+    reminder_notified_at = models.DateTimeField(null=True, blank=True, help_text="When the follow-up reminder was queued as a notification")
     duration_minutes = models.PositiveIntegerField(null=True, blank=True, help_text="Call/meeting duration in minutes")
     template_used = models.ForeignKey(
         MessageTemplate,
@@ -156,20 +157,66 @@ class OutboundActivity(models.Model):
         if not template or not self.contact:
             return template.message if template else ""
         
-        context = {
-            'customer_name': self.contact.full_name,
-            'company_name': getattr(getattr(self.contact, 'company', None), 'company_name', 'your company'),
-        }
-        
-        try:
-            return template.message.format(**context)
-        except KeyError:
-            return template.message
+        from .message_templates import compile_message, contact_context
+        return compile_message(template.message).render(contact_context(self.contact))
 
     class Meta:
         indexes = [
             models.Index(fields=['contact', 'created_at']),
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['-created_at', '-id']),
+            # Partial indexes: only activities with a reminder or next step are indexed
+            models.Index(
+                fields=['created_by', 'follow_up_reminder', 'id'],
+                condition=models.Q(follow_up_reminder__isnull=False),
+                name='outbound_reminder_queue_idx',
+            ),
+            models.Index(
+                fields=['follow_up_reminder', 'id'],
+                condition=models.Q(follow_up_reminder__isnull=False, reminder_notified_at__isnull=True),
+                name='outbound_reminder_unsent_idx',
+            ),
+            models.Index(
+                fields=['next_step_date'],
+                condition=models.Q(next_step_date__isnull=False),
+                name='outbound_next_step_idx',
+            ),
         ]
         ordering = ['-created_at']
         verbose_name = "Outbound Activity"
         verbose_name_plural = "Outbound Activities"
+
+
+class ContactStats(models.Model):
+    """
+    Per-contact engagement figures, one row per contact, so lists and the 360
+    view read a joined row instead of aggregating history. Kept current by
+    outbound_app.signals and rebuilt with ``rebuild_contact_stats``.
+
+    Only time-independent facts are stored; whether something is overdue is
+    worked out against the current time when read.
+    """
+    contact = models.OneToOneField('customers_app.Contact', on_delete=models.CASCADE, primary_key=True, related_name='engagement_stats')
+    total_activities = models.PositiveIntegerField(default=0)
+    last_activity = models.ForeignKey(OutboundActivity, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    earliest_reminder_at = models.DateTimeField(null=True, blank=True, help_text="Earliest follow_up_reminder on the contact's activities")
+    enquiries = models.PositiveIntegerField(default=0)
+    open_follow_ups = models.PositiveIntegerField(default=0, help_text="Enquiry follow-ups not yet completed")
+    next_follow_up_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Stats for contact {self.contact_id}"
+
+    @property
+    def has_overdue_follow_ups(self):
+        now = timezone.now()
+        return bool(
+            (self.next_follow_up_at and self.next_follow_up_at < now)
+            or (self.earliest_reminder_at and self.earliest_reminder_at < now)
+        )
+
+    class Meta:
+        verbose_name = "Contact Stats"
+        verbose_name_plural = "Contact Stats"
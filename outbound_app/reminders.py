@@ -0,0 +1,158 @@
+"""
+Follow-up reminder queue for outbound activities.
+
+``due_queue`` pages one salesperson's due reminders oldest first, keyed on
+``(follow_up_reminder, id)`` so it walks ``outbound_reminder_queue_idx``.
+``queue_due_reminders`` turns reminders that have come due into PENDING
+notifications in batches and stamps ``reminder_notified_at``, which takes
+them out of ``outbound_reminder_unsent_idx``; ``send_notifications`` then
+delivers them.
+"""
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications_app.models import Notification, NotificationType
+from .models import OutboundActivity
+from .views import decode_list_cursor, encode_list_cursor
+
+logger = logging.getLogger(__name__)
+
+DUE_QUEUE_PAGE_SIZE = 50
+DUE_QUEUE_MAX_PAGE_SIZE = 200
+REMINDER_NOTIFICATION_TYPE = 'FOLLOWUP_REMINDER'
+
+DUE_QUEUE_FIELDS = [
+    'id',
+    'follow_up_reminder',
+    'reminder_notified_at',
+    'method',
+    'summary',
+    'next_step',
+    'next_step_date',
+    'contact_id',
+    'contact__full_name',
+    'lead_id',
+]
+
+
+def due_queue(user, cursor=None, limit=DUE_QUEUE_PAGE_SIZE, until=None):
+    """
+    Return ``(items, next_cursor)``: ``user``'s reminders due by ``until``
+    (default now), oldest first. ``next_cursor`` is None on the last page.
+    """
+    limit = max(1, min(limit, DUE_QUEUE_MAX_PAGE_SIZE))
+    qs = OutboundActivity.objects.filter(
+        created_by=user,
+        follow_up_reminder__isnull=False,
+        follow_up_reminder__lte=until or timezone.now(),
+    ).order_by('follow_up_reminder', 'id')
+    if cursor:
+        reminder, pk = decode_list_cursor(cursor)
+        qs = qs.filter(Q(follow_up_reminder__gt=reminder) | Q(follow_up_reminder=reminder, id__gt=pk))
+
+    rows = list(qs.values(*DUE_QUEUE_FIELDS)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [
+        {
+            'id': row['id'],
+            'due': row['follow_up_reminder'],
+            'notified': row['reminder_notified_at'] is not None,
+            'method': row['method'],
+            'summary': row['summary'],
+            'next_step': row['next_step'],
+            'next_step_date': row['next_step_date'],
+            'contact_phone': row['contact_id'],
+            'contact_name': row['contact__full_name'],
+            'lead_id': row['lead_id'],
+        }
+        for row in rows
+    ]
+    next_cursor = encode_list_cursor(rows[-1]['follow_up_reminder'], rows[-1]['id']) if has_more else None
+    return items, next_cursor
+
+
+def pending_reminders(now=None):
+    """Reminders that are due and have not been queued as notifications yet."""
+    return OutboundActivity.objects.filter(
+        follow_up_reminder__isnull=False,
+        follow_up_reminder__lte=now or timezone.now(),
+        reminder_notified_at__isnull=True,
+    )
+
+
+def _reminder_notification(activity, notification_type, content_type):
+    contact_name = activity.contact.full_name if activity.contact else activity.contact_id
+    return Notification(
+        notification_type=notification_type,
+        recipient=activity.created_by,
+        content_type=content_type,
+        object_id=activity.pk,
+        title=f'Follow-up due: {contact_name}',
+        message=(
+            f'Your follow-up with {contact_name} ({activity.get_method_display()}) '
+            f'was due {timezone.localtime(activity.follow_up_reminder).strftime("%B %d, %Y at %I:%M %p")}.'
+            + (f' Summary: {activity.summary}' if activity.summary else '')
+        ),
+        scheduled_for=activity.follow_up_reminder,
+        data={
+            'outbound_activity_id': activity.pk,
+            'contact_phone': activity.contact_id,
+            'contact_name': contact_name,
+            'lead_id': activity.lead_id,
+        },
+    )
+
+
+def queue_due_reminders(now=None, batch_size=500):
+    """
+    Create one notification per due reminder; returns the number created.
+
+    Each batch is locked (skipping rows another scheduler holds), turned into
+    notifications with one bulk insert and stamped as notified in one UPDATE,
+    all in a single transaction. Reminders without an owner are stamped but
+    produce no notification.
+
+    Raises ``NotificationType.DoesNotExist`` if the reminder type is missing,
+    since nothing could be queued; a deactivated type queues nothing and
+    leaves the reminders pending.
+    """
+    try:
+        notification_type = NotificationType.objects.get(name=REMINDER_NOTIFICATION_TYPE)
+    except NotificationType.DoesNotExist:
+        raise NotificationType.DoesNotExist(
+            f"Notification type '{REMINDER_NOTIFICATION_TYPE}' not found; run migrate or setup_notifications"
+        )
+    if not notification_type.is_active:
+        logger.info(f"Notification type '{REMINDER_NOTIFICATION_TYPE}' is inactive; no reminders queued")
+        return 0
+    content_type = ContentType.objects.get_for_model(OutboundActivity)
+    now = now or timezone.now()
+
+    created = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                pending_reminders(now)
+                .select_related('contact', 'created_by')
+                .select_for_update(skip_locked=True, of=('self',))
+                .order_by('follow_up_reminder', 'id')[:batch_size]
+            )
+            if not batch:
+                return created
+            notifications = [
+                _reminder_notification(activity, notification_type, content_type)
+                for activity in batch
+                if activity.created_by_id
+            ]
+            Notification.objects.bulk_create(notifications)
+            # .update() skips auto_now; the change feed keys on updated_at
+            OutboundActivity.objects.filter(pk__in=[activity.pk for activity in batch]).update(
+                reminder_notified_at=now,
+                updated_at=now,
+            )
+            created += len(notifications)
@@ -1,43 +1,96 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import OutboundActivity
+from customers_app.models import Contact
+from leads_app.models import FollowUp, Lead
+from .analytics import invalidate_overview
+from .contact_stats import refresh_contact_stats
+from .contact_status import record_activity, recompute_contacts
+from .message_templates import invalidate_template
+from .models import MessageTemplate, OutboundActivity
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@receiver(post_save, sender=OutboundActivity)
-def update_contact_on_activity(sender, instance: OutboundActivity, created: bool, **kwargs):
-    if not created:
+@receiver(pre_save, sender=OutboundActivity)
+def requeue_rescheduled_reminder(sender, instance: OutboundActivity, **kwargs):
+    # A reminder moved after it was queued is queued again at its new time
+    if not instance.pk or instance.reminder_notified_at is None:
         return
+    previous = OutboundActivity.objects.filter(pk=instance.pk).values_list('follow_up_reminder', flat=True).first()
+    if previous != instance.follow_up_reminder:
+        instance.reminder_notified_at = None
+
+
+@receiver(post_save, sender=OutboundActivity)
+def update_contact_on_activity(sender, instance: OutboundActivity, **kwargs):
+    # Runs on edits too, so linking an enquiry later marks the contact converted
     try:
-        contact = instance.contact
-        if not contact:
-            return
-        # Respect manual override
-        if hasattr(contact, 'manual_status_override') and getattr(contact, 'manual_status_override', False):
-            return
-
-        update_fields = []
-
-        # last_contacted
-        if hasattr(contact, 'last_contacted'):
-            contact.last_contacted = instance.created_at
-            update_fields.append('last_contacted')
-
-        # outbound_status
-        if hasattr(contact, 'outbound_status'):
-            new_status = 'CONTACTED'
-            try:
-                if instance.lead is not None:
-                    # If a lead is associated, consider converted
-                    new_status = 'CONVERTED'
-            except Exception:
-                pass
-            contact.outbound_status = new_status
-            update_fields.append('outbound_status')
-
-        if update_fields:
-            contact.save(update_fields=update_fields)
+        record_activity(instance)
     except Exception as e:
         logger.warning("OutboundActivity post_save failed to update contact: %s", e)
+
+
+@receiver(post_delete, sender=OutboundActivity)
+def recompute_contact_on_activity_delete(sender, instance: OutboundActivity, **kwargs):
+    try:
+        if instance.contact_id:
+            recompute_contacts(Contact.objects.filter(phone_number=instance.contact_id))
+    except Exception as e:
+        logger.warning("OutboundActivity post_delete failed to update contact: %s", e)
+
+
+@receiver(post_save, sender=OutboundActivity)
+@receiver(post_delete, sender=OutboundActivity)
+def invalidate_analytics_on_activity_change(sender, instance: OutboundActivity, **kwargs):
+    try:
+        invalidate_overview()
+    except Exception as e:
+        logger.warning("Could not invalidate outbound analytics cache: %s", e)
+
+
+def _refresh_stats(contacts, deleted):
+    try:
+        if deleted:
+            # Deferred: a cascading contact delete would otherwise re-create the row
+            transaction.on_commit(lambda: refresh_contact_stats(contacts))
+        else:
+            refresh_contact_stats(contacts)
+    except Exception as e:
+        logger.warning("Could not refresh contact stats: %s", e)
+
+
+@receiver(post_save, sender=Contact)
+def create_stats_for_new_contact(sender, instance: Contact, created=False, raw=False, **kwargs):
+    if created and not raw:
+        _refresh_stats(Contact.objects.filter(pk=instance.pk), False)
+
+
+@receiver(post_save, sender=OutboundActivity)
+@receiver(post_delete, sender=OutboundActivity)
+def refresh_stats_on_activity_change(sender, instance: OutboundActivity, **kwargs):
+    if instance.contact_id:
+        _refresh_stats(Contact.objects.filter(phone_number=instance.contact_id), kwargs['signal'] is post_delete)
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def refresh_stats_on_enquiry_change(sender, instance: Lead, **kwargs):
+    if instance.contact_id:
+        _refresh_stats(Contact.objects.filter(pk=instance.contact_id), kwargs['signal'] is post_delete)
+
+
+@receiver(post_save, sender=FollowUp)
+@receiver(post_delete, sender=FollowUp)
+def refresh_stats_on_follow_up_change(sender, instance: FollowUp, **kwargs):
+    _refresh_stats(Contact.objects.filter(leads=instance.lead_id), kwargs['signal'] is post_delete)
+
+
+@receiver(post_save, sender=MessageTemplate)
+@receiver(post_delete, sender=MessageTemplate)
+def invalidate_compiled_template(sender, instance: MessageTemplate, **kwargs):
+    try:
+        invalidate_template(instance.pk)
+    except Exception as e:
+        logger.warning("Could not invalidate cached message template %s: %s", instance.pk, e)
@@ -0,0 +1,223 @@
+"""
+Customer 360 timeline: outbound activities, activity log entries, enquiries,
+follow-ups and invoices for one contact, merged into a single newest-first
+stream.
+
+Each page reads at most ``limit + 1`` rows from every source, walking the
+``(timestamp, source, id)`` key from an opaque cursor, and merges them in
+Python. A page therefore costs the same handful of indexed queries whether
+the contact has ten events or ten thousand.
+"""
+import base64
+import heapq
+import json
+from abc import ABC, abstractmethod
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from activities_app.models import ActivityLog
+from invoices_app.models import Invoice
+from leads_app.models import FollowUp, Lead
+from .contact_stats import stats_for
+from .models import OutboundActivity
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class TimelineSource(ABC):
+    """
+    One kind of event. ``rank`` breaks timestamp ties between sources, so the
+    key ``(timestamp, rank, id)`` is unique across the merged stream.
+    """
+
+    def __init__(self, kind, rank, timestamp_field, fields):
+        self.kind = kind
+        self.rank = rank
+        self.timestamp_field = timestamp_field
+        self.fields = fields
+
+    @abstractmethod
+    def queryset(self, contact):
+        """The contact's rows of this kind."""
+
+    @abstractmethod
+    def event(self, row):
+        """Template fields for one ``values()`` row."""
+
+    def after(self, timestamp, rank, pk):
+        """Rows that come after the cursor in newest-first order."""
+        older = Q(**{f'{self.timestamp_field}__lt': timestamp})
+        same_time = Q(**{self.timestamp_field: timestamp})
+        if self.rank < rank:
+            return older | same_time
+        if self.rank == rank:
+            return older | (same_time & Q(id__lt=pk))
+        return older
+
+    def read(self, contact, cursor, limit):
+        qs = self.queryset(contact)
+        if cursor:
+            qs = qs.filter(self.after(*cursor))
+        rows = qs.order_by(f'-{self.timestamp_field}', '-id').values('id', self.timestamp_field, *self.fields)[:limit]
+        for row in rows:
+            event = self.event(row)
+            event.update(kind=self.kind, id=row['id'], timestamp=row[self.timestamp_field])
+            yield event
+
+
+class OutboundSource(TimelineSource):
+    methods = dict(OutboundActivity.METHOD_CHOICES)
+    next_steps = dict(OutboundActivity.NEXT_STEP_CHOICES)
+
+    def queryset(self, contact):
+        return OutboundActivity.objects.filter(contact_id=contact.phone_number)
+
+    def event(self, row):
+        return {
+            'title': self.methods.get(row['method'], row['method']),
+            'method': row['method'],
+            'detail': row['summary'],
+            'badge': self.next_steps.get(row['next_step']) if row['next_step'] != 'NONE' else None,
+            'due': row['next_step_date'],
+            'reminder': row['follow_up_reminder'],
+            'user': row['created_by__username'],
+        }
+
+
+class ActivityLogSource(TimelineSource):
+    types = dict(ActivityLog.ACTIVITY_TYPE_CHOICES)
+
+    def queryset(self, contact):
+        return ActivityLog.objects.filter(contact=contact)
+
+    def event(self, row):
+        return {
+            'title': row['subject'] or self.types.get(row['activity_type'], row['activity_type']),
+            'detail': row['description'],
+            'user': row['user__username'],
+        }
+
+
+class EnquirySource(TimelineSource):
+    stages = dict(Lead.ENQUIRY_STAGE_CHOICES)
+
+    def queryset(self, contact):
+        return Lead.objects.filter(contact=contact)
+
+    def event(self, row):
+        return {
+            'title': 'Enquiry created',
+            'detail': row['company_name'] or row['contact_name'],
+            'badge': self.stages.get(row['enquiry_stage'], row['enquiry_stage']),
+            'user': row['assigned_sales_person__username'],
+            'url': f"/enquiries/{row['id']}/",
+        }
+
+
+class FollowUpSource(TimelineSource):
+    types = dict(FollowUp.FOLLOWUP_TYPE_CHOICES)
+    statuses = dict(FollowUp.STATUS_CHOICES)
+
+    def queryset(self, contact):
+        return FollowUp.objects.filter(lead__contact=contact)
+
+    def event(self, row):
+        return {
+            'title': f"{self.types.get(row['followup_type'], row['followup_type'])} follow-up scheduled",
+            'detail': row['notes'],
+            'badge': self.statuses.get(row['status'], row['status']),
+            'due': row['scheduled_date'],
+            'user': row['created_by__username'],
+            'url': f"/enquiries/{row['lead_id']}/",
+        }
+
+
+class InvoiceSource(TimelineSource):
+    statuses = dict(Invoice.STATUS_CHOICES)
+
+    def queryset(self, contact):
+        return Invoice.objects.filter(contact=contact)
+
+    def event(self, row):
+        return {
+            'title': f"Invoice {row['invoice_number']}".strip(),
+            'detail': f"{row['currency']} {row['total_amount']}",
+            'badge': self.statuses.get(row['status'], row['status']),
+            'user': row['created_by__username'],
+        }
+
+
+SOURCES = [
+    OutboundSource('outbound', 0, 'created_at', [
+        'method', 'summary', 'next_step', 'next_step_date', 'follow_up_reminder', 'created_by__username',
+    ]),
+    ActivityLogSource('activity', 1, 'activity_date', ['activity_type', 'subject', 'description', 'user__username']),
+    EnquirySource('enquiry', 2, 'created_date', [
+        'contact_name', 'company_name', 'enquiry_stage', 'assigned_sales_person__username',
+    ]),
+    FollowUpSource('follow_up', 3, 'created_at', [
+        'lead_id', 'followup_type', 'status', 'notes', 'scheduled_date', 'created_by__username',
+    ]),
+    InvoiceSource('invoice', 4, 'created_at', [
+        'invoice_number', 'status', 'currency', 'total_amount', 'created_by__username',
+    ]),
+]
+SOURCE_RANKS = {source.kind: source.rank for source in SOURCES}
+
+
+def encode_cursor(event):
+    payload = json.dumps([event['timestamp'].isoformat(), SOURCE_RANKS[event['kind']], event['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, rank, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        timestamp = parse_datetime(timestamp)
+        if timestamp is None:
+            raise ValueError('bad timestamp')
+        return timestamp, int(rank), int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+
+
+def _sort_key(event):
+    return (event['timestamp'], SOURCE_RANKS[event['kind']], event['id'])
+
+
+def read_timeline(contact, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return ``(events, next_cursor)`` for one page; ``next_cursor`` is None at the end."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    position = decode_cursor(cursor) if cursor else None
+    streams = [list(source.read(contact, position, limit + 1)) for source in SOURCES]
+    merged = heapq.merge(*streams, key=_sort_key, reverse=True)
+    events = [event for _, event in zip(range(limit + 1), merged)]
+    has_more = len(events) > limit
+    events = events[:limit]
+    return events, encode_cursor(events[-1]) if has_more else None
+
+
+def contact_header_stats(contact):
+    """Counts and next action for the 360 header: the ContactStats row plus two queries."""
+    stats = stats_for(contact)
+    now = timezone.now()
+    activities = OutboundActivity.objects.filter(contact_id=contact.phone_number)
+    return {
+        'total_interactions': stats.total_activities,
+        'last_activity_at': stats.last_activity_at,
+        'enquiries': stats.enquiries,
+        # Outbound reminders still ahead; depends on the time, so counted on read
+        'pending_follow_ups': activities.filter(follow_up_reminder__gte=now).count(),
+        # Enquiry follow-ups not yet completed (FollowUp rows), not reminders
+        'open_follow_ups': stats.open_follow_ups,
+        'overdue_follow_ups': stats.has_overdue_follow_ups,
+        'next_action': activities.filter(next_step_date__gte=now).order_by('next_step_date').first(),
+    }
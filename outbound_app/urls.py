@@ -11,6 +11,7 @@ urlpatterns = [
     path('add/', views.outbound_add, name='outbound_add'),
     path('customer/<str:contact_id>/', views.customer_outbound, name='customer_outbound'),
     path('customer/<str:contact_id>/drawer/', views.customer_outbound_drawer, name='customer_outbound_drawer'),
+    path('customer/<str:contact_id>/timeline/', views.customer_timeline, name='customer_timeline'),
     path('customer/<str:contact_id>/send-catalog/', views.send_catalog, name='send_catalog'),
     path('activity/log/<str:pk>/', views.log_activity, name='log_activity'),
     path('<int:pk>/', views.outbound_detail, name='outbound_detail'),
@@ -21,6 +22,7 @@ urlpatterns = [
     # APIs
     path('api/outbound/', views.outbound_list_api, name='outbound-list-api'),
     path('api/outbound/<int:pk>/', views.outbound_detail_api, name='outbound-detail-api'),
+    path('api/trends/', views.outbound_trends_api, name='outbound-trends-api'),
 
     # Export
     path('export/csv/', views.outbound_export_csv, name='outbound-export-csv'),
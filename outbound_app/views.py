@@ -1,25 +1,33 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.db.models import Q, Count, Prefetch, Avg
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.conf import settings
 from django.core.paginator import Paginator
 from datetime import datetime, timedelta, time
-from django.db import IntegrityError
+from django.db import IntegrityError, connections
 from django.db.models.deletion import ProtectedError
 from django.views.decorators.http import require_http_methods
 from django.utils.dateparse import parse_datetime, parse_date
 from django.urls import reverse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
 from urllib.parse import urlencode
 
+from .analytics import TREND_PERIODS, TREND_SPLITS, activity_trend
+from .timeline import DEFAULT_PAGE_SIZE as TIMELINE_PAGE_SIZE, contact_header_stats, read_timeline
 from .models import OutboundActivity, Campaign
 from customers_app.models import Contact
 from leads_app.models import Lead
 from .forms import OutboundActivityForm, SimpleOutboundActivityForm
+import base64
 import csv
+import hashlib
+import json
 
 
 @login_required
@@ -305,75 +313,174 @@ def outbound_detail_api(request, pk: int):
         return JsonResponse({"error": str(e)}, status=500)
 
 
-@require_http_methods(["GET"])
-def outbound_list_api(request):
-    """Return JSON array of outbound activities with basic filters."""
-    qs = OutboundActivity.objects.select_related('contact', 'lead', 'created_by').order_by('-created_at')
-
+def _parse_filter_dt(val, is_end=False):
+    """Parse a date filter value (ISO datetime or YYYY-MM-DD)."""
+    if not val:
+        return None
+    dt = parse_datetime(val)
+    if dt:
+        return dt
+    d = parse_date(val)
+    if d:
+        return datetime.combine(d, time.max if is_end else time.min)
+    return None
+
+
+def filter_outbound_activities(qs, user, params):
+    """
+    Apply the outbound list filters in ``params`` to ``qs`` for ``user``.
+
+    Shared by the list API and the exports so they always agree on which
+    activities are included.
+    """
     # Apply role-based filtering
-    if request.user.is_superuser:
+    if user.is_superuser:
         # Super admin sees all activities
         pass
     else:
         # Regular users see only their own activities
-        qs = qs.filter(created_by=request.user)
+        qs = qs.filter(created_by=user)
 
     # Filters: contact, campaign, method, status
-    contact_q = request.GET.get('contact')
+    contact_q = params.get('contact')
     if contact_q:
         qs = qs.filter(contact__full_name__icontains=contact_q)
-    campaign_q = request.GET.get('campaign')
+    campaign_q = params.get('campaign')
     if campaign_q:
         qs = qs.filter(campaign__name__icontains=campaign_q)
-    method_q = request.GET.get('method')
+    method_q = params.get('method')
     if method_q:
         qs = qs.filter(method=method_q)
-    status_q = request.GET.get('status')
+    status_q = params.get('status')
     if status_q:
         qs = qs.filter(contact__outbound_status__iexact=status_q)
 
     # Salesperson
-    salesperson_q = request.GET.get('salesperson')
+    salesperson_q = params.get('salesperson')
     if salesperson_q:
         qs = qs.filter(created_by__username__icontains=salesperson_q)
 
     # Date range: date_from, date_to (accepts ISO datetime or YYYY-MM-DD)
-    def _parse_dt(val, is_end=False):
-        if not val:
-            return None
-        dt = parse_datetime(val)
-        if dt:
-            return dt
-        d = parse_date(val)
-        if d:
-            return datetime.combine(d, time.max if is_end else time.min)
-        return None
-
-    date_from = _parse_dt(request.GET.get('date_from'))
-    date_to = _parse_dt(request.GET.get('date_to'), is_end=True)
+    date_from = _parse_filter_dt(params.get('date_from'))
+    date_to = _parse_filter_dt(params.get('date_to'), is_end=True)
     if date_from:
         qs = qs.filter(created_at__gte=date_from)
     if date_to:
         qs = qs.filter(created_at__lte=date_to)
 
-    data = []
-    for a in qs[:500]:  # cap for safety
-        data.append({
-            "_id": a.id,
-            "contact_id": a.contact_id,
-            "customer": getattr(a.contact, 'full_name', None),
-            "phone": getattr(a.contact, 'phone_number', None),
-            "status": getattr(a.contact, 'outbound_status', None),
-            "time": a.created_at.isoformat() if a.created_at else None,
-            "lead": getattr(a.lead, 'contact_name', None),
-            "lead_id": a.lead_id,
-            "method": a.method,
-            "summary": a.summary,
-            "next_step": a.next_step,
-            "salesperson": getattr(a.created_by, 'username', None),
-            "last_contacted": getattr(a.contact, 'last_contacted', None).isoformat() if getattr(a.contact, 'last_contacted', None) else None,
-        })
-    return JsonResponse(data, safe=False)
+    return qs
+
+
+# API field name -> values() lookup; ``fields=`` picks a subset
+OUTBOUND_LIST_FIELDS = {
+    '_id': 'id',
+    'contact_id': 'contact_id',
+    'customer': 'contact__full_name',
+    'phone': 'contact__phone_number',
+    'status': 'contact__outbound_status',
+    'time': 'created_at',
+    'lead': 'lead__contact_name',
+    'lead_id': 'lead_id',
+    'method': 'method',
+    'summary': 'summary',
+    'next_step': 'next_step',
+    'salesperson': 'created_by__username',
+    'last_contacted': 'contact__last_contacted',
+}
+OUTBOUND_LIST_PAGE_SIZE = 500
+OUTBOUND_LIST_MAX_PAGE_SIZE = 1000
+
+
+class InvalidListCursor(ValueError):
+    pass
+
+
+def encode_list_cursor(created_at, pk):
+    payload = json.dumps([created_at.isoformat(), pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_list_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            raise ValueError('bad timestamp')
+        return created_at, int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidListCursor(f"Invalid cursor: {e}")
+
+
+def read_outbound_page(qs, fields, cursor=None, limit=OUTBOUND_LIST_PAGE_SIZE):
+    """
+    Return ``(records, next_cursor)`` for one newest-first page of ``qs``.
+
+    Pages are keyed on ``(created_at, id)`` rather than offsets, so deep pages
+    cost the same as the first one and rows logged meanwhile do not shift
+    later pages. ``next_cursor`` is None on the last page.
+    """
+    qs = qs.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_list_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    lookups = {OUTBOUND_LIST_FIELDS[field] for field in fields} | {'id', 'created_at'}
+    rows = list(qs.values(*lookups)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    records = []
+    for row in rows:
+        record = {}
+        for field in fields:
+            value = row[OUTBOUND_LIST_FIELDS[field]]
+            record[field] = value.isoformat() if hasattr(value, 'isoformat') else value
+        records.append(record)
+    next_cursor = encode_list_cursor(rows[-1]['created_at'], rows[-1]['id']) if has_more else None
+    return records, next_cursor
+
+
+@require_http_methods(["GET"])
+def outbound_list_api(request):
+    """
+    Return a JSON array of outbound activities with basic filters, newest first.
+
+    ``limit`` sets the page size (default 500) and ``fields`` a comma-separated
+    subset of the keys. When more rows follow, the ``X-Next-Cursor`` header
+    holds the value to pass as ``cursor`` for the next page and ``X-Has-More``
+    is true. Each page carries a weak ETag, so an unchanged page comes back as
+    304 Not Modified.
+    """
+    fields = list(OUTBOUND_LIST_FIELDS)
+    if request.GET.get('fields'):
+        fields = [f.strip() for f in request.GET['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in OUTBOUND_LIST_FIELDS]
+        if unknown or not fields:
+            return JsonResponse({'success': False, 'error': f"Unknown fields: {', '.join(unknown) or '(none given)'}"}, status=400)
+    try:
+        limit = int(request.GET.get('limit', OUTBOUND_LIST_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'limit must be an integer'}, status=400)
+    limit = max(1, min(limit, OUTBOUND_LIST_MAX_PAGE_SIZE))
+
+    qs = filter_outbound_activities(OutboundActivity.objects.all(), request.user, request.GET)
+    try:
+        records, next_cursor = read_outbound_page(qs, fields, request.GET.get('cursor'), limit)
+    except InvalidListCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    body = json.dumps(records, cls=DjangoJSONEncoder)
+    # The page is only as fresh as its rows, so the ETag is derived from the body
+    etag = f'W/"{hashlib.sha1(body.encode()).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['X-Has-More'] = 'true' if next_cursor else 'false'
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
 
 
 @login_required
@@ -386,59 +493,49 @@ def customer_outbound(request, contact_id: str):
     except Contact.DoesNotExist:
         contact = get_object_or_404(Contact, pk=contact_id)
     
-    # Get all activities with related data
-    activities = (
-        OutboundActivity.objects.select_related('created_by', 'lead', 'campaign')
-        .filter(contact=contact)
-        .order_by('-created_at')
-    )
+    # First page of the merged timeline; older events load through customer_timeline
+    timeline, timeline_cursor = read_timeline(contact)
+    stats = contact_header_stats(contact)
     
     # Related enquiries (Leads) with products
-    try:
-        from leads_app.models import Lead
-        related_leads = (
-            Lead.objects.filter(contact=contact)
-            .select_related('lead_source', 'assigned_sales_person')
-            .prefetch_related('products_enquired')
-            .order_by('-created_date')[:10]  # Limit to recent 10
-        )
-    except Exception:
-        related_leads = []
-    
-    # Calculate additional stats
-    total_interactions = activities.count()
-    last_activity = activities.first()
-    pending_follow_ups = activities.filter(
-        follow_up_reminder__isnull=False,
-        follow_up_reminder__gte=timezone.now()
-    ).count()
-    
-    # Check for overdue follow-ups
-    overdue_follow_ups = activities.filter(
-        follow_up_reminder__isnull=False,
-        follow_up_reminder__lt=timezone.now()
-    ).exists()
-    
-    # Get next scheduled action
-    next_action = activities.filter(
-        next_step_date__isnull=False,
-        next_step_date__gte=timezone.now()
-    ).order_by('next_step_date').first()
+    related_leads = (
+        Lead.objects.filter(contact=contact)
+        .select_related('lead_source', 'assigned_sales_person')
+        .prefetch_related('products_enquired')
+        .order_by('-created_date')[:10]  # Limit to recent 10
+    )
     
     context = {
         'contact': contact,
-        'activities': activities,
+        'timeline': timeline,
+        'timeline_cursor': timeline_cursor,
+        'stats': stats,
         'related_leads': related_leads,
-        'total_interactions': total_interactions,
-        'last_activity': last_activity,
-        'pending_follow_ups': pending_follow_ups,
-        'overdue_follow_ups': overdue_follow_ups,
-        'next_action': next_action,
+        'overdue_follow_ups': stats['overdue_follow_ups'],
+        'next_action': stats['next_action'],
     }
     
     return render(request, 'outbound_app/customer_outbound.html', context)
 
 
+@login_required
+@require_http_methods(["GET"])
+def customer_timeline(request, contact_id: str):
+    """Next page of a contact's 360° timeline as JSON with the rendered events."""
+    try:
+        contact = Contact.objects.get(phone_number=contact_id)
+    except Contact.DoesNotExist:
+        contact = get_object_or_404(Contact, pk=contact_id)
+    try:
+        limit = int(request.GET.get('limit', TIMELINE_PAGE_SIZE))
+        events, next_cursor = read_timeline(contact, request.GET.get('cursor'), limit)
+    except ValueError as e:
+        # InvalidCursor is a ValueError too
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    html = render_to_string('outbound_app/timeline_events.html', {'events': events}, request=request)
+    return JsonResponse({'success': True, 'html': html, 'next_cursor': next_cursor})
+
+
 @login_required
 @require_http_methods(["GET"]) 
 def customer_outbound_drawer(request, contact_id: str):
@@ -467,76 +564,123 @@ def customer_outbound_drawer(request, contact_id: str):
     except Exception:
         related_leads = []
     
-    # Calculate stats
-    total_interactions = OutboundActivity.objects.filter(contact=contact).count()
-    pending_follow_ups = activities.filter(
-        follow_up_reminder__isnull=False,
-        follow_up_reminder__gte=timezone.now()
-    ).count()
-    
-    overdue_follow_ups = OutboundActivity.objects.filter(
-        contact=contact,
-        follow_up_reminder__isnull=False,
-        follow_up_reminder__lt=timezone.now()
-    ).exists()
+    stats = contact_header_stats(contact)
     
     context = {
         'contact': contact,
         'activities': activities,
         'related_leads': related_leads,
-        'total_interactions': total_interactions,
-        'pending_follow_ups': pending_follow_ups,
-        'overdue_follow_ups': overdue_follow_ups,
+        'total_interactions': stats['total_interactions'],
+        'pending_follow_ups': stats['pending_follow_ups'],
+        'open_follow_ups': stats['open_follow_ups'],
+        'overdue_follow_ups': stats['overdue_follow_ups'],
     }
     
     return render(request, 'outbound_app/customer_drawer.html', context)
 
 
+OUTBOUND_EXPORT_HEADERS = ['ID', 'Customer', 'Campaign', 'Lead', 'Status', 'Method', 'Summary', 'Next Step', 'Next Step Date', 'Created By', 'Created At']
+
+# Columns read straight from the database; the export never instantiates models
+OUTBOUND_EXPORT_FIELDS = (
+    'id',
+    'contact__full_name',
+    'campaign__name',
+    'lead__contact_name',
+    'contact__outbound_status',
+    'method',
+    'summary',
+    'next_step',
+    'next_step_date',
+    'created_by__username',
+    'created_at',
+)
+
+OUTBOUND_EXPORT_CHUNK_SIZE = 2000
+
+
+def outbound_export_row(values, method_labels, next_step_labels):
+    """Build one CSV row from an ``OUTBOUND_EXPORT_FIELDS`` tuple."""
+    (pk, customer, campaign, lead, status, method, summary,
+     next_step, next_step_date, created_by, created_at) = values
+    return [
+        pk,
+        customer or '',
+        campaign or '',
+        lead or '',
+        status or '',
+        method_labels.get(method, method),
+        summary.replace('\r', ' ').replace('\n', ' ') if summary else '',
+        next_step_labels.get(next_step, next_step or ''),
+        next_step_date.isoformat() if next_step_date else '',
+        created_by or '',
+        created_at.isoformat() if created_at else '',
+    ]
+
+
+def _iter_outbound_export_values(qs, chunk_size=OUTBOUND_EXPORT_CHUNK_SIZE):
+    """
+    Yield ``OUTBOUND_EXPORT_FIELDS`` tuples newest first, ``chunk_size`` rows at a time.
+
+    With server-side cursors disabled (transaction-mode poolers) ``iterator()``
+    would buffer the whole result client-side, so walk (created_at, id) keyset
+    pages instead.
+    """
+    qs = qs.order_by('-created_at', '-id').values_list(*OUTBOUND_EXPORT_FIELDS)
+
+    if not connections[qs.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        yield from qs.iterator(chunk_size=chunk_size)
+        return
+
+    page = qs
+    while True:
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id, last_created = rows[-1][0], rows[-1][-1]
+        page = qs.filter(
+            Q(created_at__lt=last_created) | Q(created_at=last_created, id__lt=last_id)
+        )
+
+
+def iter_outbound_csv_rows(qs):
+    """Yield the header and data rows of the outbound CSV export."""
+    method_labels = dict(OutboundActivity.METHOD_CHOICES)
+    next_step_labels = dict(OutboundActivity.NEXT_STEP_CHOICES)
+    yield OUTBOUND_EXPORT_HEADERS
+    for values in _iter_outbound_export_values(qs):
+        yield outbound_export_row(values, method_labels, next_step_labels)
+
+
+def write_outbound_csv(qs, out):
+    """Write outbound activities as CSV to a text stream; returns the row count."""
+    writer = csv.writer(out)
+    count = -1  # header row
+    for row in iter_outbound_csv_rows(qs):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to the caller."""
+    def write(self, value):
+        return value
+
+
 @login_required
 @require_http_methods(["GET"])
 def outbound_export_csv(request):
-    """Export outbound activities to CSV with optional filters (same as list API)."""
-    qs = OutboundActivity.objects.select_related('contact', 'campaign', 'created_by').order_by('-created_at')
-
-    # Apply role-based filtering
-    if request.user.is_superuser:
-        # Super admin sees all activities
-        pass
-    else:
-        # Regular users see only their own activities
-        qs = qs.filter(created_by=request.user)
+    """Stream outbound activities as CSV with the same filters as the list API."""
+    qs = filter_outbound_activities(OutboundActivity.objects.all(), request.user, request.GET)
 
-    contact_q = request.GET.get('contact')
-    if contact_q:
-        qs = qs.filter(contact__full_name__icontains=contact_q)
-    campaign_q = request.GET.get('campaign')
-    if campaign_q:
-        qs = qs.filter(campaign__name__icontains=campaign_q)
-    method_q = request.GET.get('method')
-    if method_q:
-        qs = qs.filter(method=method_q)
-    status_q = request.GET.get('status')
-    if status_q:
-        qs = qs.filter(contact__outbound_status__iexact=status_q)
-
-    response = HttpResponse(content_type='text/csv')
+    writer = csv.writer(_Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in iter_outbound_csv_rows(qs)),
+        content_type='text/csv',
+    )
     response['Content-Disposition'] = 'attachment; filename="outbound_activities.csv"'
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Customer', 'Campaign', 'Lead', 'Status', 'Method', 'Summary', 'Next Step', 'Next Step Date', 'Created By', 'Created At'])
-    for a in qs.iterator():
-        writer.writerow([
-            a.id,
-            getattr(a.contact, 'full_name', ''),
-            getattr(a.campaign, 'name', ''),
-            getattr(a.lead, 'contact_name', ''),
-            getattr(a.contact, 'outbound_status', ''),
-            a.get_method_display(),
-            a.summary.replace('\r', ' ').replace('\n', ' ') if a.summary else '',
-            a.get_next_step_display(),
-            a.next_step_date.isoformat() if a.next_step_date else '',
-            getattr(a.created_by, 'username', ''),
-            a.created_at.isoformat() if a.created_at else '',
-        ])
     return response
 
 
@@ -613,15 +757,7 @@ def outbound_dashboard(request):
     recent_activities = activities_qs.order_by('-created_at')[:10]
     
     # Daily activity trend (last 7 days)
-    daily_stats = []
-    for i in range(7):
-        date = to_date - timedelta(days=i)
-        count = activities_qs.filter(created_at__date=date).count()
-        daily_stats.append({
-            'date': date,
-            'count': count
-        })
-    daily_stats.reverse()
+    daily_stats = activity_trend(activities_qs, to_date - timedelta(days=6), to_date)
     
     # Get all salespeople for filter dropdown
     # Note: OutboundActivity.created_by has related_name='outbound_created'
@@ -654,6 +790,68 @@ def outbound_dashboard(request):
     return render(request, 'outbound_app/outbound_dashboard.html', context)
 
 
+# Default window per bucket size when the trend API gets no dates
+TREND_DEFAULT_DAYS = {'day': 30, 'week': 90, 'month': 365}
+TREND_MAX_DAYS = 3 * 366
+
+
+@login_required
+@require_http_methods(["GET"])
+def outbound_trends_api(request):
+    """
+    Activity counts per day, week or month as JSON for the dashboard charts.
+
+    Query parameters: ``period`` (day/week/month), ``days`` or
+    ``from_date``/``to_date``, ``split`` (method/salesperson) and, for super
+    admins, ``salesperson`` (a user id).
+    """
+    period = request.GET.get('period', 'day')
+    split_by = request.GET.get('split') or None
+    if period not in TREND_PERIODS:
+        return JsonResponse({'success': False, 'error': f"period must be one of {', '.join(TREND_PERIODS)}"}, status=400)
+    if split_by is not None and split_by not in TREND_SPLITS:
+        return JsonResponse({'success': False, 'error': f"split must be one of {', '.join(TREND_SPLITS)}"}, status=400)
+
+    try:
+        salesperson = int(request.GET['salesperson']) if request.GET.get('salesperson') else None
+        to_date = parse_date(request.GET['to_date']) if request.GET.get('to_date') else timezone.localdate()
+        if request.GET.get('from_date'):
+            from_date = parse_date(request.GET['from_date'])
+        else:
+            from_date = to_date - timedelta(days=int(request.GET.get('days', TREND_DEFAULT_DAYS[period])) - 1)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date range or salesperson'}, status=400)
+    if not from_date or not to_date or from_date > to_date:
+        return JsonResponse({'success': False, 'error': 'Invalid date range'}, status=400)
+    if (to_date - from_date).days >= TREND_MAX_DAYS:
+        return JsonResponse({'success': False, 'error': f'Date range is limited to {TREND_MAX_DAYS} days'}, status=400)
+
+    # Same scoping as the dashboard
+    activities_qs = OutboundActivity.objects.filter(created_by__isnull=False)
+    if request.user.is_superuser:
+        if salesperson is not None:
+            activities_qs = activities_qs.filter(created_by_id=salesperson)
+    else:
+        activities_qs = activities_qs.filter(created_by=request.user)
+
+    points = activity_trend(activities_qs, from_date, to_date, period=period, split_by=split_by)
+    data = {
+        'success': True,
+        'period': period,
+        'from_date': from_date.isoformat(),
+        'to_date': to_date.isoformat(),
+        'labels': [point['date'].isoformat() for point in points],
+        'counts': [point['count'] for point in points],
+    }
+    if split_by:
+        keys = sorted({key for point in points for key in point['series']})
+        data['series'] = [
+            {'key': key, 'counts': [point['series'].get(key, 0) for point in points]}
+            for key in keys
+        ]
+    return JsonResponse(data)
+
+
 @login_required
 def send_catalog(request, contact_id):
     """Send catalog to a specific customer"""
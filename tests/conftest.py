@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    # Keeps cache reads out of database query counts; tests that assert
+    # counts use this instead of the configured DatabaseCache
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
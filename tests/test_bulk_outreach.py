@@ -0,0 +1,52 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from customers_app.models import Contact
+from outbound_app.api.views import CampaignViewSet
+from outbound_app.models import Campaign, MessageTemplate, OutboundActivity
+
+
+def _bulk(user, campaign, payload):
+    request = APIRequestFactory().post(f'/api/campaigns/{campaign.pk}/bulk-outreach/', payload, format='json')
+    force_authenticate(request, user=user)
+    return CampaignViewSet.as_view({'post': 'bulk_outreach'})(request, pk=campaign.pk)
+
+
+@pytest.mark.django_db
+def test_bulk_outreach_logs_many_contacts_in_one_request():
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    campaign = Campaign.objects.create(name='Spring')
+    template = MessageTemplate.objects.create(name='Intro', template_type='WHATSAPP', message='Hi {customer_name}')
+    contacts = [Contact.objects.create(full_name=f'C{i}', phone_number=f'90{i}') for i in range(50)]
+    converted = contacts[0]
+    Contact.objects.filter(pk=converted.pk).update(outbound_status='CONVERTED')
+    ids = [c.pk for c in contacts]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = _bulk(user, campaign, {
+            'contact_ids': ids + [ids[1], 999999],
+            'method': 'PHONE',
+            'outcome': 'NO_RESPONSE',
+            'template_id': template.pk,
+        })
+    assert response.status_code == 201
+    assert len(queries) < 15
+    assert response.data['created'] == 50
+    assert response.data['results'][-2:] == [
+        {'contact_id': ids[1], 'status': 'duplicate'},
+        {'contact_id': 999999, 'status': 'not_found'},
+    ]
+    first = response.data['results'][0]
+    activity = OutboundActivity.objects.get(pk=first['activity_id'])
+    assert (activity.campaign_id, activity.template_used_id, activity.created_by_id) == (campaign.pk, template.pk, user.pk)
+
+    statuses = dict(Contact.objects.values_list('pk', 'outbound_status'))
+    assert statuses[converted.pk] == 'CONVERTED'
+    assert statuses[ids[1]] == 'CONTACTED'
+    assert not Contact.objects.filter(last_contacted__isnull=True).exists()
+
+    assert _bulk(user, campaign, {'contact_ids': [], 'method': 'PHONE'}).status_code == 400
+    assert _bulk(user, campaign, {'contact_ids': [999999], 'method': 'PHONE'}).status_code == 400
@@ -0,0 +1,94 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.utils import timezone
+from PIL import Image
+
+from customers_app.models import Contact
+from exports_app.models import DeletedRecord
+from leads_app.models import Lead
+from media_app.thumbnails import ensure_thumbnails
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.content.decode().splitlines()]
+
+
+@pytest.mark.django_db
+def test_change_feed_pages_updates_and_tombstones():
+    User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    client = Client()
+    client.login(username='admin', password='testpass')
+
+    since = timezone.now() - timedelta(minutes=1)
+    contacts = [Contact.objects.create(full_name=f'Contact {i}', phone_number=f'10{i}') for i in range(3)]
+    # Same timestamp for every row, so paging relies on the id tie-breaker
+    Contact.objects.update(updated_date=timezone.now())
+
+    response = client.get('/exports/changes/contacts/', {'updated_since': since.isoformat(), 'limit': 2})
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert response['X-Has-More'] == 'true'
+    first = _lines(response)
+    assert [line['id'] for line in first] == [contacts[0].pk, contacts[1].pk]
+
+    response = client.get('/exports/changes/contacts/', {'cursor': response['X-Next-Cursor'], 'limit': 2})
+    second = _lines(response)
+    assert [line['id'] for line in second] == [contacts[2].pk]
+    assert second[0]['data']['full_name'] == 'Contact 2'
+    cursor = response['X-Next-Cursor']
+
+    deleted_pk = contacts[1].pk
+    contacts[1].delete()
+    contacts[0].full_name = 'Renamed'
+    contacts[0].save()
+
+    response = client.get('/exports/changes/contacts/', {'cursor': cursor})
+    assert response['X-Has-More'] == 'false'
+    third = _lines(response)
+    assert [(line['op'], line['id']) for line in third] == [('upsert', contacts[0].pk), ('delete', deleted_pk)]
+    assert DeletedRecord.objects.filter(entity='contacts', object_id=deleted_pk).exists()
+
+
+@pytest.mark.django_db
+def test_change_feed_rejects_bad_input():
+    User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    client = Client()
+
+    client.login(username='sales', password='testpass')
+    assert client.get('/exports/changes/leads/').status_code == 403
+
+    client.login(username='admin', password='testpass')
+    assert client.get('/exports/changes/widgets/').status_code == 404
+    assert client.get('/exports/changes/leads/', {'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/exports/changes/leads/', {'updated_since': '2024-01-01'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_change_feed_includes_queryset_updates(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    client = Client()
+    client.login(username='admin', password='testpass')
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), (20, 120, 40)).save(buffer, 'PNG')
+    lead = Lead.objects.create(
+        contact_name='Alice',
+        phone_number='111',
+        images=SimpleUploadedFile('photo.png', buffer.getvalue(), content_type='image/png'),
+    )
+    Lead.objects.filter(pk=lead.pk).update(image_thumbnails={}, updated_date=timezone.now() - timedelta(hours=1))
+    since = timezone.now() - timedelta(minutes=1)
+
+    lead.refresh_from_db()
+    assert ensure_thumbnails(lead, 'images')
+
+    lines = _lines(client.get('/exports/changes/leads/', {'updated_since': since.isoformat()}))
+    assert [line['id'] for line in lines] == [lead.pk]
+    assert lines[0]['data']['image_thumbnails']['source'] == lead.images.name
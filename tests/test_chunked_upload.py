@@ -0,0 +1,94 @@
+import hashlib
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+
+from activities_app.models import ActivityLog
+from leads_app.models import Lead
+from media_app.chunked_upload import part_path
+from media_app.models import ChunkedUpload
+
+BASE = '/enquiries/upload-whatsapp-file/chunked/'
+
+
+@pytest.fixture
+def client(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    settings.CHUNKED_UPLOAD_DIR = tmp_path / 'chunks'
+    settings.CHUNKED_UPLOAD_MAX_CHUNK_BYTES = 4
+    User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    client = Client()
+    client.login(username='sales', password='testpass')
+    return client
+
+
+def _put(client, upload_id, offset, data, checksum=None):
+    if checksum is None:
+        checksum = hashlib.sha256(data).hexdigest()
+    return client.put(
+        f'{BASE}{upload_id}/', data, content_type='application/octet-stream',
+        HTTP_UPLOAD_OFFSET=str(offset), HTTP_UPLOAD_CHECKSUM=checksum,
+    )
+
+
+def _chain(*chunks):
+    chain = ''
+    for chunk in chunks:
+        chain = hashlib.sha256(f'{chain}{hashlib.sha256(chunk).hexdigest()}'.encode()).hexdigest()
+    return chain
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_verifies(client, tmp_path):
+    lead = Lead.objects.create(contact_name='Alice', phone_number='111')
+    content = b'catalog-pdf'
+    start = client.post(BASE, {'filename': '../Catalog 2024.pdf', 'size': len(content)}).json()
+    upload_id = start['upload_id']
+    assert start['chunk_size'] == 4
+
+    assert _put(client, upload_id, 0, content[:4]).json()['offset'] == 4
+    # A retried chunk at a stale offset is refused with the offset to resume from
+    response = _put(client, upload_id, 0, content[:4])
+    assert response.status_code == 409
+    assert response.json()['offset'] == 4
+    assert _put(client, upload_id, 4, content[4:20]).status_code == 413
+
+    # A chunk that does not match its checksum is dropped
+    response = _put(client, upload_id, 4, content[4:8], checksum='0' * 64)
+    assert response.status_code == 422
+    assert response.json()['offset'] == 4
+    assert _put(client, upload_id, 4, content[4:8], checksum='').status_code == 400
+
+    _put(client, upload_id, 4, content[4:8])
+    assert client.get(f'{BASE}{upload_id}/').json()['offset'] == 8
+    checksum = _chain(content[:4], content[4:8], content[8:])
+    assert client.post(f'{BASE}{upload_id}/complete/', {'checksum': checksum}).status_code == 409
+    _put(client, upload_id, 8, content[8:])
+    assert client.post(f'{BASE}{upload_id}/complete/').status_code == 400
+
+    data = client.post(
+        f'{BASE}{upload_id}/complete/', {'checksum': checksum, 'lead_id': lead.pk, 'whatsapp_number': '+911'},
+    ).json()
+    assert data['success'] and data['file_name'] == 'Catalog_2024.pdf'
+    assert data['sha256'] == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / 'media' / 'whatsapp_files' / data['file_path']).read_bytes() == content
+    assert not list((tmp_path / 'chunks').iterdir())
+    assert ActivityLog.objects.filter(lead=lead, subject='File sent via WhatsApp to +911').exists()
+
+
+@pytest.mark.django_db
+def test_chunked_upload_rejects_damaged_file(client, settings):
+    start = client.post(BASE, {'filename': 'a.bin', 'size': 6}).json()
+    _put(client, start['upload_id'], 0, b'abc')
+    _put(client, start['upload_id'], 3, b'def')
+
+    # The assembled file is re-read, so damage after a chunk was accepted is caught
+    upload = ChunkedUpload.objects.get(upload_id=start['upload_id'])
+    with open(part_path(upload), 'r+b') as f:
+        f.write(b'x')
+
+    response = client.post(f"{BASE}{start['upload_id']}/complete/", {'checksum': _chain(b'abc', b'def')})
+    assert response.status_code == 422
+    # The bad bytes are discarded so the client starts again from zero
+    assert client.get(f"{BASE}{start['upload_id']}/").json()['offset'] == 0
@@ -0,0 +1,44 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from customers_app.models import Contact
+from leads_app.models import Lead
+from outbound_app.models import OutboundActivity
+
+
+def _make_contacts(user, start, count):
+    for i in range(start, start + count):
+        contact = Contact.objects.create(full_name=f'Contact {i:02d}', phone_number=f'90{i:02d}')
+        for n in range(2):
+            OutboundActivity.objects.create(contact=contact, method='PHONE', summary=f'Call {n}', created_by=user)
+        Lead.objects.create(contact_name=contact.full_name, phone_number=contact.phone_number, contact=contact)
+
+
+def _list(client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/api/contacts/', {'page_size': 50})
+    assert response.status_code == 200
+    return response.json(), len(queries)
+
+
+@pytest.mark.django_db
+def test_contact_list_query_count_is_constant():
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    client = Client()
+
+    _make_contacts(user, 0, 2)
+    data, small_page_queries = _list(client)
+    first = data['results'][0]
+    assert first['total_activities'] == 2
+    assert first['enquiries_count'] == 1
+    assert first['last_activity']['summary'] == 'Call 1'
+    assert first['last_activity']['created_by'] == 'sales'
+
+    _make_contacts(user, 2, 10)
+    data, large_page_queries = _list(client)
+    assert data['count'] == 12
+    # One COUNT for the paginator plus one page query, however many contacts
+    assert small_page_queries == large_page_queries == 2
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from customers_app.models import Contact
+from leads_app.models import FollowUp, Lead
+from outbound_app.models import ContactStats, OutboundActivity
+from outbound_app.timeline import contact_header_stats
+
+
+@pytest.mark.django_db
+def test_stats_follow_activity_enquiry_and_follow_up_changes(django_capture_on_commit_callbacks):
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    first = OutboundActivity.objects.create(contact=contact, method='PHONE', summary='a')
+    latest = OutboundActivity.objects.create(contact=contact, method='EMAIL', summary='b')
+    lead = Lead.objects.create(contact=contact, contact_name='Alice', phone_number='111')
+    follow_up = FollowUp.objects.create(lead=lead, scheduled_date=timezone.now() - timedelta(days=1))
+
+    stats = ContactStats.objects.get(contact=contact)
+    assert (stats.total_activities, stats.enquiries, stats.open_follow_ups) == (2, 1, 1)
+    assert (stats.last_activity_id, stats.last_activity_at) == (latest.pk, latest.created_at)
+    assert stats.has_overdue_follow_ups
+
+    follow_up.status = 'completed'
+    follow_up.save()
+    stats.refresh_from_db()
+    assert stats.open_follow_ups == 0 and not stats.has_overdue_follow_ups
+
+    with django_capture_on_commit_callbacks(execute=True):
+        latest.delete()
+    stats.refresh_from_db()
+    assert (stats.total_activities, stats.last_activity_id) == (1, first.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        contact.delete()
+    assert not ContactStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_command_repairs_rows():
+    alice = Contact.objects.create(full_name='Alice', phone_number='111')
+    bob = Contact.objects.create(full_name='Bob', phone_number='222')
+    OutboundActivity.objects.create(contact=alice, method='PHONE', summary='a')
+    ContactStats.objects.filter(contact=alice).update(total_activities=7)
+    ContactStats.objects.filter(contact=bob).delete()
+
+    call_command('rebuild_contact_stats', chunk_size=1)
+    assert ContactStats.objects.get(contact=alice).total_activities == 1
+    assert ContactStats.objects.get(contact=bob).total_activities == 0
+
+
+@pytest.mark.django_db
+def test_header_counts_pending_reminders_next_to_open_follow_ups():
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    assert ContactStats.objects.get(contact=contact).total_activities == 0
+
+    now = timezone.now()
+    OutboundActivity.objects.create(contact=contact, method='PHONE', summary='a', follow_up_reminder=now + timedelta(days=1))
+    OutboundActivity.objects.create(contact=contact, method='PHONE', summary='b', follow_up_reminder=now - timedelta(days=1))
+    lead = Lead.objects.create(contact=contact, contact_name='Alice', phone_number='111')
+    FollowUp.objects.create(lead=lead, scheduled_date=now + timedelta(days=2))
+    FollowUp.objects.create(lead=lead, scheduled_date=now + timedelta(days=3))
+
+    stats = contact_header_stats(contact)
+    assert (stats['pending_follow_ups'], stats['open_follow_ups']) == (1, 2)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from customers_app.models import Contact
+from leads_app.models import Lead
+from outbound_app.contact_status import recompute_contacts
+from outbound_app.models import OutboundActivity
+
+
+@pytest.mark.django_db
+def test_activity_updates_contact_in_one_conditional_update():
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    with CaptureQueriesContext(connection) as queries:
+        activity = OutboundActivity.objects.create(contact=contact, method='PHONE', summary='a')
+    assert len([q for q in queries if q['sql'].startswith('UPDATE "customers_app_contact"')]) == 1
+    contact.refresh_from_db()
+    assert (contact.outbound_status, contact.last_contacted) == ('CONTACTED', activity.created_at)
+
+    # Converted contacts stay converted, manual overrides are left alone
+    lead = Lead.objects.create(contact=contact, contact_name='Alice', phone_number='111')
+    OutboundActivity.objects.create(contact=contact, method='PHONE', summary='b', lead=lead)
+    OutboundActivity.objects.create(contact=contact, method='EMAIL', summary='c')
+    contact.refresh_from_db()
+    assert contact.outbound_status == 'CONVERTED'
+
+    manual = Contact.objects.create(full_name='Bob', phone_number='222', outbound_status='NOT_CONTACTED', manual_status_override=True)
+    OutboundActivity.objects.create(contact=manual, method='PHONE', summary='d')
+    manual.refresh_from_db()
+    assert manual.outbound_status == 'NOT_CONTACTED' and manual.last_contacted is not None
+
+
+@pytest.mark.django_db
+def test_recompute_repairs_only_drifted_contacts():
+    alice = Contact.objects.create(full_name='Alice', phone_number='111')
+    bob = Contact.objects.create(full_name='Bob', phone_number='222')
+    carol = Contact.objects.create(full_name='Carol', phone_number='333')
+    activity = OutboundActivity.objects.create(contact=alice, method='PHONE', summary='a')
+    OutboundActivity.objects.create(contact=bob, method='PHONE', summary='b')
+
+    stale = timezone.now() - timedelta(days=30)
+    Contact.objects.filter(pk=alice.pk).update(last_contacted=stale, outbound_status='NOT_CONTACTED')
+    Contact.objects.filter(pk=carol.pk).update(outbound_status='CONTACTED', last_contacted=stale)
+    before = Contact.objects.get(pk=bob.pk).updated_date
+
+    assert recompute_contacts(chunk_size=2) == 2
+    alice.refresh_from_db()
+    carol.refresh_from_db()
+    assert (alice.outbound_status, alice.last_contacted) == ('CONTACTED', activity.created_at)
+    assert (carol.outbound_status, carol.last_contacted) == ('NOT_CONTACTED', None)
+    assert Contact.objects.get(pk=bob.pk).updated_date == before
+    assert recompute_contacts() == 0
+
+    activity.delete()
+    alice.refresh_from_db()
+    assert alice.outbound_status == 'NOT_CONTACTED'
+    call_command('recompute_contact_status', '--dry-run')
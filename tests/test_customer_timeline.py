@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from activities_app.models import ActivityLog
+from customers_app.models import Contact
+from invoices_app.models import Invoice
+from leads_app.models import FollowUp, Lead
+from outbound_app.models import OutboundActivity
+from outbound_app.timeline import read_timeline
+
+
+def _at(model, obj, field, minutes_ago):
+    model.objects.filter(pk=obj.pk).update(**{field: timezone.now() - timedelta(minutes=minutes_ago)})
+
+
+@pytest.mark.django_db
+def test_timeline_merges_sources_in_keyset_pages(client):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    lead = Lead.objects.create(contact=contact, contact_name='Alice', phone_number='111')
+    _at(Lead, lead, 'created_date', 50)
+    follow_up = FollowUp.objects.create(lead=lead, scheduled_date=timezone.now() + timedelta(days=1), created_by=user)
+    _at(FollowUp, follow_up, 'created_at', 40)
+    log = ActivityLog.objects.create(contact=contact, user=user, activity_type='note', subject='Called back')
+    _at(ActivityLog, log, 'activity_date', 30)
+    invoice = Invoice.objects.create(contact=contact, created_by=user)
+    _at(Invoice, invoice, 'created_at', 20)
+    for minutes in (60, 10, 0):
+        activity = OutboundActivity.objects.create(contact=contact, method='PHONE', summary=str(minutes), created_by=user)
+        _at(OutboundActivity, activity, 'created_at', minutes)
+
+    with CaptureQueriesContext(connection) as queries:
+        first, cursor = read_timeline(contact, limit=3)
+    assert len(queries) == 5
+    assert [e['kind'] for e in first] == ['outbound', 'outbound', 'invoice']
+    rest, end = read_timeline(contact, cursor, limit=10)
+    assert [e['kind'] for e in rest] == ['activity', 'follow_up', 'enquiry', 'outbound']
+    assert end is None
+
+    client.force_login(user)
+    response = client.get(f'/outbound/customer/{contact.pk}/')
+    assert [e['kind'] for e in response.context['timeline']][:2] == ['outbound', 'outbound']
+    assert response.context['stats']['total_interactions'] == 3
+    page = client.get(f'/outbound/customer/{contact.pk}/timeline/', {'cursor': cursor, 'limit': 2}).json()
+    assert 'Called back' in page['html'] and page['next_cursor']
+    assert client.get(f'/outbound/customer/{contact.pk}/timeline/', {'cursor': 'nope'}).status_code == 400
+    assert client.get(f'/outbound/customer/{contact.pk}/drawer/').status_code == 200
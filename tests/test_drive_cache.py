@@ -0,0 +1,96 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+
+from media_app import drive_cache
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+
+
+class _FakeDrive(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        file_id = query['id'][0]
+        _FakeDrive.hits.append(file_id)
+        if file_id == 'missing':
+            self.send_response(404)
+            self.send_header('Content-Type', 'text/html')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(PNG_BYTES)))
+        self.end_headers()
+        self.wfile.write(PNG_BYTES)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_drive(settings, tmp_path):
+    server = HTTPServer(('127.0.0.1', 0), _FakeDrive)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _FakeDrive.hits = []
+    settings.DRIVE_THUMBNAIL_BASE_URL = f'http://127.0.0.1:{server.server_port}/thumbnail'
+    settings.DRIVE_IMAGE_CACHE_DIR = str(tmp_path / 'drive_cache')
+    settings.DRIVE_IMAGE_CACHE_MAX_BYTES = 10 * 1024 * 1024
+    settings.DRIVE_IMAGE_CACHE_TTL_SECONDS = 3600
+    yield settings
+    server.shutdown()
+
+
+@pytest.mark.django_db
+def test_proxy_fetches_once_and_honours_etag(fake_drive):
+    User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    client = Client()
+    client.login(username='sales', password='testpass')
+
+    response = client.get('/media/drive/thumbnail/', {'id': 'abc123', 'sz': 'w400'})
+    assert response.status_code == 200
+    assert response.content == PNG_BYTES
+    assert response['Content-Type'] == 'image/png'
+    assert 'max-age=86400' in response['Cache-Control']
+    etag = response['ETag']
+
+    response = client.get('/media/drive/thumbnail/', {'id': 'abc123', 'sz': 'w400'}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert _FakeDrive.hits == ['abc123']
+
+    assert client.get('/media/drive/thumbnail/', {'id': 'missing'}).status_code == 502
+    assert client.get('/media/drive/thumbnail/', {'id': '../etc/passwd'}).status_code == 400
+
+
+def test_eviction_drops_least_recently_used(fake_drive):
+    for file_id in ('first', 'second', 'third'):
+        drive_cache.get_image(file_id)
+        time.sleep(0.01)
+    # Touch "first" so "second" becomes the least recently used entry
+    drive_cache.get_image('first')
+
+    fake_drive.DRIVE_IMAGE_CACHE_MAX_BYTES = 2 * len(PNG_BYTES)
+    drive_cache.evict()
+
+    drive_cache.get_image('first')
+    drive_cache.get_image('second')
+    assert _FakeDrive.hits == ['first', 'second', 'third', 'second']
+
+
+def test_stale_entry_is_refetched_after_ttl(fake_drive):
+    drive_cache.get_image('abc123')
+    fake_drive.DRIVE_IMAGE_CACHE_TTL_SECONDS = 0
+    drive_cache.get_image('abc123')
+    assert _FakeDrive.hits == ['abc123', 'abc123']
+
+
+def test_proxy_url_rewrites_drive_thumbnails_only():
+    assert drive_cache.proxy_url('https://drive.google.com/thumbnail?id=abc123&sz=w400') == '/media/drive/thumbnail/?id=abc123&sz=w400'
+    assert drive_cache.proxy_url('https://example.com/photo.jpg') == 'https://example.com/photo.jpg'
@@ -0,0 +1,57 @@
+import time
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
+
+from leads_app.models import Lead
+from media_app.drive_checker import HostRateLimiter
+from media_app.models import DriveImageStatus
+
+
+@pytest.mark.django_db
+def test_check_drive_images_records_status_and_skips_recent(monkeypatch):
+    checked = []
+
+    def fake_check(url):
+        checked.append(url)
+        if 'broken' in url:
+            return {'accessible': False, 'status': 403, 'reason': 'Non-200 status code'}
+        return {'accessible': True, 'status': 200}
+
+    monkeypatch.setattr('media_app.views.check_google_drive_accessibility', fake_check)
+    for i, file_id in enumerate(['good1', 'good2', 'broken1']):
+        Lead.objects.create(
+            contact_name=f'Lead {i}', phone_number=f'5{i}',
+            image_url=f'https://drive.google.com/file/d/{file_id}/view?usp=sharing',
+        )
+
+    call_command('check_drive_images', '--workers', '3', '--rate', '0', stdout=StringIO())
+    assert len(checked) == 3
+    broken = DriveImageStatus.objects.get(is_accessible=False)
+    assert 'broken1' in broken.url
+    assert broken.status_code == 403
+
+    # Recently verified URLs are not checked again
+    call_command('check_drive_images', stdout=StringIO())
+    assert len(checked) == 3
+    call_command('check_drive_images', '--force', '--rate', '0', stdout=StringIO())
+    assert len(checked) == 6
+
+    User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    client = Client()
+    client.login(username='admin', password='testpass')
+    response = client.get('/media/')
+    assert response.context['total_images'] == 2
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(rate=20)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait('https://drive.google.com/thumbnail?id=a')
+    limiter.wait('https://example.com/other')
+    # Three requests to one host need two 50ms gaps; the other host is not delayed
+    assert 0.09 <= time.monotonic() - start < 0.5
@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+
+from leads_app.drive import extract_drive_file_id, google_drive_url
+from leads_app.models import Lead
+from media_app.models import MediaAsset
+
+
+@pytest.mark.parametrize('url', [
+    'https://drive.google.com/file/d/1AbC_d-9/view?usp=sharing',
+    'https://drive.google.com/file/d/1AbC_d-9/view',
+    'https://drive.google.com/open?id=1AbC_d-9',
+    'https://drive.google.com/uc?export=view&id=1AbC_d-9',
+    'https://drive.google.com/thumbnail?id=1AbC_d-9&sz=w400',
+])
+def test_extract_drive_file_id(url):
+    assert extract_drive_file_id(url) == '1AbC_d-9'
+    assert google_drive_url(url) == 'https://drive.google.com/thumbnail?id=1AbC_d-9&sz=w400'
+
+
+def test_non_drive_links():
+    assert extract_drive_file_id('https://example.com/photo.jpg?id=123') is None
+    assert google_drive_url('https://example.com/photo.jpg') == 'https://example.com/photo.jpg'
+    assert google_drive_url('No Photo') is None
+
+
+@pytest.mark.django_db
+def test_drive_file_id_set_on_save_and_backfilled():
+    lead = Lead.objects.create(contact_name='Alice', phone_number='111', image_url='https://drive.google.com/open?id=abc123')
+    assert lead.drive_file_id == 'abc123'
+    asset = MediaAsset.objects.get(lead=lead, source='google_drive')
+    assert asset.drive_file_id == 'abc123'
+    assert asset.image_url == '/media/drive/thumbnail/?id=abc123&sz=w400'
+
+    lead.image_url = 'https://drive.google.com/file/d/xyz789/view'
+    lead.save(update_fields=['image_url'])
+    assert Lead.objects.get(pk=lead.pk).drive_file_id == 'xyz789'
+
+    # Rows written before the column existed
+    Lead.objects.filter(pk=lead.pk).update(drive_file_id='')
+    MediaAsset.objects.filter(pk=asset.pk).update(drive_file_id='')
+    call_command('backfill_drive_file_ids', '--chunk-size', '1')
+    assert Lead.objects.get(pk=lead.pk).drive_file_id == 'xyz789'
+    assert MediaAsset.objects.get(pk=asset.pk).drive_file_id == 'xyz789'
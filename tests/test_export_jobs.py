@@ -0,0 +1,90 @@
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.test import Client
+from django.utils import timezone
+
+from exports_app.jobs import fail_stale_jobs, purge_expired_exports, run_export_job
+from exports_app.models import ExportJob
+from notifications_app.models import Notification, NotificationType
+from outbound_app.models import OutboundActivity
+from customers_app.models import Contact
+
+
+@pytest.fixture
+def export_settings(settings, tmp_path):
+    settings.EXPORT_JOBS_INLINE_WORKER = False
+    settings.MEDIA_ROOT = tmp_path
+    NotificationType.objects.create(name='EXPORT_READY', category='SYSTEM')
+    NotificationType.objects.create(name='EXPORT_FAILED', category='SYSTEM')
+    return settings
+
+
+@pytest.mark.django_db
+def test_export_job_builds_artifact_and_notifies(export_settings):
+    user = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    OutboundActivity.objects.create(contact=contact, method='call', created_by=user)
+    OutboundActivity.objects.create(contact=contact, method='whatsapp', created_by=user)
+
+    client = Client()
+    client.login(username='admin', password='testpass')
+    response = client.post('/exports/outbound/start/?method=call', HTTP_ACCEPT='application/json')
+    assert response.status_code == 202
+    job = ExportJob.objects.get(pk=response.json()['job']['id'])
+    assert job.status == 'PENDING'
+    assert job.filters == {'method': 'call'}
+
+    run_export_job(job.pk)
+    job.refresh_from_db()
+    assert job.status == 'COMPLETED'
+    assert job.row_count == 1
+    assert job.expires_at > timezone.now()
+    assert Notification.objects.filter(recipient=user, notification_type__name='EXPORT_READY').exists()
+
+    # A second run must not rebuild an already claimed job
+    assert run_export_job(job.pk) is None
+
+    response = client.get(f'/exports/jobs/{job.pk}/download/')
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+    assert len(rows) == 2
+
+    other = User.objects.create_user('other', 'other@example.com', 'testpass')
+    client.force_login(other)
+    assert client.get(f'/exports/jobs/{job.pk}/download/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_expired_exports_are_purged(export_settings):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    job = ExportJob.objects.create(export_type='outbound', requested_by=user)
+    run_export_job(job.pk)
+    job.refresh_from_db()
+    name = job.file.name
+    assert default_storage.exists(name)
+
+    ExportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+    assert purge_expired_exports() == 1
+    job.refresh_from_db()
+    assert job.status == 'EXPIRED'
+    assert not default_storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_stalled_running_job_is_failed(export_settings):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    stalled = ExportJob.objects.create(export_type='outbound', requested_by=user, status='RUNNING',
+                                       started_at=timezone.now() - timedelta(hours=2))
+    running = ExportJob.objects.create(export_type='outbound', requested_by=user, status='RUNNING',
+                                       started_at=timezone.now())
+
+    assert fail_stale_jobs() == 1
+    stalled.refresh_from_db()
+    running.refresh_from_db()
+    assert (stalled.status, running.status) == ('FAILED', 'RUNNING')
+    assert Notification.objects.filter(recipient=user, notification_type__name='EXPORT_FAILED').exists()
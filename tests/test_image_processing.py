@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from crm_project.storage_backends import upload_storage
+from leads_app.models import Lead
+from media_app import processing, thumbnails
+
+
+def _phone_photo():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees, as phones store portrait shots
+    exif[0x010F] = 'PhoneMaker'
+    buffer = io.BytesIO()
+    Image.new('RGB', (1200, 800), (10, 120, 200)).save(buffer, 'JPEG', exif=exif, quality=95)
+    return SimpleUploadedFile('IMG_0001.JPG', buffer.getvalue(), content_type='image/jpeg')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_PROCESSING = {'leads_app.Lead.images': {'max_dimension': 600, 'format': 'jpeg', 'quality': 80}}
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_new_upload_is_recompressed_after_commit(media_root, django_capture_on_commit_callbacks, monkeypatch):
+    # Run the pool job inline so the test can inspect the result
+    monkeypatch.setattr(processing, 'submit', processing._run)
+    rendered = []
+    generate_renditions = thumbnails.generate_renditions
+
+    def counting_renditions(name, *args):
+        rendered.append(name)
+        return generate_renditions(name, *args)
+
+    monkeypatch.setattr(thumbnails, 'generate_renditions', counting_renditions)
+    with django_capture_on_commit_callbacks(execute=True):
+        lead = Lead.objects.create(contact_name='Alice', phone_number='111', images=_phone_photo())
+    original = lead.images.name
+
+    lead.refresh_from_db()
+    assert lead.images.name != original
+    # Nothing else references the original, so it is deleted with its metadata
+    assert not upload_storage.exists(original)
+    with upload_storage.open(lead.images.name) as f:
+        image = Image.open(f)
+        assert image.size == (400, 600)  # auto-oriented, longest side capped
+        assert not image.getexif()
+    assert lead.image_thumbnails['source'] == lead.images.name
+    assert rendered == [lead.images.name]  # only the processed image gets thumbnails
+    assert lead.media_assets.get(source='lead_image').url == lead.images.name
+
+
+@pytest.mark.django_db
+def test_reprocess_images_skips_optimized_files(media_root):
+    lead = Lead.objects.create(contact_name='Bob', phone_number='222', images=_phone_photo())
+
+    call_command('reprocess_images', '--workers', '2', '--batch-size', '1')
+    lead.refresh_from_db()
+    processed_name = lead.images.name
+    assert processed_name.endswith('.jpg')
+
+    call_command('reprocess_images')
+    lead.refresh_from_db()
+    assert lead.images.name == processed_name
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+
+from leads_app.models import Lead, Product
+
+
+def _export_rows(response):
+    content = b''.join(response.streaming_content)
+    wb = load_workbook(io.BytesIO(content), read_only=True)
+    return list(wb['Enquiries'].iter_rows(values_only=True))
+
+
+@pytest.mark.django_db
+def test_lead_export_applies_list_filters():
+    """Export honours the same filters as the enquiry list"""
+    user = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    Lead.objects.create(contact_name='Alice', phone_number='111', lead_status='not_fulfilled', created_by=user)
+    Lead.objects.create(contact_name='Bob', phone_number='222', lead_status='not_fulfilled', created_by=user)
+    Lead.objects.create(contact_name='Carol', phone_number='333', lead_status='fulfilled', created_by=user)
+
+    client = Client()
+    client.login(username='admin', password='testpass')
+
+    response = client.get('/enquiries/bulk-export/', {'search': 'Alice'})
+    assert response.status_code == 200
+    rows = _export_rows(response)
+    assert rows[0][0] == 'Date'
+    assert [row[3] for row in rows[1:]] == ['Alice']
+
+    response = client.get('/enquiries/bulk-export/', {'tab': 'fulfilled'})
+    rows = _export_rows(response)
+    assert [row[3] for row in rows[1:]] == ['Carol']
+
+    # Malformed dates are ignored instead of failing the download
+    response = client.get('/enquiries/bulk-export/', {'from_date': '2024-13-45', 'to_date': 'soon'})
+    assert response.status_code == 200
+    assert len(_export_rows(response)) == 3
+
+
+@pytest.mark.django_db
+def test_lead_export_query_count_does_not_grow_with_rows():
+    """Products are prefetched, so the export does not issue a query per enquiry"""
+    user = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    product = Product.objects.create(name='Gloves')
+    for i in range(15):
+        lead = Lead.objects.create(contact_name=f'Lead {i}', phone_number=f'9{i}', created_by=user)
+        lead.products_enquired.add(product)
+
+    client = Client()
+    client.login(username='admin', password='testpass')
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get('/enquiries/bulk-export/')
+        rows = _export_rows(response)
+
+    assert len(rows) == 16
+    assert all(row[5] == 'Gloves' for row in rows[1:])
+    # Session/auth lookups + one leads query + one products prefetch
+    assert len(ctx.captured_queries) < 10
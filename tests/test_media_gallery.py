@@ -0,0 +1,58 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from leads_app.models import Lead
+from media_app.models import MediaAsset
+
+
+@pytest.mark.django_db
+def test_lead_signals_maintain_media_assets():
+    owner = User.objects.create_user('sales', 'sales@example.com', 'testpass', first_name='Sam')
+    lead = Lead.objects.create(
+        contact_name='Alice', phone_number='111', assigned_sales_person=owner,
+        image_url='https://drive.google.com/file/d/abc123/view?usp=sharing',
+    )
+
+    asset = MediaAsset.objects.get(lead=lead)
+    assert asset.source == 'google_drive'
+    assert asset.url == 'https://drive.google.com/thumbnail?id=abc123&sz=w400'
+    assert asset.image_url == '/media/drive/thumbnail/?id=abc123&sz=w400'
+    assert asset.salesperson_id == owner.pk
+
+    lead.image_url = ''
+    lead.save()
+    assert not MediaAsset.objects.filter(lead=lead).exists()
+
+
+@pytest.mark.django_db
+def test_media_gallery_filters_and_paginates_in_sql():
+    admin = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    for i in range(25):
+        Lead.objects.create(
+            contact_name=f'Lead {i}', phone_number=f'9{i}',
+            assigned_sales_person=admin if i % 2 else None,
+            image_url=f'https://drive.google.com/file/d/id{i}/view?usp=sharing',
+        )
+    MediaAsset.objects.all().delete()
+    call_command('backfill_media_assets')
+    assert MediaAsset.objects.count() == 25
+
+    client = Client()
+    client.login(username='admin', password='testpass')
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get('/media/')
+    assert response.status_code == 200
+    assert response.context['total_images'] == 25
+    assert len(response.context['images']) == 20
+    # Session/auth + count + page slice + salespeople dropdown
+    assert len(ctx.captured_queries) < 10
+
+    response = client.get('/media/', {'salesperson_filter': 'unassigned'})
+    assert response.context['total_images'] == 13
+    response = client.get('/media/', {'salesperson_filter': str(admin.pk), 'date_filter': 'today'})
+    assert response.context['total_images'] == 12
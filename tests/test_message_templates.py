@@ -0,0 +1,59 @@
+import csv
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts_app.models import Account
+from customers_app.models import Contact
+from outbound_app.api.views import MessageTemplateViewSet
+from outbound_app.message_templates import cached_template, compile_message
+from outbound_app.models import MessageTemplate
+
+
+def _batch(user, template, contact_ids, output=None):
+    path = f'/api/templates/{template.pk}/personalize-batch/' + ('?output=csv' if output else '')
+    request = APIRequestFactory().post(path, {'contact_ids': contact_ids}, format='json')
+    force_authenticate(request, user=user)
+    return MessageTemplateViewSet.as_view({'post': 'personalize_batch'})(request, pk=template.pk)
+
+
+def test_compiled_message_matches_str_format():
+    context = {'customer_name': 'Alice', 'company_name': 'Acme'}
+    assert compile_message('Hi {customer_name} at {company_name}!').render(context) == 'Hi Alice at Acme!'
+    assert compile_message('Hi {customer_name!r:>9}').render(context) == "Hi   'Alice'"
+    # Unknown placeholders and broken braces leave the text untouched, as before
+    assert compile_message('Hi {first_name}').render(context) == 'Hi {first_name}'
+    assert compile_message('Hi {customer_name').render(context) == 'Hi {customer_name'
+
+
+@pytest.mark.django_db
+def test_batch_personalization_preloads_and_streams_links(locmem_cache):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    template = MessageTemplate.objects.create(
+        name='Intro', template_type='WHATSAPP', subject='For {company_name}', message='Hi {customer_name} from {company_name}',
+    )
+    acme = Account.objects.create(company_name='Acme', phone_number='500')
+    alice = Contact.objects.create(full_name='Alice', phone_number='111', whatsapp_number='+91 111', company=acme)
+    bob = Contact.objects.create(full_name='Bob', phone_number='222', email='bob@example.com')
+    cached_template(template.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        data = _batch(user, template, [bob.pk, alice.pk, 999999]).data
+    assert len(queries) == 1
+    assert [r['message'] for r in data['results']] == ['Hi Bob from your company', 'Hi Alice from Acme']
+    assert data['results'][1]['links']['whatsapp'] == 'https://wa.me/91111?text=Hi%20Alice%20from%20Acme'
+    assert data['results'][0]['links']['email'].startswith('mailto:bob@example.com?subject=For%20your%20company')
+    assert data['not_found'] == [999999]
+
+    response = _batch(user, template, [alice.pk], output='csv')
+    rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert rows[1][:4] == [str(alice.pk), 'Alice', '111', 'https://wa.me/91111?text=Hi%20Alice%20from%20Acme']
+
+    # Saving the template drops the compiled copy
+    template.message = 'Hello {customer_name}'
+    template.save()
+    assert _batch(user, template, [bob.pk]).data['results'][0]['message'] == 'Hello Bob'
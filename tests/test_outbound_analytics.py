@@ -0,0 +1,50 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from customers_app.models import Contact
+from outbound_app.api.views import OutboundAnalyticsOverview
+from outbound_app.models import OutboundActivity
+
+
+def _overview(user, **params):
+    request = APIRequestFactory().get('/api/analytics/overview/', params)
+    force_authenticate(request, user=user)
+    return OutboundAnalyticsOverview.as_view()(request).data
+
+
+@pytest.mark.django_db
+def test_overview_is_grouped_cached_and_invalidated(locmem_cache):
+    cache.clear()
+    admin = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    sales = User.objects.create_user('sales', 'sales@example.com', 'testpass', first_name='Sam')
+    alice = Contact.objects.create(full_name='Alice', phone_number='111')
+    bob = Contact.objects.create(full_name='Bob', phone_number='222')
+    Contact.objects.create(full_name='Carol', phone_number='333')
+    OutboundActivity.objects.create(contact=alice, method='PHONE', outcome='INTERESTED', summary='a', created_by=sales)
+    OutboundActivity.objects.create(contact=alice, method='WHATSAPP', summary='b', created_by=sales)
+    OutboundActivity.objects.create(contact=bob, method='PHONE', summary='c', created_by=admin)
+
+    with CaptureQueriesContext(connection) as queries:
+        data = _overview(admin)
+    assert len(queries) <= 5
+    assert data['contact_stats']['total_contacts'] == 3
+    assert data['contact_stats']['activities_today'] == 3
+    assert data['contact_stats']['contacted_today'] == 2
+    assert data['method_breakdown'][0] == {'method': 'PHONE', 'count': 2}
+    assert data['outcome_breakdown'] == [{'outcome': 'INTERESTED', 'count': 1}]
+    top = data['leaderboard'][0]
+    assert (top['full_name'], top['total_activities'], top['unique_contacts'], top['calls'], top['whatsapp']) == ('Sam', 2, 1, 1, 1)
+
+    # Non-superusers get their own scope
+    assert _overview(sales)['contact_stats']['activities_today'] == 2
+
+    # Served from cache until an activity is logged
+    with CaptureQueriesContext(connection) as queries:
+        _overview(admin)
+    assert len(queries) == 0
+    OutboundActivity.objects.create(contact=bob, method='EMAIL', summary='d', created_by=admin)
+    assert _overview(admin)['contact_stats']['activities_today'] == 4
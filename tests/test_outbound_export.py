@@ -0,0 +1,65 @@
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from customers_app.models import Contact
+from leads_app.models import Lead
+from outbound_app.models import OutboundActivity
+from outbound_app.views import _iter_outbound_export_values
+
+
+def _csv_rows(response):
+    content = b''.join(response.streaming_content).decode('utf-8')
+    return list(csv.reader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_outbound_export_streams_with_date_filters():
+    user = User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    lead = Lead.objects.create(contact_name='Alice Enquiry', phone_number='111', created_by=user)
+    recent = OutboundActivity.objects.create(contact=contact, lead=lead, method='call', created_by=user)
+    old = OutboundActivity.objects.create(contact=contact, method='call', created_by=user)
+    OutboundActivity.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+
+    client = Client()
+    client.login(username='admin', password='testpass')
+    date_from = (timezone.now() - timedelta(days=7)).date().isoformat()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get('/outbound/export/csv/', {'date_from': date_from})
+        rows = _csv_rows(response)
+
+    assert response.streaming
+    assert rows[0][0] == 'ID'
+    assert [int(row[0]) for row in rows[1:]] == [recent.pk]
+    assert rows[1][3] == 'Alice Enquiry'
+    # Session/auth lookups + a single projected query; no per-row lead lookups
+    assert len(ctx.captured_queries) < 6
+
+
+@pytest.mark.django_db
+def test_outbound_export_pages_by_keyset_without_server_side_cursors(monkeypatch):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Bob', phone_number='222')
+    now = timezone.now()
+    created = []
+    for i in range(5):
+        activity = OutboundActivity.objects.create(contact=contact, method='call', created_by=user)
+        # Two activities share a timestamp so the id tie-breaker is exercised
+        OutboundActivity.objects.filter(pk=activity.pk).update(created_at=now - timedelta(minutes=i // 2))
+        created.append(activity.pk)
+
+    monkeypatch.setitem(connection.settings_dict, 'DISABLE_SERVER_SIDE_CURSORS', True)
+    ids = [values[0] for values in _iter_outbound_export_values(OutboundActivity.objects.all(), chunk_size=2)]
+
+    expected = list(OutboundActivity.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+    assert ids == expected
+    assert sorted(ids) == sorted(created)
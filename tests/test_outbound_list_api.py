@@ -0,0 +1,43 @@
+import pytest
+from django.contrib.auth.models import User
+
+from customers_app.models import Contact
+from outbound_app.models import OutboundActivity
+
+URL = '/outbound/api/outbound/'
+
+
+@pytest.mark.django_db
+def test_list_api_pages_by_cursor_with_sparse_fields_and_etag(client):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    activities = [
+        OutboundActivity.objects.create(contact=contact, method='PHONE', summary=str(i), created_by=user)
+        for i in range(5)
+    ]
+    client.force_login(user)
+
+    response = client.get(URL, {'limit': 2, 'fields': '_id,customer'})
+    assert response.json() == [
+        {'_id': activities[4].id, 'customer': 'Alice'},
+        {'_id': activities[3].id, 'customer': 'Alice'},
+    ]
+    assert response['X-Has-More'] == 'true'
+
+    seen = [r['_id'] for r in response.json()]
+    cursor = response['X-Next-Cursor']
+    while cursor:
+        page = client.get(URL, {'limit': 2, 'fields': '_id', 'cursor': cursor})
+        seen += [r['_id'] for r in page.json()]
+        cursor = page.get('X-Next-Cursor')
+    assert seen == [a.id for a in reversed(activities)]
+
+    # Unchanged pages are not resent
+    first = client.get(URL)
+    assert first.json()[0]['summary'] == '4'
+    assert client.get(URL, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 304
+    OutboundActivity.objects.filter(pk=activities[4].pk).update(summary='changed')
+    assert client.get(URL, HTTP_IF_NONE_MATCH=first['ETag']).status_code == 200
+
+    assert client.get(URL, {'fields': 'password'}).status_code == 400
+    assert client.get(URL, {'cursor': 'garbage'}).status_code == 400
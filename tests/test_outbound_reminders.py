@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from customers_app.models import Contact
+from notifications_app.models import Notification, NotificationType
+from outbound_app.models import OutboundActivity
+
+
+def _activity(contact, user, due):
+    return OutboundActivity.objects.create(contact=contact, method='PHONE', summary='call', created_by=user, follow_up_reminder=due)
+
+
+@pytest.mark.django_db
+def test_due_queue_pages_one_salespersons_reminders_oldest_first():
+    alice = User.objects.create_user('alice', password='pw')
+    bob = User.objects.create_user('bob', password='pw')
+    contact = Contact.objects.create(full_name='Carol', phone_number='111')
+    now = timezone.now()
+    due = [_activity(contact, alice, now - timedelta(hours=h)) for h in (1, 3, 2)]
+    _activity(contact, alice, now + timedelta(days=1))
+    _activity(contact, bob, now - timedelta(hours=5))
+
+    client = APIClient()
+    client.force_authenticate(alice)
+    first = client.get('/api/activities/due-queue/', {'limit': 2}).json()
+    assert [item['id'] for item in first['results']] == [due[1].pk, due[2].pk]
+    assert first['has_more']
+    second = client.get('/api/activities/due-queue/', {'limit': 2, 'cursor': first['next_cursor']}).json()
+    assert [item['id'] for item in second['results']] == [due[0].pk]
+    assert second['next_cursor'] is None
+
+    assert client.get('/api/activities/due-queue/', {'cursor': 'junk'}).status_code == 400
+    other = client.get('/api/activities/due-queue/', {'salesperson': bob.pk}).json()
+    assert other['salesperson'] == 'bob' and len(other['results']) == 1
+
+
+@pytest.mark.django_db
+def test_queue_command_creates_each_reminder_notification_once():
+    # Created by a data migration
+    assert NotificationType.objects.filter(name='FOLLOWUP_REMINDER', is_active=True).exists()
+    alice = User.objects.create_user('alice', password='pw')
+    contact = Contact.objects.create(full_name='Carol', phone_number='111')
+    now = timezone.now()
+    due = [_activity(contact, alice, now - timedelta(minutes=m)) for m in (1, 2, 3)]
+    _activity(contact, None, now - timedelta(minutes=4))
+    _activity(contact, alice, now + timedelta(days=1))
+
+    call_command('queue_outbound_reminders', batch_size=2)
+    notifications = Notification.objects.filter(recipient=alice)
+    assert sorted(n.object_id for n in notifications) == sorted(a.pk for a in due)
+    assert all(n.status == 'PENDING' for n in notifications)
+    stamped = OutboundActivity.objects.get(pk=due[0].pk)
+    assert stamped.reminder_notified_at is not None and stamped.updated_at == stamped.reminder_notified_at
+
+    call_command('queue_outbound_reminders')
+    assert Notification.objects.count() == 3
+
+    # Rescheduling a queued reminder queues it again
+    activity = due[0]
+    activity.refresh_from_db()
+    activity.follow_up_reminder = now - timedelta(seconds=10)
+    activity.save()
+    call_command('queue_outbound_reminders')
+    assert Notification.objects.filter(object_id=activity.pk).count() == 2
+
+
+@pytest.mark.django_db
+def test_queue_command_fails_without_the_reminder_type():
+    NotificationType.objects.filter(name='FOLLOWUP_REMINDER').delete()
+    contact = Contact.objects.create(full_name='Carol', phone_number='111')
+    activity = _activity(contact, User.objects.create_user('alice', password='pw'), timezone.now() - timedelta(minutes=1))
+
+    with pytest.raises(CommandError):
+        call_command('queue_outbound_reminders')
+    activity.refresh_from_db()
+    assert activity.reminder_notified_at is None
@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from customers_app.models import Contact
+from outbound_app.analytics import activity_trend
+from outbound_app.models import OutboundActivity
+
+
+def _log(contact, user, day, method='PHONE'):
+    activity = OutboundActivity.objects.create(contact=contact, method=method, summary='x', created_by=user)
+    created_at = timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=20))
+    OutboundActivity.objects.filter(pk=activity.pk).update(created_at=created_at)
+
+
+@pytest.mark.django_db
+def test_trend_buckets_in_one_query_and_fills_gaps():
+    sales = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    _log(contact, sales, date(2024, 5, 6))
+    _log(contact, sales, date(2024, 5, 8), method='EMAIL')
+    _log(contact, sales, date(2024, 5, 20))
+
+    with CaptureQueriesContext(connection) as queries:
+        days = activity_trend(OutboundActivity.objects.all(), date(2024, 5, 6), date(2024, 5, 12))
+    assert len(queries) == 1
+    assert [d['count'] for d in days] == [1, 0, 1, 0, 0, 0, 0]
+
+    weeks = activity_trend(OutboundActivity.objects.all(), date(2024, 5, 1), date(2024, 5, 31), period='week', split_by='method')
+    assert weeks[0]['date'] == date(2024, 4, 29)
+    assert weeks[1] == {'date': date(2024, 5, 6), 'count': 2, 'series': {'PHONE': 1, 'EMAIL': 1}}
+    assert [w['count'] for w in weeks] == [0, 2, 0, 1, 0]
+
+    months = activity_trend(OutboundActivity.objects.all(), date(2024, 4, 15), date(2024, 6, 1), period='month')
+    assert [(m['date'], m['count']) for m in months] == [(date(2024, 4, 1), 0), (date(2024, 5, 1), 3), (date(2024, 6, 1), 0)]
+
+
+@pytest.mark.django_db
+def test_trends_api_scopes_to_user(client):
+    sales = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    other = User.objects.create_user('other', 'other@example.com', 'testpass')
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    today = timezone.localdate()
+    _log(contact, sales, today)
+    _log(contact, other, today)
+
+    client.force_login(sales)
+    data = client.get('/outbound/api/trends/', {'days': 7, 'split': 'salesperson'}).json()
+    assert len(data['labels']) == 7
+    assert data['counts'][-1] == 1
+    assert data['series'] == [{'key': 'sales', 'counts': [0, 0, 0, 0, 0, 0, 1]}]
+    assert client.get('/outbound/api/trends/', {'period': 'hour'}).status_code == 400
+    assert client.get('/outbound/api/trends/', {'salesperson': 'abc'}).status_code == 400
+
+    response = client.get('/outbound/dashboard/')
+    assert [d['count'] for d in response.context['daily_stats']] == [0, 0, 0, 0, 0, 0, 1]
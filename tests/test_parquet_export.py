@@ -0,0 +1,64 @@
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client
+
+from customers_app.models import Contact
+from exports_app.jobs import run_export_job
+from exports_app.models import ExportJob
+from invoices_app.models import Invoice, InvoiceItem
+from leads_app.models import Lead
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.mark.django_db
+def test_export_parquet_command_writes_typed_partitions(tmp_path):
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    Lead.objects.create(contact_name='Alice', phone_number='111', created_by=user)
+    contact = Contact.objects.create(full_name='Alice', phone_number='111')
+    invoice = Invoice.objects.create(contact=contact, invoice_number='INV-1', issue_date=date(2024, 3, 5))
+    InvoiceItem.objects.create(invoice=invoice, description='Gloves', quantity=2, unit_price=Decimal('12.50'), line_total=Decimal('25.00'))
+
+    call_command('export_parquet', str(tmp_path), '--dataset', 'invoice_items', '--dataset', 'leads', '--chunk-size', '1')
+
+    items = pq.read_table(tmp_path / 'invoice_items')
+    assert items.num_rows == 1
+    assert str(items.schema.field('unit_price').type) == 'decimal128(12, 2)'
+    assert items.column('month').to_pylist() == ['2024-03']
+    assert (tmp_path / 'invoice_items' / 'month=2024-03').is_dir()
+
+    leads = pq.read_table(tmp_path / 'leads')
+    assert leads.column('contact_name').to_pylist() == ['Alice']
+    assert leads.schema.field('created_by_id').type == 'int64'
+
+
+@pytest.mark.django_db
+def test_parquet_endpoint_queues_an_export_job(settings, tmp_path):
+    settings.EXPORT_JOBS_INLINE_WORKER = False
+    settings.MEDIA_ROOT = tmp_path
+    User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    User.objects.create_superuser('admin', 'admin@example.com', 'testpass')
+    client = Client()
+
+    client.login(username='sales', password='testpass')
+    assert client.post('/exports/parquet/').status_code == 403
+
+    client.login(username='admin', password='testpass')
+    assert client.post('/exports/parquet/', {'dataset': 'nope'}).status_code == 400
+    response = client.post('/exports/parquet/', {'dataset': 'followups'}, HTTP_ACCEPT='application/json')
+    assert response.status_code == 202
+    job = ExportJob.objects.get(pk=response.json()['job']['id'])
+    assert (job.export_type, job.status, job.filters) == ('parquet', 'PENDING', {'datasets': ['followups']})
+
+    run_export_job(job.pk)
+    response = client.get(f'/exports/jobs/{job.pk}/download/')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as zf:
+        # No follow-ups yet: the dataset directory is simply empty
+        assert zf.namelist() == []
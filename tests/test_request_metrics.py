@@ -0,0 +1,45 @@
+import json
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from crm_app import middleware
+from crm_app.middleware import QueryRecorder
+
+
+@pytest.mark.django_db
+def test_recorder_counts_and_fingerprints_duplicates():
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        for username in ('a', 'b', 'c'):
+            User.objects.filter(username=username).exists()
+        User.objects.count()
+    assert recorder.count == 4
+    assert recorder.duration > 0
+    [duplicate] = recorder.duplicates()
+    assert duplicate['count'] == 3
+    assert 'auth_user' in duplicate['sql']
+
+
+@pytest.mark.django_db
+def test_middleware_logs_metrics_and_flags_budget(client, settings):
+    settings.REQUEST_METRICS_SERVER_TIMING = True
+    settings.REQUEST_QUERY_BUDGET = 1
+    user = User.objects.create_user('sales', 'sales@example.com', 'testpass')
+    client.force_login(user)
+
+    with mock.patch.object(middleware, 'logger') as logger:
+        response = client.get('/outbound/api/trends/')
+    assert response.status_code == 200
+    assert response['Server-Timing'].startswith('db;dur=')
+    message = logger.warning.call_args[0][0]
+    metrics = json.loads(message[message.index('{'):])
+    assert metrics['view'] == 'outbound_app:outbound-trends-api'
+    assert metrics['queries'] > 1 and metrics['over_budget']
+
+    settings.REQUEST_QUERY_BUDGETS = {'outbound_app:outbound-trends-api': 100}
+    with mock.patch.object(middleware, 'logger') as logger:
+        client.get('/outbound/api/trends/')
+    assert not json.loads(logger.info.call_args[0][0])['over_budget']
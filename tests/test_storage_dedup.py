@@ -0,0 +1,111 @@
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+
+from django.utils.functional import empty
+
+from crm_project.storage_backends import (
+    ContentAddressedFileSystemStorage,
+    ContentAddressedMixin,
+    ContentAddressedS3Storage,
+    upload_storage,
+)
+from exports_app.models import ExportJob
+from leads_app.models import Lead
+
+# The dedup index lives in the configured cache, a database table by default
+pytestmark = pytest.mark.django_db
+
+DIGEST = '2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824'  # sha256(b'hello')
+
+
+class _Stream(io.RawIOBase):
+    """A non-seekable upload body."""
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._buffer.readinto(b)
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    cache.clear()
+
+
+@pytest.fixture
+def content_addressed_uploads(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.UPLOAD_FILE_STORAGE = 'crm_project.storage_backends.ContentAddressedFileSystemStorage'
+    upload_storage._wrapped = empty
+    yield
+    upload_storage._wrapped = empty
+
+
+def test_filesystem_storage_dedupes_by_content(tmp_path):
+    storage = ContentAddressedFileSystemStorage(location=tmp_path)
+
+    first = storage.save('whatsapp_files/Screenshot 1.PNG', ContentFile(b'hello'))
+    second = storage.save('whatsapp_files/other.png', File(_Stream(b'hello')))
+
+    assert first == second == f'whatsapp_files/{DIGEST}.png'
+    assert [p.name for p in (tmp_path / 'whatsapp_files').iterdir()] == [f'{DIGEST}.png']
+    assert storage.save('whatsapp_files/third.png', ContentFile(b'other')) != first
+
+    # No field uses this storage, so nothing references the name
+    storage.delete(first)
+    assert not storage.exists(first)
+    assert storage.save('whatsapp_files/again.png', ContentFile(b'hello')) == first
+    assert storage.exists(first)
+
+
+def test_only_upload_fields_are_content_addressed(content_addressed_uploads):
+    assert isinstance(Lead._meta.get_field('images').storage, ContentAddressedMixin)
+    assert not isinstance(ExportJob._meta.get_field('file').storage, ContentAddressedMixin)
+
+
+def test_delete_keeps_shared_names_until_unreferenced(content_addressed_uploads):
+    first = Lead.objects.create(contact_name='Alice', phone_number='111', images=ContentFile(b'hello', name='a.png'))
+    second = Lead.objects.create(contact_name='Bob', phone_number='222', images=ContentFile(b'hello', name='b.png'))
+    name = first.images.name
+    assert second.images.name == name
+
+    first.images = ContentFile(b'replacement', name='c.png')
+    first.save()
+    upload_storage.delete(name)
+    assert upload_storage.exists(name)  # still Bob's image
+
+    second.images = ContentFile(b'replacement', name='d.png')
+    second.save()
+    upload_storage.delete(name)
+    assert not upload_storage.exists(name)
+    assert upload_storage.exists(first.images.name)
+
+
+def test_s3_storage_skips_upload_of_known_content():
+    moto = pytest.importorskip('moto')
+    boto3 = pytest.importorskip('boto3')
+
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='media')
+        storage = ContentAddressedS3Storage(
+            bucket_name='media', region_name='us-east-1', access_key='test', secret_key='test',
+            endpoint_url=None, default_acl=None, querystring_auth=False,
+        )
+
+        name = storage.save('product_images/a.jpg', ContentFile(b'hello'))
+        assert name == f'product_images/{DIGEST}.jpg'
+
+        # A fresh process has an empty index and falls back to HeadObject
+        cache.clear()
+        assert storage.save('product_images/b.jpg', ContentFile(b'hello')) == name
+
+        keys = [obj['Key'] for obj in client.list_objects_v2(Bucket='media')['Contents']]
+        assert keys == [name]
+        assert client.get_object(Bucket='media', Key=name)['Body'].read() == b'hello'
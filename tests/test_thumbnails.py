@@ -0,0 +1,60 @@
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from crm_project.storage_backends import upload_storage
+from leads_app.models import Lead
+from media_app import processing
+from media_app.models import MediaAsset
+
+
+def _upload(name='photo.png', size=(1600, 1200)):
+    buffer = io.BytesIO()
+    Image.new('RGBA', size, (200, 30, 30, 128)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_upload_generates_renditions_after_commit(media_root, django_capture_on_commit_callbacks, monkeypatch):
+    # Run the pool job inline so the test can inspect the result
+    monkeypatch.setattr(processing, 'submit', processing._run)
+    with django_capture_on_commit_callbacks(execute=True):
+        lead = Lead.objects.create(contact_name='Alice', phone_number='111', images=_upload())
+        lead.refresh_from_db()
+        assert lead.image_thumbnails == {}  # nothing rendered inside the request
+    lead.refresh_from_db()
+
+    renditions = lead.image_thumbnails
+    assert renditions['source'] == lead.images.name
+    assert renditions['webp'].startswith('enquiry_images/thumbs/')
+    for fmt, pil_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+        with upload_storage.open(renditions[fmt]) as f:
+            image = Image.open(f)
+            assert image.format == pil_format
+            assert max(image.size) == 400
+    assert lead.thumbnail_url.endswith('.jpg')
+    assert MediaAsset.objects.get(lead=lead, source='lead_image').thumbnails == renditions
+
+
+@pytest.mark.django_db
+def test_generate_thumbnails_backfills_stale_renditions(media_root, locmem_cache):
+    # The render threads reach the cache; SQLite's shared in-memory test
+    # database would lock the cache table against the test's transaction
+    lead = Lead.objects.create(contact_name='Bob', phone_number='222', images=_upload('bob.png'))
+    Lead.objects.filter(pk=lead.pk).update(image_thumbnails={})
+    MediaAsset.objects.filter(lead=lead).update(thumbnails={})
+
+    call_command('generate_thumbnails', '--workers', '2')
+
+    lead.refresh_from_db()
+    assert lead.image_thumbnails['source'] == lead.images.name
+    assert MediaAsset.objects.get(lead=lead).thumbnails['jpeg'] == lead.image_thumbnails['jpeg']
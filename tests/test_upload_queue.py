@@ -0,0 +1,85 @@
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+from crm_project.storage_backends import WriteBehindS3Storage
+from leads_app.models import Lead
+from media_app import upload_queue
+from media_app.models import MediaAsset
+
+# The dedup index lives in the configured cache, a database table by default
+pytestmark = pytest.mark.django_db
+
+moto = pytest.importorskip('moto')
+boto3 = pytest.importorskip('boto3')
+
+
+@pytest.fixture
+def staging(settings, tmp_path):
+    settings.UPLOAD_STAGING_DIR = tmp_path
+    settings.UPLOAD_QUEUE_INLINE_WORKER = False
+    cache.clear()
+    upload_queue._failures.clear()
+    return tmp_path
+
+
+def _storage():
+    return WriteBehindS3Storage(
+        bucket_name='media', region_name='us-east-1', access_key='test', secret_key='test',
+        endpoint_url=None, default_acl=None, querystring_auth=False,
+    )
+
+
+def _keys(client):
+    return [obj['Key'] for obj in client.list_objects_v2(Bucket='media').get('Contents', [])]
+
+
+def test_save_stages_locally_and_queue_pushes(staging):
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='media')
+        storage = _storage()
+
+        name = storage.save('enquiry_images/photo.jpg', ContentFile(b'jpeg bytes'))
+        assert (staging / name).read_bytes() == b'jpeg bytes'
+        assert storage.url(name) == f'/media/staged/{name}'
+        assert storage.open(name).read() == b'jpeg bytes'
+        assert _keys(client) == []
+
+        assert upload_queue.push_pending(storage) == (1, 0)
+        assert _keys(client) == [name]
+        assert not (staging / name).exists()
+        assert storage.url(name).startswith('https://')
+
+
+def test_failed_push_stays_staged_and_backs_off(staging):
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        storage = _storage()
+        name = storage.save('product_images/item.png', ContentFile(b'png bytes'))
+
+        # Bucket missing: the upload fails and is retried later
+        assert upload_queue.push_pending(storage) == (0, 1)
+        assert (staging / name).exists()
+        assert upload_queue.push_pending(storage) == (0, 0)
+
+        client.create_bucket(Bucket='media')
+        assert upload_queue.push_pending(storage, force=True) == (1, 0)
+        assert _keys(client) == [name]
+
+
+def test_swap_references_rewrites_thumbnail_names():
+    renditions = {
+        'source': 'enquiry_images/a.jpg', 'size': 400,
+        'webp': 'enquiry_images/thumbs/old.webp', 'jpeg': 'enquiry_images/thumbs/b.jpg',
+    }
+    lead = Lead.objects.create(contact_name='Alice', phone_number='111', images='enquiry_images/a.jpg')
+    Lead.objects.filter(pk=lead.pk).update(image_thumbnails=renditions)
+    MediaAsset.objects.filter(lead=lead).update(thumbnails=renditions)
+
+    upload_queue.swap_references('enquiry_images/thumbs/old.webp', 'enquiry_images/thumbs/new.webp')
+
+    lead.refresh_from_db()
+    expected = {**renditions, 'webp': 'enquiry_images/thumbs/new.webp'}
+    assert lead.image_thumbnails == expected
+    assert MediaAsset.objects.get(lead=lead, source='lead_image').thumbnails == expected